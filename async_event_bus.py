@@ -6,10 +6,20 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
+from collections import deque
+from enum import Enum
 from inspect import isasyncgen
-from typing import Any, AsyncGenerator, Callable, Coroutine, Generator, cast
-
-import janus as janus
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Generator,
+    Hashable,
+    Iterable,
+    cast,
+)
 
 
 class EventRegisteredError(ValueError):
@@ -24,18 +34,246 @@ class TopicNotRegisteredError(NameError):
     """
 
 
+class OverflowPolicy(Enum):
+    """
+    The action taken, when an event is published to a full subscriber queue.
+    """
+
+    DROP_OLDEST = "drop_oldest"  # Remove the oldest event from the queue to make room for the new one
+    DROP_NEWEST = "drop_newest"  # Discard the new event
+    COALESCE = "coalesce"  # Only keep the latest event per key. If the queue is full, discard events with new keys
+
+
+class Subscription:
+    """
+    The queue of a single subscriber. It can be limited in size and counts the events dropped due to an overflow. This
+    class is not thread-safe. Use one of its children.
+
+    Parameters
+    ----------
+    maxsize: int
+        The maximum number of events queued. If maxsize is <= 0, the queue size is infinite.
+    overflow: OverflowPolicy
+        The action taken, when the queue is full.
+    key: Callable or None
+        A function returning the key of an event. Required if `overflow` is `OverflowPolicy.COALESCE`.
+    event_types: type or tuple of type or None
+        Only accept events, that are instances of these types. If None, all events are accepted.
+    """
+
+    @property
+    def dropped(self) -> int:
+        """The number of events dropped."""
+        return self.__dropped
+
+    @property
+    def qsize(self) -> int:
+        """The number of events queued."""
+        return len(self._events)
+
+    @property
+    def maxsize(self) -> int:
+        """The capacity of the queue."""
+        return self.__maxsize
+
+    @property
+    def event_types(self) -> type | tuple[type, ...] | None:
+        """The types of the events accepted or None, if all events are accepted."""
+        return self.__event_types
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        key: Callable[[Any], Hashable] | None = None,
+        event_types: type | tuple[type, ...] | None = None,
+    ) -> None:
+        if overflow is OverflowPolicy.COALESCE and key is None:
+            raise ValueError("A key function is required to coalesce events.")
+        self._events: deque[Any] = deque()  # If coalescing, this contains the keys of the pending events
+        self.__maxsize = max(maxsize, 0)
+        self.__overflow = overflow
+        self.__key = key
+        self.__pending: dict[Hashable, Any] = {}  # The latest event per key, if coalescing
+        self.__dropped = 0
+        self.__event_types = event_types
+        self.__accepted_types: dict[type, bool] = {}  # Caches the result of the type check per type
+
+    def accepts(self, event: Any) -> bool:
+        """Return True if the event passes the filter of this subscription."""
+        if self.__event_types is None:
+            return True
+        event_type = type(event)
+        try:
+            return self.__accepted_types[event_type]
+        except KeyError:
+            accepted = self.__accepted_types[event_type] = issubclass(event_type, self.__event_types)
+            return accepted
+
+    def _enqueue(self, event: Any) -> None:
+        if self.__overflow is OverflowPolicy.COALESCE:
+            key = self.__key(event)
+            if key in self.__pending:
+                # Replace the pending event, but keep its position in the queue
+                self.__pending[key] = event
+                self.__dropped += 1
+            elif self.__maxsize and len(self._events) >= self.__maxsize:
+                self.__dropped += 1
+            else:
+                self.__pending[key] = event
+                self._events.append(key)
+            return
+
+        if self.__maxsize and len(self._events) >= self.__maxsize:
+            self.__dropped += 1
+            if self.__overflow is OverflowPolicy.DROP_NEWEST:
+                return
+            self._events.popleft()
+        self._events.append(event)
+
+    def _dequeue(self) -> Any:
+        event = self._events.popleft()
+        if self.__overflow is OverflowPolicy.COALESCE:
+            return self.__pending.pop(event)
+        return event
+
+
+class _TopicFilter:
+    """
+    The union of the filters of the subscriptions of a topic. It is immutable except for its cache, so it can be read
+    from any thread to decide whether an event must be handed to the event loop at all.
+
+    Parameters
+    ----------
+    subscriptions: Iterable of Subscription
+        The subscriptions of the topic.
+    """
+
+    def __init__(self, subscriptions: Iterable[Subscription]) -> None:
+        event_types: list[type] = []
+        accepts_all = False
+        for subscription in subscriptions:
+            if subscription.event_types is None:
+                accepts_all = True
+                break
+            if isinstance(subscription.event_types, tuple):
+                event_types.extend(subscription.event_types)
+            else:
+                event_types.append(subscription.event_types)
+        self.__event_types: tuple[type, ...] | None = None if accepts_all else tuple(event_types)
+        self.__accepted_types: dict[type, bool] = {}  # Caches the result of the type check per type
+
+    def accepts(self, event: Any) -> bool:
+        """Return True if any subscription of the topic accepts the event."""
+        if self.__event_types is None:
+            return True
+        event_type = type(event)
+        try:
+            return self.__accepted_types[event_type]
+        except KeyError:
+            accepted = self.__accepted_types[event_type] = issubclass(event_type, self.__event_types)
+            return accepted
+
+
+class AsyncSubscription(Subscription):
+    """
+    A subscription read by a coroutine. All methods must be called from the event loop.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.__waiter: asyncio.Future[None] | None = None
+
+    def put(self, event: Any) -> None:
+        """Put an event into the queue without blocking."""
+        self._enqueue(event)
+        self.__wake_up()
+
+    def put_many(self, events: Iterable[Any]) -> None:
+        """Put the accepted events into the queue without blocking. The consumer is woken up only once."""
+        for event in events:
+            if self.accepts(event):
+                self._enqueue(event)
+        if self._events:
+            self.__wake_up()
+
+    async def get(self) -> Any:
+        """Remove and return the next event. Wait until an event is available."""
+        while not self._events:
+            self.__waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.__waiter
+            finally:
+                self.__waiter = None
+        return self._dequeue()
+
+    def __wake_up(self) -> None:
+        if self.__waiter is not None and not self.__waiter.done():
+            self.__waiter.set_result(None)
+
+
+class SyncSubscription(Subscription):
+    """
+    A subscription read by a thread. All methods are thread-safe.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.__condition = threading.Condition()
+
+    def put(self, event: Any) -> None:
+        """Put an event into the queue without blocking."""
+        with self.__condition:
+            self._enqueue(event)
+            self.__condition.notify()
+
+    def get(self) -> Any:
+        """Remove and return the next event. Block until an event is available."""
+        with self.__condition:
+            while not self._events:
+                self.__condition.wait()
+            return self._dequeue()
+
+
 class AsyncEventBus:
     """
     An event bus that is using the async generator syntax for distributing events.
     It uses dicts and sets internally to ensure good performance.
+
+    Events published from other threads via `publish_sync()` are collected and handed to the event loop in batches. The
+    loop is woken up at most once per batch. Set `batch_interval` to collect the events for a fixed time instead.
     """
 
+    @property
+    def batch_interval(self) -> float:
+        """The time in seconds to collect events published from other threads, before delivering them."""
+        return self.__batch_interval
+
+    @batch_interval.setter
+    def batch_interval(self, value: float) -> None:
+        self.__batch_interval = max(value, 0.0)
+
     def __init__(self) -> None:
-        self.__subscribers: dict[str, set[janus.Queue[Any]]] = {}
+        self.__subscribers: dict[str, set[AsyncSubscription]] = {}
+        # The filters of the topics of the event loop subscribers, read by other threads in `publish_sync()`
+        self.__topic_filters: dict[str, _TopicFilter] = {}
+        self.__sync_subscribers: dict[str, set[SyncSubscription]] = {}
         self.__registered_calls: dict[str, Callable[[Any], Coroutine] | Callable[[Any], AsyncGenerator]] = {}
         self.__logger = logging.getLogger(__name__)
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        # Events published from other threads. Appending to a deque is thread-safe.
+        self.__batch: deque[tuple[str, Any]] = deque()
+        self.__flush_scheduled = False
+        self.__batch_interval = 0.0
 
-    async def subscribe(self, event_name: str) -> AsyncGenerator[Any, None]:
+    def subscribe(
+        self,
+        event_name: str,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        key: Callable[[Any], Hashable] | None = None,
+        event_types: type | tuple[type, ...] | None = None,
+    ) -> AsyncGenerator[Any, None]:
         """
         The async generator that yields events for published for `event_name`.
 
@@ -43,6 +281,35 @@ class AsyncEventBus:
         ----------
         event_name: str
             The type of event to listen for.
+        maxsize: int
+            The maximum number of events queued for this subscriber. If maxsize is <= 0, the queue size is infinite.
+        overflow: OverflowPolicy
+            The action taken, when the queue is full.
+        key: Callable or None
+            A function returning the key of an event. Required if `overflow` is `OverflowPolicy.COALESCE`.
+        event_types: type or tuple of type or None
+            Only receive events, that are instances of these types. The filter is applied by the publisher, so other
+            events are never queued. If None, all events are received.
+
+        Returns
+        -------
+        AsyncGenerator
+            The generator yielding the events
+        """
+        return self.listen(event_name, AsyncSubscription(maxsize, overflow, key, event_types))
+
+    async def listen(self, event_name: str, subscription: AsyncSubscription) -> AsyncGenerator[Any, None]:
+        """
+        The async generator that yields events for published for `event_name` using a subscription created by the
+        caller. Use this instead of `subscribe()` to inspect the subscription while reading, e.g. the number of events
+        dropped.
+
+        Parameters
+        ----------
+        event_name: str
+            The type of event to listen for.
+        subscription: AsyncSubscription
+            The queue of the subscriber. It must not be used by another subscriber.
 
         Yields
         -------
@@ -50,24 +317,35 @@ class AsyncEventBus:
             The events
         """
         self.__logger.debug("Subscribing to topic '%s'", event_name)
-        queue: janus.Queue[Any] = janus.Queue()
-        if self.__subscribers.get(event_name, None) is None:
-            self.__subscribers[event_name] = {queue}
-        else:
-            self.__subscribers[event_name].add(queue)
+        # Events published from other threads are delivered via this loop
+        self.__loop = asyncio.get_running_loop()
+        self.__add_subscription(self.__subscribers, event_name, subscription)
+        self.__update_topic_filter(event_name)
 
         try:
             while "listening":
-                event = await queue.async_q.get()
+                event = await subscription.get()
                 yield event
         finally:
-            # Cleanup
-            self.__subscribers[event_name].remove(queue)
-            if len(self.__subscribers[event_name]) == 0:
-                del self.__subscribers[event_name]
-            self.__logger.debug("Unsubscribed from topic '%s'", event_name)
+            self.__remove_subscription(self.__subscribers, event_name, subscription)
+            self.__update_topic_filter(event_name)
 
-    def subscribe_sync(self, event_name: str) -> Generator[Any, None]:
+    def __update_topic_filter(self, event_name: str) -> None:
+        # The filter is replaced instead of modified, because other threads might read it
+        subscriptions = self.__subscribers.get(event_name)
+        if subscriptions:
+            self.__topic_filters[event_name] = _TopicFilter(subscriptions)
+        else:
+            self.__topic_filters.pop(event_name, None)
+
+    def subscribe_sync(
+        self,
+        event_name: str,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        key: Callable[[Any], Hashable] | None = None,
+        event_types: type | tuple[type, ...] | None = None,
+    ) -> Generator[Any, None]:
         """
         The synchronous generator that yields events published for `event_name`.
 
@@ -75,6 +353,15 @@ class AsyncEventBus:
         ----------
         event_name: str
             The type of event to listen for.
+        maxsize: int
+            The maximum number of events queued for this subscriber. If maxsize is <= 0, the queue size is infinite.
+        overflow: OverflowPolicy
+            The action taken, when the queue is full.
+        key: Callable or None
+            A function returning the key of an event. Required if `overflow` is `OverflowPolicy.COALESCE`.
+        event_types: type or tuple of type or None
+            Only receive events, that are instances of these types. The filter is applied by the publisher, so other
+            events are never queued. If None, all events are received.
 
         Yields
         -------
@@ -82,26 +369,56 @@ class AsyncEventBus:
             The events
         """
         self.__logger.debug("Subscribing to topic '%s'", event_name)
-        queue: janus.Queue[Any] = janus.Queue()
-        if self.__subscribers.get(event_name, None) is None:
-            self.__subscribers[event_name] = {queue}
-        else:
-            self.__subscribers[event_name].add(queue)
+        subscription = SyncSubscription(maxsize, overflow, key, event_types)
+        self.__add_subscription(self.__sync_subscribers, event_name, subscription)
 
         try:
             while "listening":
-                event = queue.sync_q.get()
+                event = subscription.get()
                 yield event
         finally:
-            # Cleanup
-            self.__subscribers[event_name].remove(queue)
-            if len(self.__subscribers[event_name]) == 0:
-                del self.__subscribers[event_name]
-            self.__logger.debug("Unsubscribed from topic '%s'", event_name)
+            self.__remove_subscription(self.__sync_subscribers, event_name, subscription)
+
+    def __add_subscription(self, subscribers: dict[str, set[Any]], event_name: str, subscription: Subscription) -> None:
+        if subscribers.get(event_name, None) is None:
+            subscribers[event_name] = {subscription}
+        else:
+            # Replace the set instead of modifying it, because other threads might iterate over it
+            subscribers[event_name] = subscribers[event_name] | {subscription}
+
+    def __remove_subscription(
+        self, subscribers: dict[str, set[Any]], event_name: str, subscription: Subscription
+    ) -> None:
+        remaining_subscriptions = subscribers[event_name] - {subscription}
+        if len(remaining_subscriptions) == 0:
+            del subscribers[event_name]
+        else:
+            subscribers[event_name] = remaining_subscriptions
+        if subscription.dropped:
+            self.__logger.info(
+                "Subscriber of topic '%s' dropped %i events due to a full queue.", event_name, subscription.dropped
+            )
+        self.__logger.debug("Unsubscribed from topic '%s'", event_name)
+
+    def get_subscriptions(self, event_name: str) -> tuple[Subscription, ...]:
+        """
+        Return the subscriptions of a topic. Use this to inspect the queue sizes and the number of events dropped.
+
+        Parameters
+        ----------
+        event_name: str
+            The event address.
+
+        Returns
+        -------
+        tuple of Subscription
+            The subscriptions of the topic.
+        """
+        return tuple(self.__subscribers.get(event_name, ())) + tuple(self.__sync_subscribers.get(event_name, ()))
 
     def publish(self, event_name: str, event: Any) -> None:
         """
-        Publish an event called `event_name` with the payload `event`.
+        Publish an event called `event_name` with the payload `event`. Call this from the event loop.
 
         Parameters
         ----------
@@ -111,13 +428,17 @@ class AsyncEventBus:
             The data to be published.
         """
         self.__logger.debug("Publishing to topic '%s': %s", event_name, event)
-        listener_queues: set[janus.Queue[Any]] = self.__subscribers.get(event_name, set())
-        for queue in listener_queues:
-            queue.async_q.put_nowait(event)
+        for subscription in self.__subscribers.get(event_name, ()):
+            if subscription.accepts(event):
+                subscription.put(event)
+        for sync_subscription in self.__sync_subscribers.get(event_name, ()):
+            if sync_subscription.accepts(event):
+                sync_subscription.put(event)
 
     def publish_sync(self, event_name: str, event: Any) -> None:
         """
-        Publish an event called `event_name` with the payload `event`.
+        Publish an event called `event_name` with the payload `event`. This function can be called from any thread.
+        The event is delivered to the subscribers of the event loop with the next batch.
 
         Parameters
         ----------
@@ -127,9 +448,45 @@ class AsyncEventBus:
             The data to be published.
         """
         self.__logger.debug("Publishing to topic '%s': %s", event_name, event)
-        listener_queues: set[janus.Queue[Any]] = self.__subscribers.get(event_name, set())
-        for queue in listener_queues:
-            queue.sync_q.put_nowait(event)
+        for sync_subscription in self.__sync_subscribers.get(event_name, ()):
+            if sync_subscription.accepts(event):
+                sync_subscription.put(event)
+
+        topic_filter = self.__topic_filters.get(event_name)
+        if topic_filter is None or not topic_filter.accepts(event) or self.__loop is None:
+            # Nobody on the event loop is interested, so do not wake it up
+            return
+        self.__batch.append((event_name, event))
+        if not self.__flush_scheduled:
+            # The flag is only reset by the event loop right before it empties the batch, so at worst we schedule an
+            # additional flush
+            self.__flush_scheduled = True
+            try:
+                if self.__batch_interval:
+                    self.__loop.call_soon_threadsafe(self.__loop.call_later, self.__batch_interval, self.__flush)
+                else:
+                    self.__loop.call_soon_threadsafe(self.__flush)
+            except RuntimeError:
+                # The event loop is closed
+                self.__flush_scheduled = False
+
+    def __flush(self) -> None:
+        """Deliver the events published from other threads. Runs in the event loop."""
+        self.__flush_scheduled = False
+        events_per_topic: dict[str, list[Any]] = {}
+        try:
+            while "events pending":
+                event_name, event = self.__batch.popleft()
+                try:
+                    events_per_topic[event_name].append(event)
+                except KeyError:
+                    events_per_topic[event_name] = [event]
+        except IndexError:
+            pass
+
+        for event_name, events in events_per_topic.items():
+            for subscription in self.__subscribers.get(event_name, ()):
+                subscription.put_many(events)
 
     def register(self, event_name: str, function: Callable[..., Coroutine] | Callable[..., AsyncGenerator]) -> None:
         """
@@ -0,0 +1,198 @@
+"""
+A microbenchmark of the path every event of the DLL takes: `wavemeter.callback()` -> `data_factory.get()` -> the
+construction of the data package -> the measurement cache and history -> `AsyncEventBus.publish_sync()`. The events
+are replayed from a thread, like the DLL does, while the event loop delivers them to 0, 1, 10 and 100 subscribers.
+
+Three numbers are reported per subscriber count:
+- ingest events/s: The rate the callback thread can replay the events at, while the subscribers consume them.
+- delivered events/s: The rate the events are replayed and delivered to all subscribers at. The clock stops, when the
+  last subscriber received the last event, so this includes the events still queued when the callback thread is done.
+- blocks/event: The memory blocks still allocated per event after the callbacks returned, while the event loop was
+  blocked, e.g. the data packages and queue entries waiting to be delivered. Temporary objects freed within the
+  callback are not counted.
+
+The events are synthetic, or replayed from a file written by the recorder (`RECORDER_DIRECTORY`). Run it from the root
+of the repository:
+    python -m benchmarks.callback_path --events 200000 --subscribers 0 1 10 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Any, Sequence
+
+from _version import __version__
+from async_event_bus import event_bus
+from wmControl.recorder import read_recording
+from wmControl.simulated_dll import WAVELENGTH_MODES
+from wmControl.wavemeter import callback
+from wmControl.wlmConst import MeasureMode
+
+PRODUCT_ID = 4711
+
+# A callback is called with product_id, mode, int_val, double_val and result
+Event = tuple[int, int, int, float, int]
+
+
+def create_synthetic_events(count: int) -> list[Event]:
+    """Create wavelength measurements of 8 channels and a temperature measurement after each round of channels."""
+    events: list[Event] = []
+    timestamp = 0
+    while len(events) < count:
+        timestamp += 1
+        for channel, mode in enumerate(WAVELENGTH_MODES):
+            events.append((PRODUCT_ID, mode, timestamp, 780.24 + 10.0 * channel + (timestamp % 100) * 1e-7, 0))
+        events.append((PRODUCT_ID, MeasureMode.cmiTemperature, timestamp, 25.0, 0))
+    return events[:count]
+
+
+def load_recorded_events(paths: Sequence[str], count: int) -> list[Event]:
+    """
+    Load the events from recordings. The device timestamps are passed as int_val and the values as double_val, so the
+    values of modes sending their value as int_val are not reproduced.
+    """
+    events: list[Event] = []
+    for path in paths:
+        for _, device_timestamps, modes, _, values in read_recording(path):
+            events.extend(
+                (PRODUCT_ID, mode, max(timestamp, 0), value, 0)
+                for timestamp, mode, value in zip(device_timestamps, modes, values)
+            )
+            if len(events) >= count:
+                return events[:count]
+    return events
+
+
+def replay(events: Sequence[Event]) -> float:
+    """Call the callback with all events and return the time taken in s."""
+    start = time.perf_counter()
+    for event in events:
+        callback(*event)
+    return time.perf_counter() - start
+
+
+async def consume(
+    topic: str, received: list[int], all_received: asyncio.Event, expected: int, finished: list[float]
+) -> None:
+    async for _ in event_bus.subscribe(topic):
+        received[0] += 1
+        if received[0] >= expected:
+            if not all_received.is_set():
+                finished[0] = time.perf_counter()
+            all_received.set()
+
+
+async def run_scenario(events: Sequence[Event], subscribers: int) -> dict[str, Any]:
+    """Replay the events with the number of subscribers given and return the results."""
+    topic = str(PRODUCT_ID)
+    received = [0]
+    all_received = asyncio.Event()
+    expected = subscribers * len(events)
+    finished = [0.0]  # The time the last event was delivered
+    consumers = [
+        asyncio.create_task(consume(topic, received, all_received, expected, finished)) for _ in range(subscribers)
+    ]
+    await asyncio.sleep(0)  # Let the consumers subscribe
+    try:
+        # Throughput: Replay from a separate thread, while the event loop delivers the events
+        thread_result: list[float] = []
+        replay_thread = threading.Thread(target=lambda: thread_result.append(replay(events)), name="wlmData")
+        start = time.perf_counter()
+        replay_thread.start()
+        while replay_thread.is_alive():
+            await asyncio.sleep(0.01)
+        ingest_duration = thread_result[0]
+        if subscribers:
+            await all_received.wait()
+            delivery_duration = finished[0] - start
+        else:
+            delivery_duration = ingest_duration
+
+        # Allocations: Replay while the event loop is blocked, so no event is delivered during the measurement
+        received[0] = 0
+        all_received.clear()
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        replay(events)
+        blocks_after = sys.getallocatedblocks()
+        if subscribers:
+            await all_received.wait()
+    finally:
+        for consumer in consumers:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+
+    return {
+        "events": len(events),
+        "subscribers": subscribers,
+        "ingest_duration": ingest_duration,
+        "ingest_events_per_second": len(events) / ingest_duration,
+        "delivery_duration": delivery_duration,
+        "delivered_events_per_second": len(events) / delivery_duration,
+        "blocks_per_event": (blocks_after - blocks_before) / len(events),
+    }
+
+
+def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200_000, help="the number of events replayed per scenario")
+    parser.add_argument(
+        "--subscribers", type=int, nargs="+", default=[0, 1, 10, 100], help="the numbers of subscribers to test"
+    )
+    parser.add_argument("--recording", nargs="+", help="replay the events of these recordings instead")
+    parser.add_argument(
+        "--output",
+        help="the JSON file to write the results to. Defaults to benchmarks/results/callback_path-<version>-<time>.json",
+    )
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Sequence[str] | None = None) -> dict[str, Any]:
+    options = parse_arguments(arguments)
+    if options.recording:
+        events = load_recorded_events(options.recording, options.events)
+    else:
+        events = create_synthetic_events(options.events)
+    if not events:
+        raise ValueError("No events to replay.")
+
+    started = datetime.datetime.now(datetime.timezone.utc)
+    results: dict[str, Any] = {
+        "version": __version__,
+        "timestamp": started.isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "source": options.recording or "synthetic",
+        "scenarios": [],
+    }
+    # Warm up, e.g. create the ring buffers of the measurement history
+    replay(events[:1000])
+    for subscribers in options.subscribers:
+        result = asyncio.run(run_scenario(events, subscribers))
+        results["scenarios"].append(result)
+        print(
+            f"{subscribers:4} subscribers  {result['ingest_events_per_second']:12.0f} ingest events/s"
+            f"  {result['delivered_events_per_second']:12.0f} delivered events/s"
+            f"  {result['blocks_per_event']:8.2f} blocks/event"
+        )
+
+    output = options.output or os.path.join(
+        os.path.dirname(__file__), "results", f"callback_path-{__version__}-{started:%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
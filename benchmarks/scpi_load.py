@@ -0,0 +1,309 @@
+"""
+An end-to-end load test of the SCPI server. The server is started in a separate process using the simulated DLL, then
+many TCP clients send requests in a closed loop. The throughput, the latency percentiles and the CPU time of the server
+are reported per scenario and stored as JSON, so results of different versions can be compared.
+
+Run it from the root of the repository:
+    python -m benchmarks.scpi_load --clients 200 --duration 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Sequence
+
+from _version import __version__
+
+PRODUCT_ID = 4711
+# The server does not reply to unknown requests or requests timing out on the device
+DEFAULT_REPLY_TIMEOUT = 5.0  # in s
+
+# The requests sent by each client in turn
+SCENARIOS: dict[str, tuple[bytes, ...]] = {
+    "idn": (b"*IDN?",),
+    "measure_wavelength": (b"MEASure:WAVElength? (@1)",),
+    "measure_frequency": (b"MEASure:FREQuency? (@1)",),
+    "measure_wavelength_channels": (b"MEASure:WAVElength? (@1:8)",),
+    "fetch_wavelength": (b"FETCh:WAVElength? (@1)",),
+    "mixed": (b"*IDN?", b"MEASure:WAVElength? (@1)", b"MEASure:FREQuency? (@2)", b"FETCh:WAVElength? (@3)"),
+}
+
+
+def run_server(connection: Connection, port: int, environment: dict[str, str]) -> None:
+    """
+    Run the server in this process until the parent sends "stop". The parent can query the CPU time used by sending
+    "cpu".
+    """
+    os.environ.update(environment)
+    # The configuration is read, when the server is imported
+    import server  # pylint: disable=import-outside-toplevel
+
+    async def serve() -> None:
+        server_task = asyncio.create_task(server.create_wm_server(PRODUCT_ID, "127.0.0.1", port))
+        loop = asyncio.get_running_loop()
+        try:
+            while (command := await loop.run_in_executor(None, connection.recv)) != "stop":
+                if command == "cpu":
+                    connection.send(time.process_time())
+        finally:
+            server_task.cancel()
+            try:
+                await server_task
+            except asyncio.CancelledError:
+                pass
+
+    asyncio.run(serve())
+
+
+class ServerProcess:
+    """
+    A server in a child process, so its CPU time can be measured separately from the clients.
+
+    Parameters
+    ----------
+    port: int
+        The port the server listens at.
+    environment: dict of str
+        The configuration of the server, see examples/example.env.
+    """
+
+    def __init__(self, port: int, environment: dict[str, str]) -> None:
+        self.__connection, child_connection = multiprocessing.Pipe()
+        self.__process = multiprocessing.Process(
+            target=run_server, args=(child_connection, port, environment), daemon=True
+        )
+
+    def cpu_time(self) -> float:
+        """Return the CPU time in s used by the server process."""
+        self.__connection.send("cpu")
+        return self.__connection.recv()
+
+    def __enter__(self) -> ServerProcess:
+        self.__process.start()
+        return self
+
+    def __exit__(self, *_args: Any) -> None:
+        self.__connection.send("stop")
+        self.__process.join(timeout=10)
+        if self.__process.is_alive():
+            self.__process.terminate()
+
+
+async def connect(port: int, timeout: float = 10.0) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to the server and retry, while it is starting."""
+    deadline = time.monotonic() + timeout
+    while "connecting":
+        try:
+            return await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_client(
+    port: int,
+    requests: Sequence[bytes],
+    stop_time: float,
+    latencies: list[int],
+    errors: list[bytes],
+    timeouts: list[bytes],
+    reply_timeout: float = DEFAULT_REPLY_TIMEOUT,
+) -> None:
+    """
+    Send the requests in a closed loop until the stop time and record the latency of each request in ns. Requests
+    without a reply within `reply_timeout` are recorded as timeouts and the client reconnects, so a late reply is not
+    mistaken for the reply to the next request.
+    """
+    reader, writer = await connect(port)
+    try:
+        index = 0
+        while time.perf_counter() < stop_time:
+            request = requests[index % len(requests)]
+            index += 1
+            start = time.perf_counter_ns()
+            writer.write(request + b"\n")
+            try:
+                reply = await asyncio.wait_for(reader.readline(), reply_timeout)
+            except asyncio.TimeoutError:
+                timeouts.append(request)
+                writer.close()
+                await writer.wait_closed()
+                reader, writer = await connect(port)
+                continue
+            latencies.append(time.perf_counter_ns() - start)
+            if not reply:
+                raise ConnectionError("The server closed the connection.")
+            if reply.startswith(b"-"):
+                # SCPI errors are returned as negative error codes
+                errors.append(reply)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(sorted_values: Sequence[int], fraction: float) -> float:
+    """Return the percentile of the sorted values using the nearest-rank method."""
+    if not sorted_values:
+        return math.nan
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]
+
+
+async def run_scenario(
+    server: ServerProcess,
+    port: int,
+    requests: Sequence[bytes],
+    clients: int,
+    duration: float,
+    warmup: float,
+    reply_timeout: float = DEFAULT_REPLY_TIMEOUT,
+) -> dict[str, Any]:
+    """Run the clients against the server and return the results of the scenario."""
+    # Warm up the server, e.g. fill the caches, then measure
+    await asyncio.gather(
+        *(run_client(port, requests, time.perf_counter() + warmup, [], [], [], reply_timeout) for _ in range(clients))
+    )
+    latencies: list[int] = []
+    errors: list[bytes] = []
+    timeouts: list[bytes] = []
+    cpu_start = server.cpu_time()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_client(port, requests, start + duration, latencies, errors, timeouts, reply_timeout)
+            for _ in range(clients)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    cpu_time = server.cpu_time() - cpu_start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies) + len(timeouts),
+        # SCPI errors and requests without a reply
+        "errors": len(errors) + len(timeouts),
+        "timeouts": len(timeouts),
+        "duration": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.5) / 1e6,
+            "p99": percentile(latencies, 0.99) / 1e6,
+            "p999": percentile(latencies, 0.999) / 1e6,
+            "max": (latencies[-1] if latencies else math.nan) / 1e6,
+        },
+        "server_cpu_time": cpu_time,
+        "server_cpu_utilization": cpu_time / elapsed,
+    }
+
+
+def get_git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100, help="the number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="the duration of each scenario in s")
+    parser.add_argument("--warmup", type=float, default=1.0, help="the warm-up time of each scenario in s")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="the scenarios to run, can be given multiple times. All scenarios are run by default.",
+    )
+    parser.add_argument(
+        "--reply-timeout",
+        type=float,
+        default=DEFAULT_REPLY_TIMEOUT,
+        help="the time in s to wait for a reply, before the request is counted as dropped",
+    )
+    parser.add_argument("--port", type=int, default=5555, help="the port of the server")
+    parser.add_argument("--event-rate", type=float, default=100.0, help="the simulated measurements per s and channel")
+    parser.add_argument("--latency", type=float, default=0.0, help="the simulated latency of each DLL call in s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="the probability of a simulated DLL error")
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="additional server configuration, e.g. MEASUREMENT_CACHE=True. Can be given multiple times.",
+    )
+    parser.add_argument(
+        "--output",
+        help="the JSON file to write the results to. Defaults to benchmarks/results/scpi_load-<version>-<time>.json",
+    )
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Sequence[str] | None = None) -> dict[str, Any]:
+    options = parse_arguments(arguments)
+    environment = {
+        "CONNECTION_TYPE": "SIMULATED",
+        "SIMULATION_EVENT_RATE": str(options.event_rate),
+        "SIMULATION_LATENCY": str(options.latency),
+        "SIMULATION_ERROR_RATE": str(options.error_rate),
+        "APPLICATION_LOG_LEVEL": "WARNING",
+        **dict(variable.split("=", maxsplit=1) for variable in options.env),
+    }
+    started = datetime.datetime.now(datetime.timezone.utc)
+    results: dict[str, Any] = {
+        "version": __version__,
+        "git_revision": get_git_revision(),
+        "timestamp": started.isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "clients": options.clients,
+        "environment": environment,
+        "scenarios": {},
+    }
+
+    for name in options.scenario or SCENARIOS:
+        # Start a new server per scenario, so the scenarios do not influence each other
+        with ServerProcess(options.port, environment) as server:
+            result = asyncio.run(
+                run_scenario(
+                    server,
+                    options.port,
+                    SCENARIOS[name],
+                    options.clients,
+                    options.duration,
+                    options.warmup,
+                    options.reply_timeout,
+                )
+            )
+        results["scenarios"][name] = result
+        latency = result["latency_ms"]
+        print(
+            f"{name:30} {result['throughput']:10.0f} req/s  p50 {latency['p50']:8.3f} ms  p99 {latency['p99']:8.3f} ms"
+            f"  p999 {latency['p999']:8.3f} ms  server CPU {result['server_cpu_utilization']:6.1%}"
+            f"  errors {result['errors']}  timeouts {result['timeouts']}"
+        )
+
+    output = options.output or os.path.join(
+        os.path.dirname(__file__), "results", f"scpi_load-{__version__}-{started:%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import logging
+from decimal import Decimal
 from ipaddress import IPv4Interface, IPv6Interface
+from typing import Type
 
 from pydantic import IPvAnyInterface, TypeAdapter
 
@@ -48,3 +50,40 @@ def parse_log_level(log_level: int | str) -> int:
     if isinstance(level, int):
         return level
     return logging.INFO  # default log level
+
+
+def parse_optional_float(value: float | str | None) -> float | None:
+    """
+    Parse an optional number. Empty strings and None are treated as not set.
+
+    Parameters
+    ----------
+    value: float or str or None
+        The value to parse.
+    Returns
+    -------
+    float or None
+        The number or None if no value was given.
+    """
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def parse_number_type(number_format: str) -> Type[Decimal] | Type[float]:
+    """
+    Parse the number format of the measurement values.
+
+    Parameters
+    ----------
+    number_format: str
+        Either "decimal" or "float". The string is case-insensitive.
+    Returns
+    -------
+    Decimal or float
+        The number type.
+    """
+    try:
+        return {"DECIMAL": Decimal, "FLOAT": float}[number_format.strip().upper()]
+    except KeyError:
+        raise ValueError(f"Invalid number format: {number_format}. Use either 'decimal' or 'float'.") from None
@@ -1,15 +1,35 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import math
 import re
+import sys
+from array import array
 from decimal import Decimal
-from functools import partial
-from typing import Callable, Iterable
+from enum import Enum
+from functools import lru_cache, partial
+from typing import Any, Awaitable, Callable, Iterable, Sequence
 
-from scpi import Cmd, Commands
+from scpi import Cmd, Commands, Request, split_line
 
+import wmControl.wlmData as wlmData
+from async_event_bus import OverflowPolicy
+from wmControl import wlmConst
+from wmControl.allan_deviation import MeasurementAllanDeviation
+from wmControl.dll_profiler import PROFILE_QUANTILES, DllProfiler
+from wmControl.measurement_history import measurement_history
+from wmControl.pattern_store import PatternStore
+from wmControl.statistics import MeasurementStatistics, WindowStatistics
 from wmControl.wavemeter import Wavemeter
-from wmControl.wlmConst import LowSignalError, NoValueError, WavemeterException, WavemeterType
+from wmControl.wlmConst import (
+    LowSignalError,
+    NoValueError,
+    Power,
+    Wavelength,
+    WavemeterException,
+    WavemeterType,
+)
 
 
 class ScpiException(Exception):
@@ -52,19 +72,47 @@ class UnexpectedNumberOfParameterException(ScpiException):
         super().__init__(error_code=-115, error_description="Unexpected number of parameters")
 
 
+class ExecutionErrorException(ScpiException):
+    """The command could not be executed, e.g. due to an I/O error."""
+
+    def __init__(self):
+        super().__init__(error_code=-200, error_description="Execution error")
+
+
+class TooMuchDataException(ScpiException):
+    """The parameter contains more elements than the device can handle."""
+
+    def __init__(self):
+        super().__init__(error_code=-223, error_description="Too much data")
+
+
+class IllegalParameterValueException(ScpiException):
+    """The parameter is not one of the values allowed."""
+
+    def __init__(self):
+        super().__init__(error_code=-224, error_description="Illegal parameter value")
+
+
 def _encode_idn(value: tuple[WavemeterType, int, tuple[int, int]]) -> str:
     wavemeter, serial, software_version = value
     return f"HighFinesse,{wavemeter.name},{serial},{software_version[0]}.{software_version[1]}".upper()
 
 
+# NaN and infinity as per SCPI-99
+SCPI_NAN = str(Decimal("9.91e37"))
+SCPI_INF = str(Decimal("9.9e37"))
+SCPI_NINF = str(Decimal("-9.9e37"))
+
+
 def _map_to_scpi_value(value: int | float | Decimal) -> str:
     if value != value:
-        # Test for NaN and replace it with "9.91e37" as per SCPI-99
-        return str(Decimal("9.91e37"))
-    if float(value) == float("inf"):
-        return str(Decimal("9.9e37"))
-    if float(value) == float("-inf"):
-        return str(Decimal("-9.9e37"))
+        # Test for NaN
+        return SCPI_NAN
+    if value == math.inf:
+        return SCPI_INF
+    if value == -math.inf:
+        return SCPI_NINF
+    # Floats are formatted with the shortest representation, that round-trips to the same double
     return str(value)
 
 
@@ -79,31 +127,389 @@ def _encode_number(values: int | float | Decimal | Iterable[float] | Iterable[fl
     return ",".join(values)
 
 
+class DataFormat(Enum):
+    """The data formats of numeric replies. See SCPI-99 Volume 2, FORMat[:DATA]."""
+
+    ASCII = "ASC"
+    REAL64 = "REAL,64"
+
+
+class ByteOrder(Enum):
+    """The byte order of binary replies. See SCPI-99 Volume 2, FORMat:BORDer."""
+
+    NORMAL = "NORM"
+    SWAPPED = "SWAP"
+
+
+def _map_to_scpi_float(value: int | float | Decimal) -> float:
+    value = float(value)
+    if value != value:
+        # Test for NaN
+        return 9.91e37
+    if value == math.inf:
+        return 9.9e37
+    if value == -math.inf:
+        return -9.9e37
+    return value
+
+
+def _encode_definite_length_block(data: bytes | memoryview) -> bytes:
+    """
+    Wraps the data into an IEEE 488.2 definite length arbitrary block: #<number of digits><length><data>.
+    """
+    length = str(memoryview(data).nbytes)
+    return f"#{len(length)}{length}".encode() + data
+
+
+def _encode_real64(
+    values: int | float | Decimal | Iterable[float] | Iterable[Decimal], byte_order: ByteOrder = ByteOrder.NORMAL
+) -> bytes:
+    """
+    Encodes the values as doubles in a definite length block. NaN and infinity are mapped to the same values as in the
+    ASCII format.
+
+    Parameters
+    ----------
+    values: int or float or Decimal or Iterable of float or Iterable of Decimal
+        The value or values to encode.
+    byte_order: ByteOrder
+        The byte order of the doubles. ByteOrder.NORMAL is big-endian.
+    """
+    try:
+        data = array("d", map(_map_to_scpi_float, values))
+    except TypeError:
+        # if values is not a list
+        data = array("d", (_map_to_scpi_float(values),))
+    if (byte_order is ByteOrder.NORMAL) != (sys.byteorder == "big"):
+        data.byteswap()
+    return _encode_definite_length_block(data.tobytes())
+
+
+def _parse_data_format(value: str) -> DataFormat:
+    data_type, _, length = value.replace(" ", "").upper().partition(",")
+    if data_type in ("ASC", "ASCII"):
+        # The length of ASCII numbers is implementation defined and therefore ignored
+        return DataFormat.ASCII
+    if data_type == "REAL" and length in ("", "64"):
+        return DataFormat.REAL64
+    raise IllegalParameterValueException()
+
+
+def _parse_byte_order(value: str) -> ByteOrder:
+    byte_order = value.strip().upper()
+    if byte_order in ("NORM", "NORMAL"):
+        return ByteOrder.NORMAL
+    if byte_order in ("SWAP", "SWAPPED"):
+        return ByteOrder.SWAPPED
+    raise IllegalParameterValueException()
+
+
+def _parse_boolean(value: str) -> bool:
+    state = value.strip().upper()
+    if state in ("ON", "1"):
+        return True
+    if state in ("OFF", "0"):
+        return False
+    raise IllegalParameterValueException()
+
+
+def _encode_boolean(value: bool) -> str:
+    return "1" if value else "0"
+
+
+def _encode_pattern(pattern: memoryview, byte_order: ByteOrder = ByteOrder.NORMAL) -> bytes:
+    """
+    Encodes a pattern as a definite length block of its native item type. The data is only copied to a temporary
+    array, if the byte order must be swapped.
+
+    Parameters
+    ----------
+    pattern: memoryview
+        The items of the pattern.
+    byte_order: ByteOrder
+        The byte order of the items. ByteOrder.NORMAL is big-endian.
+    """
+    if pattern.itemsize > 1 and (byte_order is ByteOrder.NORMAL) != (sys.byteorder == "big"):
+        swapped = array(pattern.format)
+        swapped.frombytes(pattern.cast("B"))
+        swapped.byteswap()
+        pattern = memoryview(swapped)
+    return _encode_definite_length_block(pattern.cast("B"))
+
+
+def _split_channel_argument(arguments: str) -> tuple[int, str]:
+    """
+    Splits the arguments of a query into a channel list with a single channel and the remaining arguments, e.g.
+    `(@1),100`.
+
+    Parameters
+    ----------
+    arguments: str
+        The arguments of the query.
+
+    Returns
+    -------
+    tuple of int and str
+        The zero-based channel and the remaining arguments without the separating comma.
+    """
+    channel_list, _, remainder = arguments.partition(")")
+    channels = _parse_channel_list(channel_list + ")")
+    if len(channels) != 1:
+        raise IllegalParameterValueException()
+    return channels[0], remainder.strip().lstrip(",").strip()
+
+
+def _parse_pattern_arguments(arguments: str) -> tuple[int, int]:
+    """
+    Parses the arguments of a pattern query: a channel list with a single channel and an optional pattern index, e.g.
+    `(@1),0`.
+
+    Parameters
+    ----------
+    arguments: str
+        The arguments of the query.
+
+    Returns
+    -------
+    tuple of int
+        The zero-based channel and the pattern index.
+    """
+    channel, index = _split_channel_argument(arguments)
+    if not index:
+        return channel, wlmConst.cSignal1Interferometers
+    try:
+        pattern_index = int(index)
+    except ValueError:
+        raise InvalidSyntaxException() from None
+    if not wlmConst.cSignal1Interferometers <= pattern_index <= wlmConst.cSignalAnalysisY:
+        raise IllegalParameterValueException()
+    return channel, pattern_index
+
+
+def _parse_history_arguments(arguments: str) -> tuple[int, int]:
+    """
+    Parses the arguments of a history query: a channel list with a single channel and the number of samples, e.g.
+    `(@1),100`.
+    """
+    channel, number_of_samples = _split_channel_argument(arguments)
+    try:
+        samples = int(number_of_samples)
+    except ValueError:
+        raise InvalidSyntaxException() from None
+    if samples < 1:
+        raise IllegalParameterValueException()
+    return channel, samples
+
+
+def _parse_history_time_arguments(arguments: str) -> tuple[int, float]:
+    """
+    Parses the arguments of a history query by time: a channel list with a single channel and the time window in
+    seconds, e.g. `(@1),2.5`.
+    """
+    channel, duration = _split_channel_argument(arguments)
+    try:
+        seconds = float(duration)
+    except ValueError:
+        raise InvalidSyntaxException() from None
+    if not seconds > 0:  # Also catches NaN
+        raise IllegalParameterValueException()
+    return channel, seconds
+
+
+def _wavelength_history(timestamps: array, wavelengths: array) -> list[int | float]:
+    """Interleave the timestamps in ms and the wavelengths in m. Invalid measurements are returned as NaN."""
+    values = [wavelength / 1e9 if wavelength > 0 else math.nan for wavelength in wavelengths]
+    return [item for sample in zip(timestamps, values) for item in sample]
+
+
+def _frequency_history(timestamps: array, wavelengths: array) -> list[int | float]:
+    """Interleave the timestamps in ms and the frequencies in Hz. Invalid measurements are returned as NaN."""
+    values = [wlmData.SPEED_OF_LIGHT_HZ_NM / wavelength if wavelength > 0 else math.nan for wavelength in wavelengths]
+    return [item for sample in zip(timestamps, values) for item in sample]
+
+
+async def _query_history(
+    query: Callable[[int, int, int | float], tuple[array, array]],
+    converter: Callable[[array, array], list[int | float]],
+    product_id: int,
+    arguments: tuple[int, int | float],
+) -> list[int | float]:
+    channel, limit = arguments
+    return converter(*query(product_id, channel, limit))
+
+
+class ResponseFormat:
+    """
+    The format of the replies sent to a single client connection. Numeric commands, which define an `encode_binary`
+    function, are sent as a binary block, if the REAL format is selected. Commands without an `encode` function are
+    always sent as a binary block.
+    """
+
+    @property
+    def data_format(self) -> DataFormat:
+        return self.__data_format
+
+    @property
+    def byte_order(self) -> ByteOrder:
+        return self.__byte_order
+
+    def __init__(self) -> None:
+        self.__data_format = DataFormat.ASCII
+        self.__byte_order = ByteOrder.NORMAL
+
+    def encode(self, command: Cmd, result: Any) -> bytes:
+        """
+        Encode the result of a query including the terminating newline.
+
+        Parameters
+        ----------
+        command: Cmd
+            The command, that was queried.
+        result: Any
+            The result of the query.
+        """
+        if "encode_binary" in command and (self.__data_format is DataFormat.REAL64 or "encode" not in command):
+            return command["encode_binary"](result, self.__byte_order) + b"\n"
+        return (command["encode"](result) + "\n").encode()
+
+    async def get_data_format(self) -> DataFormat:
+        return self.__data_format
+
+    async def set_data_format(self, data_format: DataFormat) -> None:
+        self.__data_format = data_format
+
+    async def get_byte_order(self) -> ByteOrder:
+        return self.__byte_order
+
+    async def set_byte_order(self, byte_order: ByteOrder) -> None:
+        self.__byte_order = byte_order
+
+
+# The number of raw request lines, that are kept in parsed form
+REQUEST_CACHE_SIZE = 1024
+# The number of channel lists, that are kept in parsed form
+CHANNEL_LIST_CACHE_SIZE = 256
+# The maximum number of channels in a channel list. The wavemeters have at most 8 channels, but channels may be repeated.
+MAX_CHANNEL_LIST_LENGTH = 1024
+
+
+def _expand_header(cmd_expr: str, position: int = 0) -> tuple[list[str], int]:
+    """
+    Enumerates all spellings of a SCPI command expression like `CALibration:WAVElength[:POSTcal]`, where lower case
+    letters are optional as a whole and brackets mark optional nodes.
+
+    Parameters
+    ----------
+    cmd_expr: str
+        The SCPI command expression.
+    position: int
+        The position to start at. Used for the recursion into optional nodes.
+
+    Returns
+    -------
+    tuple of list of str and int
+        The upper case spellings and the position after the end of the (optional) node.
+    """
+    spellings = [""]
+    while position < len(cmd_expr):
+        char = cmd_expr[position]
+        if char == "[":
+            optional, position = _expand_header(cmd_expr, position + 1)
+            spellings = [spelling + suffix for spelling in spellings for suffix in ("", *optional)]
+            continue
+        if char == "]":
+            return spellings, position + 1
+        if char.islower():
+            end = position
+            while end < len(cmd_expr) and cmd_expr[end].islower():
+                end += 1
+            long_form = cmd_expr[position:end].upper()
+            spellings = [spelling + suffix for spelling in spellings for suffix in ("", long_form)]
+            position = end
+            continue
+        spellings = [spelling + char for spelling in spellings]
+        position += 1
+    return spellings, position
+
+
+def compile_commands(*protocols: Commands) -> dict[str, Cmd]:
+    """
+    Creates a dispatch table, that maps all valid spellings of the command headers to the commands. The headers are upper
+    case and can start with a colon. This replaces the regular expression matching of the `Commands` object with a
+    single dictionary lookup. Entries without a handler, which only document a command, are left out.
+
+    Parameters
+    ----------
+    protocols: Commands
+        The commands to compile. Later protocols overwrite the commands of earlier ones.
+
+    Returns
+    -------
+    dict of str and Cmd
+        The dispatch table
+    """
+    dispatch_table: dict[str, Cmd] = {}
+    for protocol in protocols:
+        for cmd_expr, cmd_info in protocol.command_expressions.items():
+            command = cmd_info["value"]
+            if not isinstance(command, dict):
+                continue
+            for header in _expand_header(cmd_expr)[0]:
+                header = header.lstrip(":")
+                dispatch_table[header] = command
+                dispatch_table[":" + header] = command
+    return dispatch_table
+
+
+@lru_cache(maxsize=REQUEST_CACHE_SIZE)
+def parse_request(request: bytes) -> tuple[Request, ...]:
+    """
+    Decodes a line received from a client and splits it into the SCPI requests. The header names are converted to upper
+    case to be looked up in a dispatch table created by `compile_commands()`. The results are cached, because clients
+    tend to poll the same few lines.
+
+    Parameters
+    ----------
+    request: bytes
+        The raw line.
+
+    Returns
+    -------
+    tuple of Request
+        The SCPI requests of the line.
+    """
+    return tuple(
+        Request(scpi_request.name.upper(), scpi_request.args, scpi_request.query)
+        for scpi_request in split_line(request.decode().rstrip())
+    )
+
+
 # matches channel_lists. See page 8-4 of the SCPI-99 "syntax and style" handbook of the SCPI standard
 # https://www.ivifoundation.org/docs/scpi-99.pdf
 match_channel_list = re.compile(r"^\(@([\d,:]+)\)$")
 match_channel = re.compile(r"^(?:\d+|\d+:\d+)$")
 
 
-def _parse_channel_list(channels: str) -> list[int]:
+@lru_cache(maxsize=CHANNEL_LIST_CACHE_SIZE)
+def _parse_channel_list(channels: str) -> tuple[int, ...]:
     """
-    Takes a channel list in SCPI 99 syntax and returns an ordered list of integers. The list is order sensitive. For
+    Takes a channel list in SCPI 99 syntax and returns an ordered tuple of integers. The list is order sensitive. For
     more details see Volume 1: Syntax and Style of the SCPI standard at https://www.ivifoundation.org/docs/scpi-99.pdf,
-    page 8-3.
+    page 8-3. The results are cached, because clients tend to repeat the same channel lists.
     Parameters
     ----------
     channels: str
         SCPI formatted channel_list string
     Returns
     -------
-    list of int
-        A list of integers containing the parsed channels.
+    tuple of int
+        A tuple of integers containing the parsed channels.
     """
     sanitized_channels = match_channel_list.match(channels)
     if sanitized_channels is None:
         raise CommandHeaderError()
 
-    parsed_channels = []
+    parsed_channels: list[int] = []
     for channel in sanitized_channels.group(1).split(","):
         if match_channel.match(channel) is None:
             raise CommandHeaderError()
@@ -113,6 +519,9 @@ def _parse_channel_list(channels: str) -> list[int]:
         except ValueError:
             # The channel is a list not an int
             channel_range = list(map(int, channel.split(":")))
+            # Check the size before expanding the range
+            if len(parsed_channels) + abs(channel_range[1] - channel_range[0]) + 1 > MAX_CHANNEL_LIST_LENGTH:
+                raise TooMuchDataException() from None
             # Test if the list is ascending or descending
             if channel_range[1] >= channel_range[0]:
                 channel_range[1] += 1
@@ -121,43 +530,418 @@ def _parse_channel_list(channels: str) -> list[int]:
                 channel_range[1] -= 1
                 parsed_channels.extend(range(*channel_range, -1))
 
+        if len(parsed_channels) > MAX_CHANNEL_LIST_LENGTH:
+            raise TooMuchDataException()
+
     # The Wavemeter lib uses zero-based numbering
-    return [channel - 1 for channel in parsed_channels]
-
-
-async def _query_channel(
-    function: Callable, channels: Iterable[int]
-) -> Iterable[int] | Iterable[float] | Iterable[Decimal]:
-    coros = [function(channel) for channel in channels]
-
-    # results = await asyncio.gather(*coros)
-    # return results
-    # results = []
-    # for coro in asyncio.as_completed(coros):
-    #     try:
-    #         results.append(await coro)
-    #     except LowSignalError:
-    #         results.append("-1")
-
-    results = await asyncio.gather(*coros, return_exceptions=True)
-    for i in range(len(results)):
-        if isinstance(results[i], NoValueError):
-            results[i] = Decimal("NaN")
-            continue
-        if isinstance(results[i], LowSignalError):
+    return tuple(channel - 1 for channel in parsed_channels)
+
+
+async def _query_channels(
+    function: Callable[[Sequence[int]], Awaitable[list[Decimal | float | WavemeterException]]], channels: Sequence[int]
+) -> list[Decimal | float]:
+    """
+    Query several channels using a function, that reads all channels at once. Channels without a valid measurement
+    are returned as NaN.
+    """
+    results = await function(channels)
+    for i, result in enumerate(results):
+        if isinstance(result, (NoValueError, LowSignalError)):
             results[i] = Decimal("NaN")
-            continue
-        if isinstance(results[i], WavemeterException):
-            raise results[i]
+        elif isinstance(result, WavemeterException):
+            raise result
 
     return results
 
 
+class MeasurementStream:
+    """
+    Pushes the measurements of the subscribed channels to a client as soon as they are sent by the wavemeter. Each
+    measurement is written as a line of the form `<measurement>,<channel>,<timestamp>,<value>`, for example
+    `WAVE,1,123456,6.329912345E-7`. Power measurements have no timestamp. The wavemeter events are only read while
+    there is at least one subscription.
+
+    Parameters
+    ----------
+    wavemeter: Wavemeter
+        The wavemeter sending the measurements.
+    writer: asyncio.StreamWriter
+        The writer of the client connection.
+    """
+
+    MEASUREMENTS = ("WAVE", "FREQ", "POW")
+
+    def __init__(self, wavemeter: Wavemeter, writer: asyncio.StreamWriter) -> None:
+        self.__wavemeter = wavemeter
+        self.__writer = writer
+        self.__subscriptions: dict[str, set[int]] = {measurement: set() for measurement in self.MEASUREMENTS}
+        self.__task: asyncio.Task | None = None
+        self.__logger = logging.getLogger(__name__)
+
+    async def get_channels(self, measurement: str) -> list[int]:
+        """Return the subscribed channels (one-based) of a measurement."""
+        return [channel + 1 for channel in sorted(self.__subscriptions[measurement])]
+
+    async def subscribe(self, measurement: str, channels: Iterable[int]) -> None:
+        """
+        Start streaming a measurement of the channels given.
+
+        Parameters
+        ----------
+        measurement: {"WAVE", "FREQ", "POW"}
+            The type of measurement.
+        channels: Iterable of int
+            The zero-based channel numbers.
+        """
+        self.__subscriptions[measurement].update(channels)
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__stream())
+            self.__task.add_done_callback(self.__stream_done)
+
+    async def unsubscribe(self, measurement: str, channels: Iterable[int]) -> None:
+        """
+        Stop streaming a measurement of the channels given.
+
+        Parameters
+        ----------
+        measurement: {"WAVE", "FREQ", "POW"}
+            The type of measurement.
+        channels: Iterable of int
+            The zero-based channel numbers.
+        """
+        self.__subscriptions[measurement].difference_update(channels)
+        if not any(self.__subscriptions.values()):
+            await self.close()
+
+    async def unsubscribe_all(self) -> None:
+        """Stop streaming all measurements."""
+        for channels in self.__subscriptions.values():
+            channels.clear()
+        await self.close()
+
+    async def close(self) -> None:
+        """Stop reading the wavemeter events."""
+        task = self.__task
+        if task is not None:
+            task.cancel()
+            # Errors are logged by the done callback
+            await asyncio.gather(task, return_exceptions=True)
+            self.__task = None
+
+    def __stream_done(self, task: asyncio.Task) -> None:
+        if self.__task is task:
+            self.__task = None
+        if not task.cancelled() and task.exception() is not None:
+            self.__logger.error("Error while streaming measurements.", exc_info=task.exception())
+
+    def __write(self, measurement: str, channel: int, timestamp: int | str, value: int | float | Decimal) -> None:
+        self.__writer.write(f"{measurement},{channel + 1},{timestamp},{_map_to_scpi_value(value)}\n".encode())
+
+    async def __stream(self) -> None:
+        wavelengths, frequencies, powers = (self.__subscriptions[measurement] for measurement in self.MEASUREMENTS)
+        # Only keep the latest measurement of each type and channel if the client cannot keep up
+        async for event in self.__wavemeter.read_events(
+            overflow=OverflowPolicy.COALESCE, key=type, event_types=(Wavelength, Power)
+        ):
+            if isinstance(event, Wavelength):
+                if event.channel in wavelengths:
+                    value = _convert_or_nan(wlmData.convert_wavelength, event.value, event.channel)
+                    self.__write("WAVE", event.channel, event.timestamp, value)
+                if event.channel in frequencies:
+                    value = _convert_or_nan(wlmData.convert_wavelength_to_frequency, event.value, event.channel)
+                    self.__write("FREQ", event.channel, event.timestamp, value)
+            elif isinstance(event, Power) and event.channel in powers:
+                # The power is sent in µW without a timestamp
+                self.__write("POW", event.channel, "", wlmData.convert_power(event.value))
+            else:
+                continue
+            await self.__writer.drain()
+
+
+def _convert_or_nan(converter: Callable[[Decimal, int], Decimal], value: Decimal, channel: int) -> Decimal:
+    try:
+        return converter(value, channel)
+    except WavemeterException:
+        return Decimal("NaN")
+
+
 IDNCmd = partial(Cmd, encode=_encode_idn, decode=lambda x: x, doc="identification query")
-NumberCmdR = partial(Cmd, encode=_encode_number)
+NumberCmdR = partial(Cmd, encode=_encode_number, encode_binary=_encode_real64)
+PatternCmdR = partial(Cmd, encode_binary=_encode_pattern, decode=_parse_pattern_arguments)
+SubscribeCmd = partial(Cmd, encode=_encode_number, decode=_parse_channel_list)
+
+
+def _parse_statistics_window(window: str) -> int:
+    try:
+        samples = int(window)
+    except ValueError:
+        raise InvalidSyntaxException() from None
+    if samples < 1:
+        raise IllegalParameterValueException()
+    return samples
 
 
-def create_scpi_protocol(wavemeter: Wavemeter) -> Commands:
+async def _query_statistics(
+    statistics: MeasurementStatistics, getter: Callable[[WindowStatistics], Iterable[float]], channels: Sequence[int]
+) -> list[float]:
+    """
+    Query the statistics of several channels. Channels without a valid measurement return NaN for all values.
+    """
+    results: list[float] = []
+    for channel in channels:
+        channel_statistics = statistics.get(channel)
+        if channel_statistics is None:
+            results.extend(getter(_EMPTY_STATISTICS))
+        else:
+            results.extend(getter(channel_statistics))
+    return results
+
+
+async def _get_statistics_window(statistics: MeasurementStatistics) -> int:
+    return statistics.window
+
+
+async def _set_statistics_window(statistics: MeasurementStatistics, window: int) -> None:
+    statistics.window = window
+
+
+async def _clear_statistics(statistics: MeasurementStatistics) -> None:
+    statistics.clear()
+
+
+# The statistics of a channel without measurements. All values are NaN.
+_EMPTY_STATISTICS = WindowStatistics(1)
+
+
+def create_statistics_protocol(statistics: MeasurementStatistics) -> Commands:
+    """
+    Creates the CALCulate:AVERage subsystem, that returns the statistics of the wavelengths measured over a sliding
+    window of samples. The window is shared by all clients of the wavemeter. The values are in m.
+
+    Parameter
+    ---------
+    statistics: MeasurementStatistics
+        The statistics of the wavemeter.
+    """
+    # The statistics are kept in nm as sent by the wavemeter
+    return Commands(
+        {
+            "CALCulate:AVERage:MEAN": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(_query_statistics, statistics, lambda stats: (stats.mean / 1e9,)),
+                doc="mean wavelength query",
+            ),
+            "CALCulate:AVERage:SDEViation": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(_query_statistics, statistics, lambda stats: (stats.standard_deviation / 1e9,)),
+                doc="wavelength standard deviation query",
+            ),
+            "CALCulate:AVERage:MINimum": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(_query_statistics, statistics, lambda stats: (stats.minimum / 1e9,)),
+                doc="minimum wavelength query",
+            ),
+            "CALCulate:AVERage:MAXimum": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(_query_statistics, statistics, lambda stats: (stats.maximum / 1e9,)),
+                doc="maximum wavelength query",
+            ),
+            "CALCulate:AVERage:PTPeak": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(_query_statistics, statistics, lambda stats: ((stats.maximum - stats.minimum) / 1e9,)),
+                doc="peak-to-peak wavelength query",
+            ),
+            "CALCulate:AVERage:ALL": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(
+                    _query_statistics,
+                    statistics,
+                    lambda stats: (
+                        stats.count,
+                        stats.mean / 1e9,
+                        stats.standard_deviation / 1e9,
+                        stats.minimum / 1e9,
+                        stats.maximum / 1e9,
+                    ),
+                ),
+                doc="statistics query, returns the number of samples, mean, standard deviation, minimum and maximum",
+            ),
+            "CALCulate:AVERage:COUNt": NumberCmdR(
+                decode=_parse_statistics_window,
+                get=partial(_get_statistics_window, statistics),
+                set=partial(_set_statistics_window, statistics),
+                doc="number of samples of the statistics window, setting it clears the statistics",
+            ),
+            "CALCulate:AVERage:CLEar": Cmd(set=partial(_clear_statistics, statistics), doc="clear the statistics"),
+        }
+    )
+
+
+def _parse_single_channel(arguments: str) -> int:
+    """Parses a channel list with a single channel, e.g. `(@1)`."""
+    channel, remainder = _split_channel_argument(arguments)
+    if remainder:
+        raise UnexpectedNumberOfParameterException()
+    return channel
+
+
+async def _query_allan_deviation(allan_deviation: MeasurementAllanDeviation, channel: int) -> list[float]:
+    """
+    Query the Allan deviation of a channel. Returns the averaging times in s interleaved with the deviations. Only the
+    averaging times with enough samples are returned.
+    """
+    channel_allan_deviation = allan_deviation.get(channel)
+    if channel_allan_deviation is None:
+        return []
+    taus, deviations = channel_allan_deviation.get()
+    return [item for pair in zip(taus, deviations) for item in pair]
+
+
+async def _query_allan_deviation_count(allan_deviation: MeasurementAllanDeviation, channel: int) -> int:
+    channel_allan_deviation = allan_deviation.get(channel)
+    return channel_allan_deviation.count if channel_allan_deviation is not None else 0
+
+
+async def _clear_allan_deviation(allan_deviation: MeasurementAllanDeviation) -> None:
+    allan_deviation.clear()
+
+
+def create_allan_deviation_protocol(allan_deviation: MeasurementAllanDeviation) -> Commands:
+    """
+    Creates the CALCulate:ADEViation subsystem, that returns the overlapping Allan deviation of the fractional frequency
+    of a channel for the averaging times tau = 1, 2, 4, ... samples. The samples are accumulated since the start of
+    the server or the last CALCulate:ADEViation:CLEar.
+
+    Parameter
+    ---------
+    allan_deviation: MeasurementAllanDeviation
+        The Allan deviation of the wavemeter.
+    """
+    return Commands(
+        {
+            "CALCulate:ADEViation": NumberCmdR(
+                decode=_parse_single_channel,
+                get=partial(_query_allan_deviation, allan_deviation),
+                doc="Allan deviation query, returns pairs of the averaging time in s and the deviation",
+            ),
+            "CALCulate:ADEViation:COUNt": NumberCmdR(
+                decode=_parse_single_channel,
+                get=partial(_query_allan_deviation_count, allan_deviation),
+                doc="number of samples of the Allan deviation",
+            ),
+            "CALCulate:ADEViation:CLEar": Cmd(
+                set=partial(_clear_allan_deviation, allan_deviation), doc="clear the Allan deviation"
+            ),
+        }
+    )
+
+
+async def _get_profiler_state(profiler: DllProfiler) -> bool:
+    return profiler.enabled
+
+
+async def _set_profiler_state(profiler: DllProfiler, enable: bool) -> None:
+    profiler.enabled = enable
+
+
+async def _query_profiled_functions(profiler: DllProfiler) -> list[str]:
+    return profiler.get_functions()
+
+
+def _parse_function_name(function: str) -> str:
+    function = function.strip().strip("\"'")
+    if not function:
+        raise UnexpectedNumberOfParameterException()
+    return function
+
+
+async def _query_function_profile(profiler: DllProfiler, function: str) -> list[float]:
+    """
+    Query the number of calls of a DLL function followed by the mean and the quantiles (see `PROFILE_QUANTILES`) of the
+    queue time (including the wait for the scheduler lock) and of the call time in s. Functions not called return a
+    count of 0 and NaN for the times.
+    """
+    profile = profiler.get(function)
+    if profile is None:
+        return [0] + [math.nan] * (2 * (len(PROFILE_QUANTILES) + 1))
+    return [
+        profile.count,
+        profile.queue_time.mean,
+        *profile.queue_time.quantiles,
+        profile.call_time.mean,
+        *profile.call_time.quantiles,
+    ]
+
+
+async def _clear_profiler(profiler: DllProfiler) -> None:
+    profiler.clear()
+
+
+async def _dump_profile(profiler: DllProfiler, path: str) -> None:
+    try:
+        await asyncio.to_thread(profiler.dump, path)
+    except OSError:
+        logging.getLogger(__name__).exception("Error writing the DLL profile to '%s'.", path)
+        raise ExecutionErrorException() from None
+
+
+def create_profiler_protocol(profiler: DllProfiler, dump_file: str | None = None) -> Commands:
+    """
+    Creates the SYSTem:PROFile subsystem, that controls the profiling of the DLL calls and returns the latencies per
+    wlmData function. The profiler is shared by all wavemeters and clients.
+
+    Parameter
+    ---------
+    profiler: DllProfiler
+        The profiler of the DLL worker.
+    dump_file: str or None
+        The file SYSTem:PROFile:DUMP writes the histograms to. If None, the command is not available.
+    """
+    protocol = Commands(
+        {
+            "SYSTem:PROFile[:STATe]": Cmd(
+                get=partial(_get_profiler_state, profiler),
+                set=partial(_set_profiler_state, profiler),
+                encode=_encode_boolean,
+                decode=_parse_boolean,
+                doc="enable the profiling of the DLL calls, ON or OFF",
+            ),
+            "SYSTem:PROFile:FUNCtions": Cmd(
+                get=partial(_query_profiled_functions, profiler),
+                encode=",".join,
+                doc="names of the DLL functions called, while the profiler was enabled",
+            ),
+            "SYSTem:PROFile:DATA": NumberCmdR(
+                decode=_parse_function_name,
+                get=partial(_query_function_profile, profiler),
+                doc="profile of a DLL function, returns the number of calls, the mean and the 50, 90, 99 and 99.9 %"
+                " quantiles of the queue time followed by those of the call time in s",
+            ),
+            "SYSTem:PROFile:CLEar": Cmd(set=partial(_clear_profiler, profiler), doc="clear the DLL profile"),
+        }
+    )
+    if dump_file:
+        protocol["SYSTem:PROFile:DUMP"] = Cmd(
+            set=partial(_dump_profile, profiler, dump_file), doc="write the DLL profile to the configured file"
+        )
+    return protocol
+
+
+async def _fetch_pattern(pattern_store: PatternStore, arguments: tuple[int, int]) -> memoryview:
+    channel, index = arguments
+    if index != pattern_store.index:
+        raise IllegalParameterValueException()
+    frame = pattern_store.get(channel)
+    # Return an empty block, if there is no pattern yet
+    return frame.data if frame is not None else memoryview(b"")
+
+
+def create_scpi_protocol(
+    wavemeter: Wavemeter,
+    use_cache: bool = False,
+    cache_max_age: float | None = None,
+    pattern_store: PatternStore | None = None,
+) -> Commands:
     """
     Creates for every wavemeter a dictionary of commands.
 
@@ -165,8 +949,19 @@ def create_scpi_protocol(wavemeter: Wavemeter) -> Commands:
     ---------
     wavemeter: Wavemeter
         Device which receive commands.
+    use_cache: bool
+        If True, MEASure queries are answered from the latest values sent by the wavemeter instead of querying the DLL.
+        FETCh queries always use these values.
+    cache_max_age: float or None
+        The maximum age of a cached value in seconds. Older values are queried from the DLL. If None, any cached value
+        is used.
+    pattern_store: PatternStore or None
+        The store of the patterns read, when the wavemeter signals a new pattern. If None, FETCh:PATTern is not
+        available.
     """
-    return Commands(
+    fetch_wavelengths = partial(wavemeter.get_cached_wavelengths, max_age=cache_max_age)
+    fetch_frequencies = partial(wavemeter.get_cached_frequencies, max_age=cache_max_age)
+    protocol = Commands(
         {
             # Mandatory commands.
             "*CLS": "Clear Status Command",
@@ -182,15 +977,57 @@ def create_scpi_protocol(wavemeter: Wavemeter) -> Commands:
             # Device specific commands.
             "MEASure:WAVElength": NumberCmdR(
                 decode=_parse_channel_list,
-                get=partial(_query_channel, wavemeter.get_wavelength),
+                get=partial(_query_channels, fetch_wavelengths if use_cache else wavemeter.get_wavelengths),
                 doc="wavelength measurement query",
             ),  # wavelength of specific channel
             # Note for thesis: Calling wavelength and right after frequency leads to two different measurements.
             "MEASure:FREQuency": NumberCmdR(
                 decode=_parse_channel_list,
-                get=partial(_query_channel, wavemeter.get_frequency),
+                get=partial(_query_channels, fetch_frequencies if use_cache else wavemeter.get_frequencies),
                 doc="frequency measurement query",
             ),
+            "FETCh:WAVElength": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(_query_channels, fetch_wavelengths),
+                doc="latest wavelength query",
+            ),
+            "FETCh:FREQuency": NumberCmdR(
+                decode=_parse_channel_list,
+                get=partial(_query_channels, fetch_frequencies),
+                doc="latest frequency query",
+            ),
+            "MEASure:PATTern": PatternCmdR(
+                get=lambda arguments: wavemeter.get_pattern(*arguments),
+                doc="pattern query, returns a binary block",
+            ),
+            "FETCh:WAVElength:HISTory": NumberCmdR(
+                decode=_parse_history_arguments,
+                get=partial(
+                    _query_history, measurement_history.get_wavelengths, _wavelength_history, wavemeter.product_id
+                ),
+                doc="wavelength history query, returns the last samples as timestamp and value pairs",
+            ),
+            "FETCh:WAVElength:HISTory:TIME": NumberCmdR(
+                decode=_parse_history_time_arguments,
+                get=partial(
+                    _query_history, measurement_history.get_wavelengths_since, _wavelength_history, wavemeter.product_id
+                ),
+                doc="wavelength history query, returns the samples of the last seconds as timestamp and value pairs",
+            ),
+            "FETCh:FREQuency:HISTory": NumberCmdR(
+                decode=_parse_history_arguments,
+                get=partial(
+                    _query_history, measurement_history.get_wavelengths, _frequency_history, wavemeter.product_id
+                ),
+                doc="frequency history query, returns the last samples as timestamp and value pairs",
+            ),
+            "FETCh:FREQuency:HISTory:TIME": NumberCmdR(
+                decode=_parse_history_time_arguments,
+                get=partial(
+                    _query_history, measurement_history.get_wavelengths_since, _frequency_history, wavemeter.product_id
+                ),
+                doc="frequency history query, returns the samples of the last seconds as timestamp and value pairs",
+            ),
             "MEASure:TEMPerature": NumberCmdR(decode=lambda x: x, get=wavemeter.get_temperature),
             "ROUTe:CLOSe:STATe": NumberCmdR(decode=lambda x: x, get=wavemeter.get_channel),
             "FETCh:CHannel:COUNT": NumberCmdR(decode=lambda x: x, get=wavemeter.get_channel_count),
@@ -202,3 +1039,77 @@ def create_scpi_protocol(wavemeter: Wavemeter) -> Commands:
             ),
         }
     )
+    if pattern_store is not None:
+        protocol["FETCh:PATTern"] = PatternCmdR(
+            get=partial(_fetch_pattern, pattern_store), doc="latest pattern query, returns a binary block"
+        )
+    return protocol
+
+
+def create_subscription_protocol(stream: MeasurementStream) -> Commands:
+    """
+    Creates the commands to subscribe to measurements. These commands are bound to a single client connection.
+
+    Parameter
+    ---------
+    stream: MeasurementStream
+        The stream pushing the measurements to the client.
+    """
+    return Commands(
+        {
+            "SUBScribe:WAVElength": SubscribeCmd(
+                get=partial(stream.get_channels, "WAVE"),
+                set=partial(stream.subscribe, "WAVE"),
+                doc="stream wavelength measurements",
+            ),
+            "SUBScribe:FREQuency": SubscribeCmd(
+                get=partial(stream.get_channels, "FREQ"),
+                set=partial(stream.subscribe, "FREQ"),
+                doc="stream frequency measurements",
+            ),
+            "SUBScribe:POWer": SubscribeCmd(
+                get=partial(stream.get_channels, "POW"),
+                set=partial(stream.subscribe, "POW"),
+                doc="stream power measurements",
+            ),
+            "UNSubscribe:WAVElength": SubscribeCmd(
+                set=partial(stream.unsubscribe, "WAVE"), doc="stop streaming wavelength measurements"
+            ),
+            "UNSubscribe:FREQuency": SubscribeCmd(
+                set=partial(stream.unsubscribe, "FREQ"), doc="stop streaming frequency measurements"
+            ),
+            "UNSubscribe:POWer": SubscribeCmd(
+                set=partial(stream.unsubscribe, "POW"), doc="stop streaming power measurements"
+            ),
+            "UNSubscribe:ALL": Cmd(set=stream.unsubscribe_all, doc="stop streaming all measurements"),
+        }
+    )
+
+
+def create_format_protocol(response_format: ResponseFormat) -> Commands:
+    """
+    Creates the commands to select the format of the replies. These commands are bound to a single client connection.
+
+    Parameter
+    ---------
+    response_format: ResponseFormat
+        The format of the replies sent to the client.
+    """
+    return Commands(
+        {
+            "FORMat[:DATA]": Cmd(
+                get=response_format.get_data_format,
+                set=response_format.set_data_format,
+                encode=lambda data_format: data_format.value,
+                decode=_parse_data_format,
+                doc="data format of numeric replies, ASCii or REAL,64",
+            ),
+            "FORMat:BORDer": Cmd(
+                get=response_format.get_byte_order,
+                set=response_format.set_byte_order,
+                encode=lambda byte_order: byte_order.value,
+                decode=_parse_byte_order,
+                doc="byte order of binary replies, NORMal or SWAPped",
+            ),
+        }
+    )
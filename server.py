@@ -4,31 +4,140 @@ from __future__ import annotations
 import asyncio
 import logging
 import sys
-from typing import Any, Callable, Coroutine, Iterable, Sequence
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, Sequence
 
 from decouple import UndefinedValueError, config
 from pydantic import IPvAnyInterface, ValidationError
-from scpi import Commands, split_line
+from scpi import Cmd
 
 from _version import __version__
-from config_parser import parse_log_level, parse_wavemeter_config
-from scpi_protocol import ScpiException, UnexpectedNumberOfParameterException, create_scpi_protocol
+from async_event_bus import event_bus
+from config_parser import (
+    parse_log_level,
+    parse_number_type,
+    parse_optional_float,
+    parse_wavemeter_config,
+)
+from scpi_protocol import (
+    MeasurementStream,
+    ResponseFormat,
+    ScpiException,
+    UnexpectedNumberOfParameterException,
+    compile_commands,
+    create_allan_deviation_protocol,
+    create_format_protocol,
+    create_profiler_protocol,
+    create_scpi_protocol,
+    create_statistics_protocol,
+    create_subscription_protocol,
+    parse_request,
+)
+from wmControl import wlmConst, wlmData
+from wmControl.allan_deviation import MeasurementAllanDeviation
+from wmControl.dll_profiler import dll_profiler
+from wmControl.measurement_history import DEFAULT_HISTORY_SIZE, measurement_history
+from wmControl.metrics import metrics_registry, serve_metrics
+from wmControl.pattern_store import PatternStore
+from wmControl.recorder import DEFAULT_MAX_FILE_AGE, DEFAULT_MAX_FILE_SIZE, Recorder
+from wmControl.statistics import DEFAULT_STATISTICS_WINDOW, MeasurementStatistics
 from wmControl.wavemeter import Wavemeter
-from wmControl.wlmConst import WavemeterServerInitialized, WavemeterServerShutdown
+from wmControl.wlmConst import (
+    WavemeterServerInitialized,
+    WavemeterServerShutdown,
+    WavemeterServerStatus,
+)
 
 dll_path = None
-if sys.platform == "win32":
-    if config("CONNECTION_TYPE", default="REMOTE") == "LOCAL":
+connection_type = config("CONNECTION_TYPE", default="REMOTE")
+if connection_type == "SIMULATED":
+    # Simulate the wavemeters for testing without hardware
+    wlmData.LoadSimulatedDLL(
+        channels=config("SIMULATION_CHANNELS", default=8, cast=int),
+        event_rate=config("SIMULATION_EVENT_RATE", default=100.0, cast=float),
+        latency=config("SIMULATION_LATENCY", default=0.0, cast=float),
+        error_rate=config("SIMULATION_ERROR_RATE", default=0.0, cast=float),
+        seed=config("SIMULATION_SEED", default=0, cast=int),
+    )
+elif sys.platform == "win32":
+    if connection_type == "LOCAL":
         dll_path = "C:/Windows/System32/wlmData.dll"
     else:
         dll_path = "./wmControl/wlmData.dll"
 elif sys.platform == "linux":
-    if config("CONNECTION_TYPE", default="REMOTE") == "LOCAL":
+    if connection_type == "LOCAL":
         raise ValueError("Cannot connect locally using Linux.")
     dll_path = "./wmControl/libwlmData.so"
 
+use_measurement_cache = config("MEASUREMENT_CACHE", default=False, cast=bool)
+measurement_cache_max_age = config("MEASUREMENT_CACHE_MAX_AGE", default=None, cast=parse_optional_float)
+# Keep the measurement values as the double returned by the DLL instead of converting them to Decimal
+wlmConst.set_number_type(config("NUMBER_FORMAT", default="decimal", cast=parse_number_type))
+# Collect the events sent by the DLL for this time in seconds and hand them to the event loop in a single batch
+event_bus.batch_interval = config("EVENT_BATCH_INTERVAL", default=0.0, cast=float)
+# Serve up to this number of consecutive DLL calls of the active wavemeter, before switching to a waiting wavemeter
+Wavemeter.set_max_batch_size(config("DLL_MAX_BATCH_SIZE", default=16, cast=int))
+# The number of measurements kept per channel for the history queries. 0 disables the history.
+measurement_history.size = config("HISTORY_SIZE", default=DEFAULT_HISTORY_SIZE, cast=int)
+# Read the interferometer pattern, whenever the wavemeter signals a new one. Serves FETCh:PATTern.
+use_pattern_streaming = config("PATTERN_STREAMING", default=False, cast=bool)
+# The initial number of measurements per channel the CALCulate:AVERage statistics are calculated over. 0 disables them.
+statistics_window = config("STATISTICS_WINDOW", default=DEFAULT_STATISTICS_WINDOW, cast=int)
+# The number of averaging times (tau = 1, 2, 4, ... samples) of the CALCulate:ADEViation query. 0 disables it.
+allan_deviation_octaves = config("ALLAN_DEVIATION_OCTAVES", default=0, cast=int)
+# Record all measurements to compressed files in this directory. An empty value disables the recorder.
+recorder_directory = config("RECORDER_DIRECTORY", default="")
+recorder_max_file_size = config("RECORDER_MAX_FILE_SIZE", default=DEFAULT_MAX_FILE_SIZE, cast=int)
+recorder_max_file_age = config("RECORDER_MAX_FILE_AGE", default=DEFAULT_MAX_FILE_AGE, cast=float)
+# The number of requests of a client executed concurrently. Set to 1 to execute the requests one after another.
+pipeline_depth = config("PIPELINE_DEPTH", default=8, cast=int)
+# Serve the metrics of the daemon via HTTP at /metrics on this port. 0 disables the endpoint.
+metrics_port = config("METRICS_PORT", default=0, cast=int)
+# Only collect the metrics, if they are served
+metrics_registry.enabled = bool(metrics_port)
+metrics_interface = config("METRICS_INTERFACE", default="") or None
+# Record the latencies of the DLL calls per function from the start. Can be toggled via SYSTem:PROFile.
+dll_profiler.enabled = config("DLL_PROFILING", default=False, cast=bool)
+# The file SYSTem:PROFile:DUMP writes the DLL profile to. An empty value disables the command.
+dll_profile_file = config("DLL_PROFILE_FILE", default="") or None
+
+scpi_clients = metrics_registry.gauge("scpi_clients", "Number of connected SCPI clients.", ("product_id",))
+scpi_requests_total = metrics_registry.counter(
+    "scpi_requests_total",
+    "Number of SCPI requests received per command header as sent by the client.",
+    ("product_id", "command"),
+)
+scpi_request_errors_total = metrics_registry.counter(
+    "scpi_request_errors_total", "Number of SCPI requests answered with an error or dropped.", ("product_id",)
+)
+scpi_request_duration_seconds = metrics_registry.histogram(
+    "scpi_request_duration_seconds",
+    "Time from parsing a SCPI request until its result is available in s.",
+    ("product_id",),
+)
+scpi_job_queue_size = metrics_registry.gauge(
+    "scpi_job_queue_size", "Number of requests received, but not parsed yet.", ("product_id",)
+)
+scpi_requests_in_flight = metrics_registry.gauge(
+    "scpi_requests_in_flight",
+    "Number of requests being executed or waiting for their reply to be sent.",
+    ("product_id",),
+)
+event_bus_subscribers = metrics_registry.gauge(
+    "event_bus_subscribers", "Number of subscribers of the events of a wavemeter.", ("product_id",)
+)
+event_bus_queued_events = metrics_registry.gauge(
+    "event_bus_queued_events", "Number of events waiting to be read by the subscribers.", ("product_id",)
+)
+event_bus_dropped_events = metrics_registry.gauge(
+    "event_bus_dropped_events",
+    "Number of events dropped by the current subscribers, because they fell behind.",
+    ("product_id",),
+)
 
-async def read_stream(reader: asyncio.StreamReader, job_queue: asyncio.Queue[bytes]) -> None:
+
+async def read_stream(reader: asyncio.StreamReader, job_queue: asyncio.Queue[bytes], product_id: int = 0) -> None:
     """
     Reads input from client out of stream.
 
@@ -36,9 +145,12 @@ async def read_stream(reader: asyncio.StreamReader, job_queue: asyncio.Queue[byt
     ---------
     reader: asyncio.StreamReader
         Reader of client connection.
-    requests: janus.AsyncQueue
+    job_queue: asyncio.Queue of bytes
         Queue receiving requests from stream.
+    product_id: int
+        The wavemeter served, used to label the metrics.
     """
+    metric_labels = (str(product_id),)
     request: bytes
     async for request in reader:
         # Commands are separated by a newline
@@ -47,77 +159,249 @@ async def read_stream(reader: asyncio.StreamReader, job_queue: asyncio.Queue[byt
             break
         logging.getLogger(__name__).debug("Received '%s' from client.", request)
         await job_queue.put(request)
+        scpi_job_queue_size.inc(labels=metric_labels)
 
 
-async def write_stream(
-    writer: asyncio.StreamWriter, protocol: Commands, job_queue: asyncio.Queue[bytes], device_timeout: float
+async def execute_request(
+    function_call: Callable[..., Awaitable[Any]],
+    decode: Callable[[str], Any] | None,
+    args: str,
+    encode: Callable[[Any], bytes] | None,
+    dependencies: Sequence[asyncio.Task],
+    timeout: float | None = None,
+) -> bytes | None:
+    """
+    Execute a single SCPI request, after all requests it depends on are done. The reply is encoded right away, because
+    the format of the reply might be changed by the next request.
+
+    Parameter
+    ---------
+    function_call: Callable
+        The get or set function of the SCPI command.
+    decode: Callable or None
+        The function to decode the arguments of the request.
+    args: str
+        The arguments of the request.
+    encode: Callable or None
+        The function to encode the reply. None, if the request is not a query.
+    dependencies: Sequence of asyncio.Task
+        The requests to wait for before executing this request.
+    timeout: float or None
+        The time in seconds the request may take once its dependencies are done. If None, wait indefinitely.
+
+    Raises
+    ------
+    asyncio.TimeoutError
+        Raised if the request did not complete within the timeout.
+    """
+    if dependencies:
+        await asyncio.wait(dependencies)
+    try:
+        if args:
+            coro = function_call(decode(args))
+        else:
+            coro = function_call()
+    except TypeError:
+        raise UnexpectedNumberOfParameterException from None
+    result = await asyncio.wait_for(coro, timeout) if timeout is not None else await coro
+    return encode(result) if encode is not None else None
+
+
+async def dispatch_requests(
+    protocol: dict[str, Cmd],
+    job_queue: asyncio.Queue[bytes],
+    replies: asyncio.Queue[asyncio.Task[bytes | None]],
+    slots: asyncio.Semaphore,
+    response_format: ResponseFormat,
+    product_id: int = 0,
+    device_timeout: float | None = None,
 ) -> None:
     """
-    Parses the SCPI request and replies if needed. This is the main worker, because it parses the SCPI request and does
-    the error handling.
+    Parses the SCPI requests ahead of the replies and executes them concurrently. Queries run concurrently, while
+    commands setting a value act as a barrier: They are executed after all previous requests are done and all following
+    requests wait for them.
 
     Parameter
     ---------
-    writer: asyncio.StreamWriter
-        Writer of client connection.
-    measurements: janus.AsyncQueue
-        Queue holding the results.
+    protocol: dict of str and Cmd
+        The dispatch table of the SCPI commands available to the client. See `compile_commands()`.
+    job_queue: asyncio.Queue
+        Queue holding the requests received from the client.
+    replies: asyncio.Queue
+        Queue receiving the requests being executed in the order of arrival.
+    slots: asyncio.Semaphore
+        Limits the number of requests being executed. A slot is released, when the reply was sent.
+    response_format: ResponseFormat
+        The format of the replies.
+    product_id: int
+        The wavemeter served, used to label the metrics.
+    device_timeout: float or None
+        The time in seconds a request may take once its dependencies are done. If None, wait indefinitely.
     """
-    while "sending replies":
+    metric_labels = (str(product_id),)
+    barrier: asyncio.Task | None = None  # The last set command
+    in_flight: list[asyncio.Task] = []  # The queries issued since the last set command
+    while "parsing requests":
         request = await job_queue.get()
+        scpi_job_queue_size.dec(labels=metric_labels)
+        # Try to decode SCPI request.
         try:
-            request_str = request.decode().rstrip()
+            scpi_requests = parse_request(request)
         except UnicodeDecodeError:
             continue  # TODO: reply with an error
 
-        # Try to decode SCPI request.
-        try:
-            scpi_requests = split_line(request_str)
-        except KeyError:
-            logging.getLogger(__name__).info("Received unknown request: '%s'.", request_str)
-            continue
-            # await requests.put('Received unknown command.')
-            # TODO: reply with an error
-
         for scpi_request in scpi_requests:
             try:
                 parsed_command = protocol[scpi_request.name]
             except KeyError:
                 # TODO: reply with an error
                 logging.getLogger(__name__).info("Unknown request received: '%s'.", scpi_requests)
+                scpi_requests_total.inc(labels=(metric_labels[0], "unknown"))
                 break
+            scpi_requests_total.inc(labels=(metric_labels[0], scpi_request.name))
             logging.getLogger(__name__).debug("Received SCPI request: %s", parsed_command.get("doc", parsed_command))
             try:
                 function_call = parsed_command["get" if scpi_request.query else "set"]
             except KeyError:
                 # TODO: reply with an error
                 continue
-            result: str
-
-            try:
-                try:
-                    if scpi_request.args:
-                        coro = function_call(parsed_command["decode"](scpi_request.args))
-                    else:
-                        coro = function_call()
-                except TypeError:
-                    raise UnexpectedNumberOfParameterException from None
-                result = await coro
-            except ScpiException as exc:
-                # Return a SCPI error
-                writer.write(f"{exc}\n".encode())
-                continue
-            except TimeoutError:
-                logging.getLogger(__name__).debug("Timeout error while querying the wavemeter. Dropping request.")
-                break
 
+            await slots.acquire()
+            scpi_requests_in_flight.inc(labels=metric_labels)
+            in_flight = [task for task in in_flight if not task.done()]
+            dependencies = [barrier] if barrier is not None and not barrier.done() else []
+            if not scpi_request.query:
+                dependencies += in_flight
+            task = asyncio.create_task(
+                execute_request(
+                    function_call,
+                    parsed_command.get("decode"),
+                    scpi_request.args,
+                    partial(response_format.encode, parsed_command) if scpi_request.query else None,
+                    dependencies,
+                    device_timeout,
+                )
+            )
+            task.add_done_callback(partial(_observe_request_duration, time.perf_counter(), metric_labels))
             if scpi_request.query:
-                writer.write((parsed_command["encode"](result) + "\n").encode())
+                in_flight.append(task)
+            else:
+                barrier = task
+                in_flight = []
+            replies.put_nowait(task)
+
+
+def _observe_request_duration(start: float, metric_labels: tuple[str], _task: asyncio.Task) -> None:
+    scpi_request_duration_seconds.observe(time.perf_counter() - start, metric_labels)
+
+
+async def send_replies(
+    writer: asyncio.StreamWriter,
+    replies: asyncio.Queue[asyncio.Task[bytes | None]],
+    slots: asyncio.Semaphore,
+    product_id: int = 0,
+) -> None:
+    """
+    Waits for the requests in the order of arrival and replies if needed. This does the error handling.
+
+    Parameter
+    ---------
+    writer: asyncio.StreamWriter
+        Writer of client connection.
+    replies: asyncio.Queue
+        Queue holding the requests being executed.
+    slots: asyncio.Semaphore
+        Limits the number of requests being executed. A slot is released, when the reply was sent.
+    product_id: int
+        The wavemeter served, used to label the metrics.
+    """
+    metric_labels = (str(product_id),)
+    while "sending replies":
+        task = await replies.get()
+        reply: bytes | None
+        try:
+            reply = await task
+        except ScpiException as exc:
+            # Return a SCPI error
+            scpi_request_errors_total.inc(labels=metric_labels)
+            writer.write(f"{exc}\n".encode())
+            continue
+        except (TimeoutError, asyncio.TimeoutError):
+            logging.getLogger(__name__).debug("Timeout error while querying the wavemeter. Dropping request.")
+            scpi_request_errors_total.inc(labels=metric_labels)
+            continue
+        finally:
+            slots.release()
+            scpi_requests_in_flight.dec(labels=metric_labels)
+
+        if reply is not None:
+            writer.write(reply)
+            if replies.empty():
+                # Only wait for the client, when there is nothing else to send
                 await writer.drain()
 
 
+async def write_stream(
+    writer: asyncio.StreamWriter,
+    protocol: dict[str, Cmd],
+    job_queue: asyncio.Queue[bytes],
+    device_timeout: float,
+    pipeline_depth: int = 1,
+    response_format: ResponseFormat | None = None,
+    product_id: int = 0,
+) -> None:
+    """
+    Parses the SCPI request and replies if needed. This is the main worker, because it parses the SCPI request and does
+    the error handling. Up to `pipeline_depth` requests are executed concurrently, but the replies are sent in the order
+    of the requests.
+
+    Parameter
+    ---------
+    writer: asyncio.StreamWriter
+        Writer of client connection.
+    protocol: dict of str and Cmd
+        The dispatch table of the SCPI commands available to the client. See `compile_commands()`.
+    job_queue: asyncio.Queue
+        Queue holding the requests received from the client.
+    device_timeout: float
+        The time in seconds a request may take, before it is dropped without a reply.
+    pipeline_depth: int
+        The maximum number of requests executed concurrently.
+    response_format: ResponseFormat or None
+        The format of the replies. If None, the replies are sent in ASCII format.
+    product_id: int
+        The wavemeter served, used to label the metrics.
+    """
+    if response_format is None:
+        response_format = ResponseFormat()
+    replies: asyncio.Queue[asyncio.Task[bytes | None]] = asyncio.Queue()
+    slots = asyncio.Semaphore(pipeline_depth)
+    tasks = {
+        asyncio.create_task(
+            dispatch_requests(protocol, job_queue, replies, slots, response_format, product_id, device_timeout)
+        ),
+        asyncio.create_task(send_replies(writer, replies, slots, product_id)),
+    }
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Cancel the requests still being executed
+        while not replies.empty():
+            request_task = replies.get_nowait()
+            request_task.cancel()
+            tasks.add(request_task)
+            scpi_requests_in_flight.dec(labels=(str(product_id),))
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def create_client_handler(
     wavemeter: Wavemeter,
+    pattern_store: PatternStore | None = None,
+    statistics: MeasurementStatistics | None = None,
+    allan_deviation: MeasurementAllanDeviation | None = None,
 ) -> Callable[[asyncio.StreamReader, asyncio.StreamWriter], Coroutine[Any, Any, None]]:
     """
     A closure to inject the wavemeter into the client callback handler.
@@ -126,12 +410,30 @@ def create_client_handler(
     ----------
     wavemeter: Wavemeter
         The wavemeter managed by this handler
+    pattern_store: PatternStore or None
+        The store of the patterns streamed from the wavemeter, if enabled.
+    statistics: MeasurementStatistics or None
+        The statistics of the measurements of the wavemeter, if enabled.
+    allan_deviation: MeasurementAllanDeviation or None
+        The Allan deviation of the measurements of the wavemeter, if enabled.
 
     Returns
     -------
     Callable
         The client_connected_cb callback that can be passed to asyncio.start_server().
     """
+    # The commands shared by all connections are compiled only once
+    dispatch_table = compile_commands(
+        create_scpi_protocol(
+            wavemeter,
+            use_cache=use_measurement_cache,
+            cache_max_age=measurement_cache_max_age,
+            pattern_store=pattern_store,
+        ),
+        *((create_statistics_protocol(statistics),) if statistics is not None else ()),
+        *((create_allan_deviation_protocol(allan_deviation),) if allan_deviation is not None else ()),
+        create_profiler_protocol(dll_profiler, dump_file=dll_profile_file),
+    )
 
     async def client_handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         """
@@ -147,16 +449,36 @@ def create_client_handler(
             Pushes the outbound traffic to the client.
         """
         # Limit the size of the job queue to create backpressure on the input
-        job_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=5)
+        job_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=pipeline_depth)
         pending_tasks: set[asyncio.Task] = set()  # Set with TODOs.
 
         # Read the inputs from the client
-        input_task = asyncio.create_task(read_stream(reader, job_queue=job_queue))
+        metric_labels = (str(wavemeter.product_id),)
+        scpi_clients.inc(labels=metric_labels)
+        input_task = asyncio.create_task(read_stream(reader, job_queue=job_queue, product_id=wavemeter.product_id))
         pending_tasks.add(input_task)
 
         # Execute commands and send back the results
-        protocol = create_scpi_protocol(wavemeter)
-        publish = asyncio.create_task(write_stream(writer, protocol, job_queue, device_timeout=2.0))
+        measurement_stream = MeasurementStream(wavemeter, writer)
+        response_format = ResponseFormat()
+        # Add the commands bound to this connection
+        protocol = {
+            **dispatch_table,
+            **compile_commands(
+                create_subscription_protocol(measurement_stream), create_format_protocol(response_format)
+            ),
+        }
+        publish = asyncio.create_task(
+            write_stream(
+                writer,
+                protocol,
+                job_queue,
+                device_timeout=2.0,
+                pipeline_depth=pipeline_depth,
+                response_format=response_format,
+                product_id=wavemeter.product_id,
+            )
+        )
         pending_tasks.add(publish)
 
         try:
@@ -180,6 +502,10 @@ def create_client_handler(
                         pass
         finally:
             logging.getLogger(__name__).debug("Shutting down client handler.")
+            scpi_clients.dec(labels=metric_labels)
+            # The requests left in the queue are discarded with it
+            scpi_job_queue_size.dec(job_queue.qsize(), labels=metric_labels)
+            await measurement_stream.close()
             # Cancel all remaining tasks
             for pending_task in pending_tasks:
                 pending_task.cancel()
@@ -200,13 +526,34 @@ def create_client_handler(
 
 
 async def monitor_wavemeter(wavemeter: Wavemeter):
-    async for event in wavemeter.read_events():
+    async for event in wavemeter.read_events(event_types=WavemeterServerStatus):
         if isinstance(event, WavemeterServerShutdown):
             break
         if isinstance(event, WavemeterServerInitialized) and event.value == 0:
             break
 
 
+def register_event_bus_metrics(product_id: int) -> None:
+    """
+    Export the state of the subscriptions to the events of a wavemeter. The values are read, when the metrics are
+    collected.
+
+    Parameter
+    ---------
+    product_id: int
+        The wavemeter, whose events are monitored.
+    """
+    topic = str(product_id)
+    metric_labels = (topic,)
+    event_bus_subscribers.set_function(lambda: len(event_bus.get_subscriptions(topic)), metric_labels)
+    event_bus_queued_events.set_function(
+        lambda: sum(subscription.qsize for subscription in event_bus.get_subscriptions(topic)), metric_labels
+    )
+    event_bus_dropped_events.set_function(
+        lambda: sum(subscription.dropped for subscription in event_bus.get_subscriptions(topic)), metric_labels
+    )
+
+
 async def create_wm_server(product_id: int, interface: str | Sequence[str] | None, port: int) -> None:
     """
     Create a wavemeter SCPI server. The server listens at the given port and passes the commands to the wavemeter with
@@ -223,12 +570,37 @@ async def create_wm_server(product_id: int, interface: str | Sequence[str] | Non
         The port number to listen at.
     """
     assert isinstance(port, int) and port > 0
+    register_event_bus_metrics(product_id)
 
     while "running the server":
         pending_tasks: set[asyncio.Task] = set()
         async with Wavemeter(product_id, dll_path=dll_path) as wavemeter:  # Activate wavemeter.
+            # Optional services, that do not stop the server, if they fail
+            optional_tasks: set[asyncio.Task] = set()
+            pattern_store: PatternStore | None = None
+            if use_pattern_streaming:
+                pattern_store = PatternStore(wavemeter)
+                optional_tasks.add(asyncio.create_task(pattern_store.run()))
+            statistics: MeasurementStatistics | None = None
+            if statistics_window:
+                statistics = MeasurementStatistics(wavemeter, window=statistics_window)
+                optional_tasks.add(asyncio.create_task(statistics.run()))
+            allan_deviation: MeasurementAllanDeviation | None = None
+            if allan_deviation_octaves:
+                allan_deviation = MeasurementAllanDeviation(wavemeter, octaves=allan_deviation_octaves)
+                optional_tasks.add(asyncio.create_task(allan_deviation.run()))
+            if recorder_directory:
+                recorder = Recorder(
+                    wavemeter,
+                    recorder_directory,
+                    max_file_size=recorder_max_file_size,
+                    max_file_age=recorder_max_file_age,
+                )
+                optional_tasks.add(asyncio.create_task(recorder.run()))
             server = await asyncio.start_server(
-                client_connected_cb=create_client_handler(wavemeter), host=interface, port=port
+                client_connected_cb=create_client_handler(wavemeter, pattern_store, statistics, allan_deviation),
+                host=interface,
+                port=port,
             )
 
             monitor_task = asyncio.create_task(monitor_wavemeter(wavemeter))
@@ -244,6 +616,7 @@ async def create_wm_server(product_id: int, interface: str | Sequence[str] | Non
                 pending_tasks.add(client_task)
                 done, pending_tasks = await asyncio.wait(pending_tasks, return_when=asyncio.FIRST_COMPLETED)
 
+                pending_tasks.update(optional_tasks)
                 for pending_task in pending_tasks:
                     pending_task.cancel()
                 try:
@@ -283,31 +656,34 @@ async def main(wavemeter_config: Iterable[tuple[int, IPvAnyInterface | Sequence[
     logging.getLogger(__name__).info(
         "Wavemeter configurations found for: %s.", ",".join(map(str, sorted(wavemeters_configured)))
     )
+    if metrics_port:
+        server_list.add(asyncio.create_task(serve_metrics(metrics_interface, metrics_port)))
     await asyncio.gather(*server_list)
 
 
-logging.basicConfig(
-    # format="%(asctime)s.%(msecs)03d %(levelname)-8s %(message)s",
-    format="%(message)s",
-    level=config("APPLICATION_LOG_LEVEL", default=logging.INFO, cast=parse_log_level),
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+if __name__ == "__main__":
+    logging.basicConfig(
+        # format="%(asctime)s.%(msecs)03d %(levelname)-8s %(message)s",
+        format="%(message)s",
+        level=config("APPLICATION_LOG_LEVEL", default=logging.INFO, cast=parse_log_level),
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
 
-# 536: Quips B WS-6 192.168.1.240
-# 4711: Quips B WS-8 192.168.1.240
-# 4734: Quips C WS-8 192.168.1.45
-try:
-    wavemeters = parse_wavemeter_config(config("WAVEMETERS"))
-except UndefinedValueError:
-    logging.getLogger(__name__).error("No wavemeters defined. Check the 'WAVEMETERS' environment variable.")
-except ValidationError as validation_exc:
-    logging.getLogger(__name__).error(f"Invalid wavemeter configuration: {validation_exc}")
-else:
+    # 536: Quips B WS-6 192.168.1.240
+    # 4711: Quips B WS-8 192.168.1.240
+    # 4734: Quips C WS-8 192.168.1.45
     try:
-        asyncio.run(main(wavemeters))
-    except KeyboardInterrupt:
-        pass
-    finally:
-        logging.getLogger(__name__).warning("#################################################")
-        logging.getLogger(__name__).warning("Stopping SCPI daemon...")
-        logging.getLogger(__name__).warning("#################################################")
+        wavemeters = parse_wavemeter_config(config("WAVEMETERS"))
+    except UndefinedValueError:
+        logging.getLogger(__name__).error("No wavemeters defined. Check the 'WAVEMETERS' environment variable.")
+    except ValidationError as validation_exc:
+        logging.getLogger(__name__).error(f"Invalid wavemeter configuration: {validation_exc}")
+    else:
+        try:
+            asyncio.run(main(wavemeters))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            logging.getLogger(__name__).warning("#################################################")
+            logging.getLogger(__name__).warning("Stopping SCPI daemon...")
+            logging.getLogger(__name__).warning("#################################################")
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import math
+import random
+
+import pytest
+
+from async_event_bus import event_bus
+from wmControl.allan_deviation import (
+    AllanDeviation,
+    AllanDeviationResult,
+    MeasurementAllanDeviation,
+    get_allan_deviation_topic,
+)
+from wmControl.wavemeter import DEFAULT_EVENT_QUEUE_SIZE, Wavemeter
+from wmControl.wlmConst import Wavelength1
+
+PRODUCT_ID = 4711
+
+
+def overlapping_allan_deviation(samples: list[float], factor: int) -> float:
+    reference = samples[0]
+    fractional = [(sample - reference) / reference for sample in samples]
+    averages = [math.fsum(fractional[start : start + factor]) / factor for start in range(len(samples) - factor + 1)]
+    differences = [averages[start + factor] - averages[start] for start in range(len(averages) - factor)]
+    return math.sqrt(math.fsum(difference**2 for difference in differences) / (2 * len(differences)))
+
+
+@pytest.mark.parametrize("octaves", [1, 3, 6])
+def test_allan_deviation(octaves: int):
+    rng = random.Random(42)
+    # White frequency noise plus a random walk
+    samples = [632.99 + rng.gauss(0, 1e-6) for _ in range(300)]
+    for index in range(1, len(samples)):
+        samples[index] += rng.gauss(0, 1e-7) * index**0.5
+    allan_deviation = AllanDeviation(octaves)
+    for index, sample in enumerate(samples):
+        allan_deviation.add(sample, index * 0.1)
+
+    taus, deviations = allan_deviation.get()
+    assert allan_deviation.count == len(samples)
+    assert allan_deviation.sample_interval == pytest.approx(0.1)
+    assert len(taus) == len(deviations) == octaves
+    for tau, deviation, factor in zip(taus, deviations, allan_deviation.factors):
+        assert tau == pytest.approx(factor * 0.1)
+        assert deviation == pytest.approx(overlapping_allan_deviation(samples, factor), rel=1e-6)
+
+
+def test_allan_deviation_not_enough_samples():
+    allan_deviation = AllanDeviation(4)
+    for index in range(5):
+        allan_deviation.add(780.0 + index * 1e-6, index)
+
+    # Tau = 1 and 2 samples need at least 2 and 4 samples, 4 samples need 8
+    taus, deviations = allan_deviation.get()
+    assert taus == (1, 2)
+    assert len(deviations) == 2
+
+    allan_deviation.clear()
+    assert allan_deviation.count == 0
+    assert allan_deviation.get() == ((), ())
+
+
+def test_results_published_on_own_topic(simulated_dll):
+    async def run():
+        async with Wavemeter(PRODUCT_ID, dll_path=None) as wavemeter:
+            allan_deviation = MeasurementAllanDeviation(wavemeter, octaves=2)
+            results = event_bus.subscribe(get_allan_deviation_topic(PRODUCT_ID))
+            measurements = event_bus.subscribe(str(PRODUCT_ID), event_types=AllanDeviationResult)
+            result = asyncio.create_task(anext(results))
+            measurement = asyncio.create_task(anext(measurements))
+            await asyncio.sleep(0)
+            try:
+                # The results are published every 2 samples
+                for index in range(3):
+                    allan_deviation.update(Wavelength1(PRODUCT_ID, index, 780.0 + index * 1e-6), index * 0.1)
+                await asyncio.wait_for(result, 1)
+                await asyncio.sleep(0)
+                # The measurement topic of the wavemeter must only carry the data packages
+                assert not measurement.done()
+            finally:
+                measurement.cancel()
+                await asyncio.gather(measurement, return_exceptions=True)
+                await results.aclose()
+                await measurements.aclose()
+            return result.result()
+
+    result = asyncio.run(run())
+    assert result.product_id == PRODUCT_ID
+    assert result.channel == 0
+    assert result.taus == pytest.approx((0.1,))
+    assert len(result.deviations) == 1
+
+
+def test_dropped_measurements_logged(simulated_dll, caplog):
+    async def run():
+        async with Wavemeter(PRODUCT_ID, dll_path=None) as wavemeter:
+            allan_deviation = MeasurementAllanDeviation(wavemeter, octaves=2)
+            task = asyncio.create_task(allan_deviation.run())
+            await asyncio.sleep(0)
+            try:
+                # Publish more measurements than queued without giving the task a chance to read them
+                for index in range(DEFAULT_EVENT_QUEUE_SIZE + 5):
+                    event_bus.publish(str(PRODUCT_ID), Wavelength1(PRODUCT_ID, index, 780.0 + index * 1e-6))
+                while allan_deviation.get(0) is None or allan_deviation.get(0).count < DEFAULT_EVENT_QUEUE_SIZE:
+                    await asyncio.sleep(0.01)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    with caplog.at_level(logging.WARNING, logger="wmControl.allan_deviation"):
+        asyncio.run(asyncio.wait_for(run(), 5))
+    assert [record.args[1] for record in caplog.records] == [5]
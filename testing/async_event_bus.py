@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import pytest
+
+from async_event_bus import AsyncEventBus, OverflowPolicy, SyncSubscription
+
+
+def _drain(subscription: SyncSubscription) -> list:
+    events = []
+    while subscription.qsize:
+        events.append(subscription.get())
+    return events
+
+
+@pytest.mark.parametrize(
+    "maxsize, overflow, key, events, result, dropped",
+    [
+        (3, OverflowPolicy.DROP_OLDEST, None, [1, 2, 3, 4, 5], [3, 4, 5], 2),
+        (3, OverflowPolicy.DROP_NEWEST, None, [1, 2, 3, 4, 5], [1, 2, 3], 2),
+        (2, OverflowPolicy.COALESCE, lambda x: x[0], [("a", 1), ("b", 1), ("a", 2), ("c", 1)], [("a", 2), ("b", 1)], 2),
+        (3, OverflowPolicy.DROP_OLDEST, None, [1, 2], [1, 2], 0),
+        (0, OverflowPolicy.DROP_OLDEST, None, [1, 2, 3, 4, 5], [1, 2, 3, 4, 5], 0),
+    ],
+)
+def test_overflow_policy(maxsize, overflow, key, events, result, dropped):
+    subscription = SyncSubscription(maxsize=maxsize, overflow=overflow, key=key)
+    for event in events:
+        subscription.put(event)
+
+    assert _drain(subscription) == result
+    assert subscription.dropped == dropped
+
+
+def test_coalesce_requires_key():
+    with pytest.raises(ValueError):
+        SyncSubscription(maxsize=1, overflow=OverflowPolicy.COALESCE)
+
+
+def test_event_type_filter():
+    subscription = SyncSubscription(event_types=(int, bytes))
+    for event in [1, "a", True, b"b", 2.0]:
+        if subscription.accepts(event):
+            subscription.put(event)
+
+    assert _drain(subscription) == [1, True, b"b"]
+
+
+@pytest.mark.parametrize("batch_interval", [0.0, 0.01])
+def test_publish_from_thread(batch_interval: float):
+    event_bus = AsyncEventBus()
+    event_bus.batch_interval = batch_interval
+
+    async def run():
+        received = []
+        subscriber = event_bus.subscribe("topic", event_types=int)
+        # Start the subscription before publishing
+        first_event = asyncio.create_task(anext(subscriber))
+        await asyncio.sleep(0)
+
+        publisher = threading.Thread(
+            target=lambda: [event_bus.publish_sync("topic", event) for event in [*range(100), "filtered"]]
+        )
+        publisher.start()
+        received.append(await first_event)
+        while len(received) < 100:
+            received.append(await anext(subscriber))
+        publisher.join()
+        await subscriber.aclose()
+        return received
+
+    assert asyncio.run(run()) == list(range(100))
+
+
+def test_publish_from_thread_filtered():
+    event_bus = AsyncEventBus()
+
+    async def run():
+        subscriber = event_bus.subscribe("topic", event_types=int)
+        first_event = asyncio.create_task(anext(subscriber))
+        await asyncio.sleep(0)
+        loop = asyncio.get_running_loop()
+        scheduled = []
+        call_soon_threadsafe = loop.call_soon_threadsafe
+        loop.call_soon_threadsafe = lambda *args: scheduled.append(args) or call_soon_threadsafe(*args)
+        try:
+            publisher = threading.Thread(target=event_bus.publish_sync, args=("topic", "filtered"))
+            publisher.start()
+            publisher.join()
+            # Events not accepted by any subscriber must not wake up the event loop
+            assert not scheduled
+
+            publisher = threading.Thread(target=event_bus.publish_sync, args=("topic", 1))
+            publisher.start()
+            publisher.join()
+            assert len(scheduled) == 1
+        finally:
+            del loop.call_soon_threadsafe
+        event = await first_event
+        await subscriber.aclose()
+        return event
+
+    assert asyncio.run(run()) == 1
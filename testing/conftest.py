@@ -0,0 +1,15 @@
+import pytest
+
+from wmControl import wlmData
+from wmControl.simulated_dll import SimulatedDll
+
+
+@pytest.fixture
+def simulated_dll():
+    """Replace the DLL by a simulation with 2 channels, that does not send any events."""
+    previous_dll = wlmData.dll
+    wlmData.dll = SimulatedDll(channels=2, event_rate=0)
+    try:
+        yield wlmData.dll
+    finally:
+        wlmData.dll = previous_dll
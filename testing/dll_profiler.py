@@ -0,0 +1,88 @@
+import asyncio
+import json
+import math
+import time
+
+from wmControl.dll_profiler import PROFILE_QUANTILES, DllProfiler, dll_profiler
+from wmControl.wavemeter import DllWorker, Wavemeter, dll_worker
+
+
+def get_wavelength(dll, channel):
+    return 780.0 + channel
+
+
+def test_profile():
+    profiler = DllProfiler()
+    for index in range(1, 1001):
+        profiler.record(get_wavelength, queue_time=1e-6 * index, call_time=1e-3 * index)
+    profile = profiler.get("get_wavelength")
+
+    assert profiler.get_functions() == ["get_wavelength"]
+    assert profile.count == 1000
+    assert math.isclose(profile.call_time.mean, 0.5005)
+    for quantile, value in zip(PROFILE_QUANTILES, profile.call_time.quantiles):
+        # The buckets are 9 % wide
+        assert quantile <= value <= quantile * 1.1
+    assert profiler.get("get_frequency") is None
+
+    profiler.clear()
+    assert profiler.get_functions() == []
+
+
+def test_dump(tmp_path):
+    profiler = DllProfiler()
+    profiler.record(get_wavelength, queue_time=1e-5, call_time=1e3)
+    path = tmp_path / "profile.json"
+    profiler.dump(path)
+    with open(path, encoding="utf-8") as file:
+        call_time = json.load(file)["functions"]["get_wavelength"]["call_time"]
+
+    # The call time exceeds the largest bucket
+    assert call_time["count"] == 1
+    assert call_time["buckets"] == [[None, 1]]
+    assert call_time["quantiles"]["0.5"] is None
+
+
+def test_dll_worker():
+    async def run():
+        worker = DllWorker()
+        return await asyncio.gather(*(worker.submit(get_wavelength, channel) for channel in range(10)))
+
+    dll_profiler.clear()
+    dll_profiler.enabled = True
+    try:
+        assert asyncio.run(run()) == [780.0 + channel for channel in range(10)]
+    finally:
+        dll_profiler.enabled = False
+    assert dll_profiler.get("get_wavelength").count == 10
+    dll_profiler.clear()
+
+
+def test_queue_time_includes_lock_wait(simulated_dll):
+    async def run():
+        async with Wavemeter(4711, dll_path=None) as wavemeter:
+            # Only profile the calls below, not the ones of connect()
+            dll_profiler.clear()
+            scheduler = Wavemeter._scheduler  # pylint: disable=protected-access
+            await scheduler.acquire(wavemeter.product_id)
+            task = asyncio.create_task(wavemeter.get_application_index())
+            await asyncio.sleep(0.05)
+            scheduler.release()
+            await task
+            # A call not waiting for a lock is measured from the submission to the DLL worker
+            start = time.perf_counter()
+            await dll_worker.submit(get_wavelength, 1)
+            return time.perf_counter() - start
+
+    dll_profiler.clear()
+    dll_profiler.enabled = True
+    try:
+        direct_call_time = asyncio.run(run())
+    finally:
+        dll_profiler.enabled = False
+    profiles = {function: dll_profiler.get(function) for function in dll_profiler.get_functions()}
+    dll_profiler.clear()
+
+    # The call waited for the lock held above
+    assert profiles["get_wavemeter_index"].queue_time.mean >= 0.05
+    assert profiles["get_wavelength"].queue_time.mean <= direct_call_time
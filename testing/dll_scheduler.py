@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from wmControl.dll_scheduler import DllScheduler
+
+
+async def _schedule(scheduler: DllScheduler, requests: list[int]) -> list[int]:
+    order = []
+
+    async def job(product_id: int) -> None:
+        async with scheduler.lock(product_id):
+            order.append(product_id)
+
+    # Block the scheduler, so that all requests are queued
+    await scheduler.acquire(requests[0])
+    tasks = [asyncio.create_task(job(product_id)) for product_id in requests[1:]]
+    await asyncio.sleep(0)
+    assert scheduler.waiting == len(requests) - 1
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    assert not scheduler.locked
+    return order
+
+
+@pytest.mark.parametrize(
+    "max_batch_size, requests, result",
+    [
+        (16, [1, 2, 1, 2, 1, 2], [1, 1, 2, 2, 2]),
+        (2, [1, 2, 1, 2, 1, 1, 2], [1, 2, 2, 1, 1, 2]),
+        (1, [1, 1, 2, 3, 1, 2], [2, 3, 1, 2, 1]),
+        (2, [1, 1, 1, 1], [1, 1, 1]),
+    ],
+)
+def test_affinity(max_batch_size, requests, result):
+    scheduler = DllScheduler(max_batch_size=max_batch_size)
+    assert asyncio.run(_schedule(scheduler, requests)) == result
+
+
+def test_cancel_waiter():
+    async def run():
+        scheduler = DllScheduler()
+        await scheduler.acquire(1)
+        waiter = asyncio.create_task(scheduler.acquire(2))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.waiting == 0
+        scheduler.release()
+        assert not scheduler.locked
+
+    asyncio.run(run())
+
+
+def test_release_to_cancelled_waiter():
+    async def run():
+        scheduler = DllScheduler()
+        await scheduler.acquire(1)
+        cancelled = asyncio.create_task(scheduler.acquire(2))
+        waiter = asyncio.create_task(scheduler.acquire(3))
+        await asyncio.sleep(0)
+        # Release, before the cancelled waiter can remove itself
+        cancelled.cancel()
+        scheduler.release()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        await asyncio.wait_for(waiter, 1)
+        assert scheduler.locked
+        scheduler.release()
+        assert not scheduler.locked
+        assert scheduler.waiting == 0
+
+        # Nobody left to hand the lock to
+        await scheduler.acquire(1)
+        cancelled = asyncio.create_task(scheduler.acquire(2))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        scheduler.release()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert not scheduler.locked
+        await asyncio.wait_for(scheduler.acquire(1), 1)
+
+    asyncio.run(run())
+
+
+def test_priority():
+    async def run():
+        scheduler = DllScheduler()
+        order = []
+
+        async def job(product_id: int, priority: int) -> None:
+            async with scheduler.lock(product_id, priority):
+                order.append((product_id, priority))
+
+        await scheduler.acquire(1)
+        tasks = [
+            asyncio.create_task(job(product_id, priority)) for product_id, priority in [(1, 1), (1, 1), (2, 0), (1, 0)]
+        ]
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    # The control requests (priority 0) overtake the measurements, the affinity applies within a priority
+    assert asyncio.run(run()) == [(1, 0), (2, 0), (1, 1), (1, 1)]
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from wmControl.wavemeter import DllWorker, JobPriority, Wavemeter
+
+
+def test_priority():
+    async def run():
+        worker = DllWorker()
+        order = []
+        blocked = threading.Event()
+        # Block the worker, so that the following jobs are queued
+        first_job = worker.submit(lambda dll: blocked.wait())
+        jobs = [
+            worker.submit(lambda dll, name: order.append(name), name, priority=priority)
+            for name, priority in [
+                ("measurement1", JobPriority.MEASUREMENT),
+                ("control1", JobPriority.CONTROL),
+                ("measurement2", JobPriority.MEASUREMENT),
+                ("control2", JobPriority.CONTROL),
+            ]
+        ]
+        blocked.set()
+        await asyncio.gather(first_job, *jobs)
+        return order
+
+    assert asyncio.run(run()) == ["control1", "control2", "measurement1", "measurement2"]
+
+
+def test_exception():
+    def fail(dll):
+        raise ValueError("DLL error")
+
+    async def run():
+        await DllWorker().submit(fail)
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_control_overtakes_measurements(simulated_dll):
+    async def run():
+        wavemeter = Wavemeter(4711, dll_path=None)
+        order = []
+
+        async def call(name, function, *args):
+            await function(*args)
+            order.append(name)
+
+        # All calls are queued at the scheduler, while the first measurement is executed
+        tasks = [asyncio.create_task(call(f"measurement{index}", wavemeter.get_wavelength, 0)) for index in range(3)]
+        tasks.append(asyncio.create_task(call("control", wavemeter.get_application_index)))
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(run()) == ["measurement0", "control", "measurement1", "measurement2"]
+
+
+def test_set_max_batch_size():
+    max_batch_size = Wavemeter._scheduler.max_batch_size  # pylint: disable=protected-access
+    try:
+        Wavemeter.set_max_batch_size(4)
+        assert Wavemeter._scheduler.max_batch_size == 4  # pylint: disable=protected-access
+        with pytest.raises(ValueError):
+            Wavemeter.set_max_batch_size(0)
+    finally:
+        Wavemeter.set_max_batch_size(max_batch_size)
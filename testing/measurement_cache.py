@@ -0,0 +1,44 @@
+import time
+
+from wmControl.measurement_cache import MeasurementCache
+from wmControl.wlmConst import (
+    Temperature,
+    Wavelength1,
+    Wavelength2,
+    WavemeterServerShutdown,
+)
+
+
+def test_latest_wavelength():
+    cache = MeasurementCache()
+    assert cache.get_wavelength(4711, 0) is None
+
+    cache.update(Wavelength1(4711, 100, 632.991))
+    cache.update(Wavelength1(4711, 200, 632.992))
+    cache.update(Wavelength2(4711, 200, 780.241))
+    cache.update(Temperature(4711, 200, 23.5))
+
+    assert cache.get_wavelength(4711, 0).timestamp == 200
+    assert cache.get_wavelength(4711, 1).channel == 1
+    assert cache.get_wavelength(4711, 2) is None
+    assert cache.get_wavelength(4734, 0) is None
+
+
+def test_max_age():
+    cache = MeasurementCache()
+    cache.update(Wavelength1(4711, 100, 632.991))
+    time.sleep(0.01)
+
+    assert cache.get_wavelength(4711, 0, max_age=None) is not None
+    assert cache.get_wavelength(4711, 0, max_age=10) is not None
+    assert cache.get_wavelength(4711, 0, max_age=0.001) is None
+
+
+def test_server_shutdown_clears_cache():
+    cache = MeasurementCache()
+    cache.update(Wavelength1(4711, 100, 632.991))
+    cache.update(Wavelength1(4734, 100, 632.991))
+    cache.update(WavemeterServerShutdown(4711, 0))
+
+    assert cache.get_wavelength(4711, 0) is None
+    assert cache.get_wavelength(4734, 0) is not None
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from wmControl.measurement_history import MeasurementHistory, RingBuffer
+from wmControl.wlmConst import (
+    Temperature,
+    Wavelength1,
+    Wavelength2,
+    WavemeterServerStart,
+)
+
+
+@pytest.mark.parametrize(
+    "size, samples, number_of_samples, result",
+    [
+        (4, 3, 10, [0, 1, 2]),
+        (4, 3, 2, [1, 2]),
+        (4, 6, 4, [2, 3, 4, 5]),
+        (4, 6, 3, [3, 4, 5]),
+        (4, 8, 4, [4, 5, 6, 7]),
+        (4, 0, 4, []),
+    ],
+)
+def test_ring_buffer(size: int, samples: int, number_of_samples: int, result: list[int]):
+    buffer = RingBuffer(size)
+    for sample in range(samples):
+        buffer.append(sample, sample / 2)
+
+    timestamps, values = buffer.get_last(number_of_samples)
+    assert list(timestamps) == result
+    assert list(values) == [sample / 2 for sample in result]
+    assert len(buffer) == min(samples, size)
+
+
+def test_ring_buffer_since():
+    buffer = RingBuffer(4)
+    for sample in range(6):
+        buffer.append(sample * 10, sample)
+
+    assert list(buffer.get_since(25)[0]) == [30, 40, 50]
+    assert list(buffer.get_since(0)[0]) == [20, 30, 40, 50]
+    assert list(buffer.get_since(60)[0]) == []
+
+
+def test_history():
+    history = MeasurementHistory(size=2)
+    for value in (632.1, 632.2, 632.3):
+        history.update(Wavelength1(4711, 100, value))
+    history.update(Wavelength2(4711, 100, 780.0))
+    history.update(Temperature(4711, 100, 23.5))
+
+    assert list(history.get_wavelengths(4711, 0, 10)[1]) == [632.2, 632.3]
+    assert list(history.get_wavelengths(4711, 1, 10)[1]) == [780.0]
+    assert list(history.get_wavelengths_since(4711, 0, 10)[1]) == [632.2, 632.3]
+    assert list(history.get_wavelengths(4711, 2, 10)[1]) == []
+
+    history.size = 0
+    history.update(Wavelength1(4711, 100, 632.1))
+    assert list(history.get_wavelengths(4711, 0, 10)[1]) == []
+
+
+def test_history_clock_adjusted(monkeypatch):
+    history = MeasurementHistory(size=10)
+    wall_clock = [1_700_000_000_000_000_000]
+
+    def time_ns() -> int:
+        # The system clock is set back by 1 h after each call
+        wall_clock[0] -= 3600 * 10**9
+        return wall_clock[0]
+
+    monkeypatch.setattr(time, "time_ns", time_ns)
+    for value in (632.1, 632.2, 632.3):
+        history.update(Wavelength1(4711, 100, value))
+
+    timestamps, wavelengths = history.get_wavelengths_since(4711, 0, 10)
+    assert list(wavelengths) == [632.1, 632.2, 632.3]
+    assert list(timestamps) == sorted(timestamps)
+
+
+def test_history_cleared_on_server_status():
+    history = MeasurementHistory(size=10)
+    history.update(Wavelength1(4711, 100, 632.1))
+    history.update(Wavelength1(4712, 100, 632.1))
+    history.update(WavemeterServerStart(4711, 0))
+
+    assert list(history.get_wavelengths(4711, 0, 10)[1]) == []
+    assert list(history.get_wavelengths(4712, 0, 10)[1]) == [632.1]
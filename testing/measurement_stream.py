@@ -0,0 +1,124 @@
+import asyncio
+import logging
+
+from async_event_bus import event_bus
+from scpi_protocol import (
+    MeasurementStream,
+    compile_commands,
+    create_subscription_protocol,
+)
+from wmControl.wavemeter import Wavemeter
+from wmControl.wlmConst import Power1, Power2, Wavelength1, Wavelength2
+
+PRODUCT_ID = 4711
+
+
+class MemoryWriter:
+    """Collects the lines written like an asyncio.StreamWriter."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.data = bytearray()
+        self.error = error
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+
+async def request(protocol, header: str, args: str = "", query: bool = False):
+    command = protocol[header]
+    if query:
+        return await command["get"]()
+    if args:
+        return await command["set"](command["decode"](args))
+    return await command["set"]()
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_stream_measurements(simulated_dll):
+    async def run():
+        async with Wavemeter(PRODUCT_ID, dll_path=None) as wavemeter:
+            writer = MemoryWriter()
+            stream = MeasurementStream(wavemeter, writer)  # type: ignore
+            protocol = compile_commands(create_subscription_protocol(stream))
+            topic = str(PRODUCT_ID)
+            try:
+                await request(protocol, "SUBS:WAVE", "(@1)")
+                await request(protocol, "SUBS:FREQ", "(@2)")
+                await request(protocol, "SUBS:POW", "(@1,2)")
+                assert await request(protocol, "SUBS:POW", query=True) == [1, 2]
+                await asyncio.sleep(0)
+                for package in (
+                    Wavelength1(PRODUCT_ID, 100, 632.5),
+                    Power1(PRODUCT_ID, 12),
+                    Wavelength2(PRODUCT_ID, 101, 780.0),
+                    Power2(PRODUCT_ID, 7),
+                ):
+                    event_bus.publish(topic, package)
+                    await wait_for(lambda: not event_bus.get_subscriptions(topic)[0].qsize)
+                lines = writer.data.decode().splitlines()
+
+                # Channel 1 is no longer streamed, the wavelengths of channel 2 never were
+                await request(protocol, "UNS:WAVE", "(@1)")
+                await request(protocol, "UNS:POW", "(@1)")
+                assert await request(protocol, "SUBS:WAVE", query=True) == []
+                del writer.data[:]
+                event_bus.publish(topic, Wavelength1(PRODUCT_ID, 102, 632.5))
+                event_bus.publish(topic, Power1(PRODUCT_ID, 13))
+                event_bus.publish(topic, Wavelength2(PRODUCT_ID, 103, 780.0))
+                await wait_for(lambda: not event_bus.get_subscriptions(topic)[0].qsize)
+                filtered_lines = writer.data.decode().splitlines()
+
+                await request(protocol, "UNS:ALL")
+                assert not event_bus.get_subscriptions(topic)
+            finally:
+                await stream.close()
+            return lines, filtered_lines
+
+    lines, filtered_lines = asyncio.run(run())
+    assert lines == [
+        "WAVE,1,100,6.325E-7",
+        "POW,1,,0.000012",
+        "FREQ,2,101,384349305128205.1282051282051",
+        "POW,2,,0.000007",
+    ]
+    assert filtered_lines == ["FREQ,2,103,384349305128205.1282051282051"]
+
+
+def test_stream_error(simulated_dll, caplog):
+    async def run():
+        async with Wavemeter(PRODUCT_ID, dll_path=None) as wavemeter:
+            writer = MemoryWriter(ConnectionResetError("Connection lost"))
+            stream = MeasurementStream(wavemeter, writer)  # type: ignore
+            protocol = compile_commands(create_subscription_protocol(stream))
+            topic = str(PRODUCT_ID)
+            try:
+                await request(protocol, "SUBS:WAVE", "(@1)")
+                await asyncio.sleep(0)
+                event_bus.publish(topic, Wavelength1(PRODUCT_ID, 100, 632.5))
+                # The stream stops without anybody awaiting it
+                await wait_for(lambda: not event_bus.get_subscriptions(topic))
+                await asyncio.sleep(0)
+
+                # Subscribing again restarts the stream
+                writer.error = None
+                await request(protocol, "SUBS:FREQ", "(@1)")
+                await asyncio.sleep(0)
+                assert len(event_bus.get_subscriptions(topic)) == 1
+            finally:
+                await stream.close()
+
+    with caplog.at_level(logging.ERROR, logger="scpi_protocol"):
+        asyncio.run(run())
+    assert [record.getMessage() for record in caplog.records] == ["Error while streaming measurements."]
+    assert isinstance(caplog.records[0].exc_info[1], ConnectionResetError)
@@ -0,0 +1,147 @@
+import asyncio
+import math
+import socket
+
+import pytest
+
+from wmControl.metrics import Histogram, Metric, MetricsRegistry, serve_metrics
+
+
+def test_counter_and_gauge():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("command",))
+    gauge = registry.gauge("queue_size", "Queue size.")
+    counter.inc(labels=("*IDN?",))
+    counter.inc(2, labels=("*IDN?",))
+    counter.inc(labels=('say "hi"\n',))
+    gauge.set(5)
+    gauge.dec()
+
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{command="*IDN?"} 3.0\n'
+        'requests_total{command="say \\"hi\\"\\n"} 1.0\n'
+        "# HELP queue_size Queue size.\n"
+        "# TYPE queue_size gauge\n"
+        "queue_size 4.0\n"
+    )
+
+
+def test_gauge_function():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("subscribers", "Subscribers.", ("product_id",))
+    subscribers = [1, 2]
+    gauge.set_function(lambda: len(subscribers), ("4711",))
+    subscribers.append(3)
+
+    assert 'subscribers{product_id="4711"} 3.0' in registry.render()
+
+
+def test_histogram():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("priority",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, ("control",))
+
+    assert histogram.get_counts(("control",)) == ([2, 1, 1], 2.65)
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'latency_seconds_bucket{priority="control",le="0.1"} 2.0',
+        'latency_seconds_bucket{priority="control",le="1.0"} 3.0',
+        'latency_seconds_bucket{priority="control",le="+Inf"} 4.0',
+        'latency_seconds_sum{priority="control"} 2.65',
+        'latency_seconds_count{priority="control"} 4.0',
+    ]
+
+
+def test_invalid_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("command",))
+    with pytest.raises(ValueError):
+        counter.inc(labels=())
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Requests.")
+
+
+def test_metric_is_abstract():
+    with pytest.raises(TypeError):
+        Metric("requests_total", "Requests.")  # type: ignore[abstract]  # pylint: disable=abstract-class-instantiated
+
+
+def test_disabled_registry():
+    registry = MetricsRegistry(enabled=False)
+    counter = registry.counter("requests_total", "Requests.")
+    gauge = registry.gauge("queue_size", "Queue size.")
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1,))
+    counter.inc()
+    gauge.set(5)
+    gauge.inc()
+    histogram.observe(0.05)
+
+    # The updates are ignored, until the registry is enabled
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        "# HELP queue_size Queue size.\n"
+        "# TYPE queue_size gauge\n"
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+    )
+    assert histogram.get_counts() == ([0, 0], 0.0)
+    registry.enabled = True
+    counter.inc()
+    histogram.observe(0.05)
+    assert "requests_total 1.0" in registry.render()
+    assert histogram.get_counts() == ([1, 0], 0.05)
+
+
+def test_standalone_histogram_enabled():
+    histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1,))
+    histogram.observe(0.05)
+
+    assert histogram.get_counts() == ([1, 0], 0.05)
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _request_metrics(registry: MetricsRegistry, paths: list[str]) -> list[bytes]:
+    port = _get_free_port()
+    server = asyncio.create_task(serve_metrics("127.0.0.1", port, registry))
+    await asyncio.sleep(0.1)
+    try:
+        replies = []
+        for path in paths:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            replies.append(await reader.read())
+            writer.close()
+    finally:
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+    return replies
+
+
+def test_serve_metrics():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.").inc()
+    metrics, not_found = asyncio.run(_request_metrics(registry, ["/metrics", "/"]))
+
+    assert metrics.startswith(b"HTTP/1.0 200 OK\r\n")
+    assert metrics.endswith(b"\r\n\r\n" + registry.render().encode())
+    assert not_found.startswith(b"HTTP/1.0 404 Not Found\r\n")
+
+
+def test_histogram_quantile():
+    histogram = MetricsRegistry().histogram("latency_seconds", "Latency.", buckets=(1.0, 2.0, 3.0))
+    assert math.isnan(histogram.quantile(0.5))
+    for value in (0.5, 1.5, 1.5, 2.5, 10.0):
+        histogram.observe(value)
+
+    assert [histogram.quantile(quantile) for quantile in (0.0, 0.2, 0.5, 0.8, 1.0)] == [1.0, 1.0, 2.0, 3.0, math.inf]
+    histogram.clear()
+    assert histogram.get_labels() == []
@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+
+import scpi_protocol
+from wmControl import wlmConst, wlmData
+from wmControl.wlmConst import LowSignalError, Power1, Wavelength1
+
+
+@pytest.fixture
+def float_numbers():
+    """Switch to NUMBER_FORMAT=float. The number type is global, so it must be restored for the other tests."""
+    previous_type = wlmConst.number_type
+    wlmConst.set_number_type(float)
+    try:
+        yield
+    finally:
+        wlmConst.set_number_type(previous_type)
+
+
+def test_float_packages(float_numbers):
+    wavelength = Wavelength1(4711, 100, 632.9912345)
+    power = Power1(4711, 12)
+
+    assert type(wavelength.value) is float
+    assert wavelength.value == 632.9912345
+    assert type(power.value) is float
+
+
+@pytest.mark.parametrize("wavelength", [632.9912345, 780.24123456789, 1550.0])
+def test_float_conversion(float_numbers, wavelength: float):
+    assert type(wlmData.convert_wavelength(wavelength, 0)) is float
+    assert wlmData.convert_wavelength(wavelength, 0) == wavelength / 1e9
+    assert type(wlmData.convert_wavelength_to_frequency(wavelength, 0)) is float
+    assert wlmData.convert_wavelength_to_frequency(wavelength, 0) == wlmData.SPEED_OF_LIGHT_HZ_NM / wavelength
+    assert type(wlmData.convert_power(wavelength)) is float
+    assert wlmData.convert_power(wavelength) == wavelength / 1e6
+    with pytest.raises(LowSignalError):
+        wlmData.convert_wavelength(float(wlmConst.ErrLowSignal), 0)
+
+
+def test_float_encoding(float_numbers):
+    values = [
+        wlmData.convert_wavelength(632.9912345, 0),
+        wlmData.convert_wavelength_to_frequency(632.9912345, 0),
+        wlmData.convert_power(1 / 3),
+    ]
+    encoded = scpi_protocol._encode_number(values)  # pylint: disable=protected-access
+
+    # The shortest representation, that parses back to the same double
+    assert encoded == ",".join(repr(value) for value in values)
+    assert [float(value) for value in encoded.split(",")] == values
+
+
+def test_number_type_restored():
+    assert wlmConst.number_type is Decimal
+    assert type(Wavelength1(4711, 100, 632.5).value) is Decimal
@@ -0,0 +1,68 @@
+import asyncio
+import struct
+from array import array
+
+from scpi_protocol import ResponseFormat, compile_commands, create_scpi_protocol
+from wmControl.pattern_store import PatternFrame, PatternStore
+from wmControl.simulated_dll import PATTERN_ITEM_COUNT, SimulatedDll
+from wmControl.wavemeter import Wavemeter, callback
+from wmControl.wlmConst import MeasureMode
+
+PRODUCT_ID = 4711
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def write_patterns(dll: SimulatedDll, values: list[int]) -> tuple[list[PatternFrame], PatternStore, bytes]:
+    """Signal a new pattern of channel 1 for each value and return the frames published and the FETCh:PATTern reply."""
+    async with Wavemeter(PRODUCT_ID, dll_path=None) as wavemeter:
+        store = PatternStore(wavemeter)
+        received: list[PatternFrame] = []
+
+        async def consume():
+            async for frame in store.read_frames(maxsize=0):
+                received.append(frame)
+
+        tasks = [asyncio.create_task(store.run()), asyncio.create_task(consume())]
+        try:
+            simulated_wavemeter = dll.get_wavemeter(PRODUCT_ID)
+            await wait_for(lambda: simulated_wavemeter.patterns_enabled)
+            for count, value in enumerate(values, start=1):
+                simulated_wavemeter.patterns[0] = array("h", [value] * PATTERN_ITEM_COUNT).tobytes()
+                # Signal the pattern like the DLL does
+                callback(PRODUCT_ID, MeasureMode.cmiPatternAnalysisWritten, 1, 0, 0)
+                await wait_for(lambda: len(received) >= count)
+
+            fetch_pattern = compile_commands(create_scpi_protocol(wavemeter, pattern_store=store))["FETC:PATT"]
+            reply = ResponseFormat().encode(fetch_pattern, await fetch_pattern["get"](fetch_pattern["decode"]("(@1)")))
+            return received, store, reply
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_published_frames_are_copies(simulated_dll):
+    received, store, _ = asyncio.run(write_patterns(simulated_dll, [1, 2, 3, 4]))
+
+    # The buffers of the first frames are reused by the store, but the published frames keep their content
+    assert [set(frame.data) for frame in received] == [{1}, {2}, {3}, {4}]
+    assert [frame.channel for frame in received] == [0] * 4
+    assert received[0].data.readonly
+    # The store is cleared, when it stops
+    assert store.get(0) is None
+
+
+def test_fetch_pattern(simulated_dll):
+    _, _, reply = asyncio.run(write_patterns(simulated_dll, [7]))
+
+    size = str(PATTERN_ITEM_COUNT * 2).encode()
+    header = b"#" + str(len(size)).encode() + size
+    # The default byte order is big-endian
+    assert reply == header + struct.pack(f">{PATTERN_ITEM_COUNT}h", *[7] * PATTERN_ITEM_COUNT) + b"\n"
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import math
+import random
+from array import array
+
+import pytest
+
+import wmControl.recorder
+from async_event_bus import event_bus
+from wmControl.recorder import (
+    SEGMENT_HEADER,
+    Recorder,
+    decode_segment,
+    encode_segment,
+    read_recording,
+)
+from wmControl.wavemeter import Wavemeter
+from wmControl.wlmConst import Power1, Temperature, Wavelength1
+
+PRODUCT_ID = 4711
+
+
+def create_columns(count: int) -> tuple[array, array, array, array, array]:
+    rng = random.Random(42)
+    timestamps = array("q", (1_700_000_000_000 + 10 * index + rng.randint(0, 3) for index in range(count)))
+    device_timestamps = array("q", (12_345 + 10 * index if index % 3 else -1 for index in range(count)))
+    modes = array("H", (rng.choice((42, 43, 66)) for _ in range(count)))
+    channels = array("b", (-1 if mode == 66 else mode - 42 for mode in modes))
+    values = array("d", (632.99 + rng.gauss(0, 1e-6) for _ in range(count)))
+    return timestamps, device_timestamps, modes, channels, values
+
+
+@pytest.mark.parametrize("count", [0, 1, 1000])
+def test_segment_codec(count: int):
+    columns = create_columns(count)
+    segment = encode_segment(*columns)
+
+    assert decode_segment(segment) == columns
+
+
+def test_segment_codec_special_values():
+    values = array("d", (math.inf, -0.0, -3.0, 1e-300, math.nan))
+    columns = array("q", range(5)), array("q", range(5)), array("H", (42,) * 5), array("b", (0,) * 5), values
+    decoded_values = decode_segment(encode_segment(*columns))[4]
+
+    assert decoded_values[:4] == values[:4]
+    assert math.copysign(1, decoded_values[1]) == -1
+    assert math.isnan(decoded_values[4])
+
+
+def test_segment_compression():
+    columns = create_columns(4096)
+    uncompressed_size = sum(column.itemsize * len(column) for column in columns)
+
+    assert len(encode_segment(*columns)) < uncompressed_size * 0.6
+
+
+def test_read_recording(tmp_path):
+    segments = [create_columns(100), create_columns(10)]
+    data = b"".join(encode_segment(*columns) for columns in segments)
+    path = tmp_path / "recording.wmr"
+    # The last segment is truncated
+    path.write_bytes(data + encode_segment(*create_columns(50))[: SEGMENT_HEADER.size + 10])
+
+    assert list(read_recording(path)) == segments
+
+
+async def record(directory, packages: list) -> None:
+    """Record the packages published on the event bus with a segment for every two packages."""
+    async with Wavemeter(PRODUCT_ID, dll_path=None) as wavemeter:
+        recorder = Recorder(wavemeter, directory, segment_size=2)
+        task = asyncio.create_task(recorder.run())
+        await asyncio.sleep(0)
+        for package in packages:
+            event_bus.publish(str(PRODUCT_ID), package)
+        while any(subscription.qsize for subscription in event_bus.get_subscriptions(str(PRODUCT_ID))):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def read_samples(directory) -> list[tuple]:
+    samples = []
+    for path in sorted(directory.iterdir()):
+        for _, *columns in read_recording(path):
+            samples.extend(zip(*columns))
+    return samples
+
+
+def test_recorder(simulated_dll, tmp_path):
+    packages = [Wavelength1(PRODUCT_ID, 1000, 632.5), Power1(PRODUCT_ID, 12), Temperature(PRODUCT_ID, 1001, 25.0)]
+    asyncio.run(record(tmp_path, packages))
+
+    # Power packages have no timestamp
+    assert read_samples(tmp_path) == [
+        (1000, Wavelength1.mode, 0, 632.5),
+        (-1, Power1.mode, 0, 12.0),
+        (1001, Temperature.mode, -1, 25.0),
+    ]
+
+
+def test_recorder_write_error(simulated_dll, tmp_path, monkeypatch, caplog):
+    encode = wmControl.recorder.encode_segment
+    calls = []
+
+    def fail_once(*columns):
+        calls.append(columns)
+        if len(calls) == 1:
+            raise RuntimeError("Encoding failed")
+        return encode(*columns)
+
+    monkeypatch.setattr(wmControl.recorder, "encode_segment", fail_once)
+    packages = [Wavelength1(PRODUCT_ID, timestamp, 632.5) for timestamp in range(4)]
+    with caplog.at_level(logging.ERROR, logger="wmControl.recorder"):
+        asyncio.run(asyncio.wait_for(record(tmp_path, packages), 5))
+
+    # Only the first segment is lost, the writer thread carries on
+    assert [sample[0] for sample in read_samples(tmp_path)] == [2, 3]
+    assert len(caplog.records) == 1
+    assert isinstance(caplog.records[0].exc_info[1], RuntimeError)
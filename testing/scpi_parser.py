@@ -1,3 +1,4 @@
+import struct
 from contextlib import nullcontext as does_not_raise
 
 import pytest
@@ -8,13 +9,13 @@ import scpi_protocol
 @pytest.mark.parametrize(
     "scpi_channel_list, expectation, result",
     [
-        ("(@1)", does_not_raise(), [0]),
-        ("(@1,2)", does_not_raise(), [0, 1]),
-        ("(@2,1)", does_not_raise(), [1, 0]),
-        ("(@1,2,4:6)", does_not_raise(), [0, 1, 3, 4, 5]),
-        ("(@1,2,6:4)", does_not_raise(), [0, 1, 5, 4, 3]),
-        ("(@1,2,4:6,9)", does_not_raise(), [0, 1, 3, 4, 5, 8]),
-        ("(@1,2,4:6,9:13)", does_not_raise(), [0, 1, 3, 4, 5, 8, 9, 10, 11, 12]),
+        ("(@1)", does_not_raise(), (0,)),
+        ("(@1,2)", does_not_raise(), (0, 1)),
+        ("(@2,1)", does_not_raise(), (1, 0)),
+        ("(@1,2,4:6)", does_not_raise(), (0, 1, 3, 4, 5)),
+        ("(@1,2,6:4)", does_not_raise(), (0, 1, 5, 4, 3)),
+        ("(@1,2,4:6,9)", does_not_raise(), (0, 1, 3, 4, 5, 8)),
+        ("(@1,2,4:6,9:13)", does_not_raise(), (0, 1, 3, 4, 5, 8, 9, 10, 11, 12)),
         ("1", pytest.raises(scpi_protocol.CommandHeaderError), None),
         ("1,2", pytest.raises(scpi_protocol.CommandHeaderError), None),
         ("(@1", pytest.raises(scpi_protocol.CommandHeaderError), None),
@@ -22,8 +23,96 @@ import scpi_protocol
         ("(@a)", pytest.raises(scpi_protocol.CommandHeaderError), None),
         ("(@1;2)", pytest.raises(scpi_protocol.CommandHeaderError), None),
         ("(@1:)", pytest.raises(scpi_protocol.CommandHeaderError), None),
+        ("(@1:100000000)", pytest.raises(scpi_protocol.TooMuchDataException), None),
+        ("(@1:1000,1:1000)", pytest.raises(scpi_protocol.TooMuchDataException), None),
     ],
 )
-def test_channel_list_parser(scpi_channel_list: str, expectation, result: list[int]):
+def test_channel_list_parser(scpi_channel_list: str, expectation, result: tuple[int, ...]):
     with expectation:
         assert scpi_protocol._parse_channel_list(scpi_channel_list) == result
+
+
+@pytest.mark.parametrize(
+    "cmd_expr, spellings",
+    [
+        ("*IDN", {"*IDN"}),
+        ("MEASure:WAVElength", {"MEAS:WAVE", "MEAS:WAVELENGTH", "MEASURE:WAVE", "MEASURE:WAVELENGTH"}),
+        (
+            "CALibration:WAVElength[:POSTcal]",
+            {
+                *(f"{cal}:{wave}" for cal in ("CAL", "CALIBRATION") for wave in ("WAVE", "WAVELENGTH")),
+                *(
+                    f"{cal}:{wave}:{post}"
+                    for cal in ("CAL", "CALIBRATION")
+                    for wave in ("WAVE", "WAVELENGTH")
+                    for post in ("POST", "POSTCAL")
+                ),
+            },
+        ),
+    ],
+)
+def test_compile_commands(cmd_expr: str, spellings: set[str]):
+    protocol = scpi_protocol.Commands({cmd_expr: scpi_protocol.Cmd(get=None), "*CLS": "Clear Status Command"})
+    dispatch_table = scpi_protocol.compile_commands(protocol)
+
+    assert set(dispatch_table) == spellings | {":" + spelling for spelling in spellings}
+    # The spellings must match the commands of the scpi library
+    for spelling in dispatch_table:
+        assert protocol.get_command_expression(spelling) == cmd_expr
+
+
+def test_parse_request():
+    assert scpi_protocol.parse_request(b"meas:wave? (@1);:SUBS:wave (@2)\n") == (
+        scpi_protocol.Request("MEAS:WAVE", "(@1)", True),
+        scpi_protocol.Request(":SUBS:WAVE", "(@2)", False),
+    )
+
+
+@pytest.mark.parametrize(
+    "values, byte_order, result",
+    [
+        (1.5, scpi_protocol.ByteOrder.NORMAL, b"#18" + struct.pack(">d", 1.5)),
+        ([1.5, float("nan")], scpi_protocol.ByteOrder.SWAPPED, b"#216" + struct.pack("<2d", 1.5, 9.91e37)),
+        ([], scpi_protocol.ByteOrder.NORMAL, b"#10"),
+    ],
+)
+def test_encode_real64(values, byte_order, result: bytes):
+    assert scpi_protocol._encode_real64(values, byte_order) == result
+
+
+@pytest.mark.parametrize(
+    "data_format, expectation, result",
+    [
+        ("ASCii", does_not_raise(), scpi_protocol.DataFormat.ASCII),
+        ("real, 64", does_not_raise(), scpi_protocol.DataFormat.REAL64),
+        ("REAL", does_not_raise(), scpi_protocol.DataFormat.REAL64),
+        ("REAL,32", pytest.raises(scpi_protocol.IllegalParameterValueException), None),
+    ],
+)
+def test_parse_data_format(data_format: str, expectation, result):
+    with expectation:
+        assert scpi_protocol._parse_data_format(data_format) == result
+
+
+@pytest.mark.parametrize(
+    "arguments, expectation, result",
+    [
+        ("(@1)", does_not_raise(), (0, 0)),
+        ("(@2),1", does_not_raise(), (1, 1)),
+        ("(@2), 5", does_not_raise(), (1, 5)),
+        ("(@1,2)", pytest.raises(scpi_protocol.IllegalParameterValueException), None),
+        ("(@1),6", pytest.raises(scpi_protocol.IllegalParameterValueException), None),
+        ("(@1),a", pytest.raises(scpi_protocol.InvalidSyntaxException), None),
+    ],
+)
+def test_parse_pattern_arguments(arguments: str, expectation, result: tuple[int, int]):
+    with expectation:
+        assert scpi_protocol._parse_pattern_arguments(arguments) == result
+
+
+@pytest.mark.parametrize(
+    "byte_order, fmt", [(scpi_protocol.ByteOrder.NORMAL, ">3h"), (scpi_protocol.ByteOrder.SWAPPED, "<3h")]
+)
+def test_encode_pattern(byte_order, fmt: str):
+    pattern = memoryview(bytearray(struct.pack("=3h", 1, -2, 300))).cast("h")
+    assert scpi_protocol._encode_pattern(pattern, byte_order) == b"#16" + struct.pack(fmt, 1, -2, 300)
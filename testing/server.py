@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from scpi import Cmd
+
+from server import read_stream, write_stream
+
+
+class MemoryWriter:
+    """Collects the replies like an asyncio.StreamWriter."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+
+def create_protocol(log: list[tuple[str, float]]) -> dict[str, Cmd]:
+    """A query sleeping for the given time and a set command, both logging when they run."""
+
+    async def delay(seconds: float) -> float:
+        log.append(("start", seconds))
+        await asyncio.sleep(seconds)
+        log.append(("end", seconds))
+        return seconds
+
+    async def set_value(value: float) -> None:
+        log.append(("set", value))
+
+    return {"DEL": Cmd(get=delay, decode=float, encode=str), "VAL": Cmd(set=set_value, decode=float)}
+
+
+async def serve(
+    requests: list[bytes], reply_count: int, pipeline_depth: int = 8, device_timeout: float = 5.0
+) -> tuple[list[tuple[str, float]], list[str]]:
+    """Send the requests through the pipeline and return the log of the protocol and the first replies."""
+    log: list[tuple[str, float]] = []
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"".join(requests))
+    reader.feed_eof()
+    writer = MemoryWriter()
+    job_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=pipeline_depth)
+    tasks = [
+        asyncio.create_task(read_stream(reader, job_queue)),
+        asyncio.create_task(
+            write_stream(writer, create_protocol(log), job_queue, device_timeout, pipeline_depth)  # type: ignore
+        ),
+    ]
+    try:
+        while writer.data.count(b"\n") < reply_count:
+            await asyncio.sleep(0.001)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return log, writer.data.decode().splitlines()
+
+
+def test_replies_in_request_order():
+    log, replies = asyncio.run(asyncio.wait_for(serve([b"DEL? 0.05\n", b"DEL? 0.02\n", b"DEL? 0\n"], reply_count=3), 5))
+
+    # The queries run concurrently, so the shortest completes first
+    assert [entry for entry in log if entry[0] == "end"] == [("end", 0.0), ("end", 0.02), ("end", 0.05)]
+    assert replies == ["0.05", "0.02", "0.0"]
+
+
+def test_set_command_is_a_barrier():
+    log, replies = asyncio.run(asyncio.wait_for(serve([b"DEL? 0.02\n", b"VAL 1\n", b"DEL? 0\n"], reply_count=2), 5))
+
+    assert log == [("start", 0.02), ("end", 0.02), ("set", 1.0), ("start", 0.0), ("end", 0.0)]
+    assert replies == ["0.02", "0.0"]
+
+
+def test_pipeline_depth_one():
+    log, replies = asyncio.run(
+        asyncio.wait_for(serve([b"DEL? 0.02\n", b"DEL? 0.01\n", b"DEL? 0\n"], reply_count=3, pipeline_depth=1), 5)
+    )
+
+    assert log == [
+        ("start", 0.02),
+        ("end", 0.02),
+        ("start", 0.01),
+        ("end", 0.01),
+        ("start", 0.0),
+        ("end", 0.0),
+    ]
+    assert replies == ["0.02", "0.01", "0.0"]
+
+
+@pytest.mark.parametrize("pipeline_depth", [1, 8])
+def test_device_timeout(pipeline_depth: int):
+    log, replies = asyncio.run(
+        asyncio.wait_for(
+            serve([b"DEL? 1\n", b"DEL? 0\n"], reply_count=1, pipeline_depth=pipeline_depth, device_timeout=0.02),
+            5,
+        )
+    )
+
+    # The request timing out is dropped without a reply
+    assert ("end", 1.0) not in log
+    assert replies == ["0.0"]
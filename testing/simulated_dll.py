@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from wmControl import wlmConst, wlmData
+from wmControl.simulated_dll import PATTERN_ITEM_COUNT, SimulatedDll, SimulatedWavemeter
+from wmControl.wlmConst import LowSignalError, MeasureMode, WavemeterException
+
+
+def test_measurements():
+    dll = SimulatedDll(channels=2, event_rate=0, seed=1)
+    wlmData.set_active_wavemeter(dll, 4711)
+
+    assert wlmData.get_wavemeter_info(dll)[1] == 4711
+    assert wlmData.get_channel_count(dll) == 2
+    assert float(wlmData.get_wavelength(dll, 0)) == pytest.approx(780.24e-9, abs=1e-11)
+    assert float(wlmData.get_frequency(dll, 1)) == pytest.approx(299792458 / 790.24e-9, rel=1e-5)
+    with pytest.raises(WavemeterException):
+        wlmData.get_wavelength(dll, 2)
+
+
+def test_measure_several_channels():
+    dll = SimulatedDll(channels=2, event_rate=0, seed=1)
+    wlmData.set_active_wavemeter(dll, 4711)
+
+    # The missing channel returns its error without discarding the others
+    wavelengths = wlmData.get_wavelengths(dll, [1, 2, 0])
+    assert [float(wavelength) for wavelength in wavelengths[::2]] == pytest.approx([790.24e-9, 780.24e-9], abs=1e-11)
+    assert isinstance(wavelengths[1], WavemeterException)
+    frequencies = wlmData.get_frequencies(dll, [1, 2, 0])
+    assert [float(frequency) for frequency in frequencies[::2]] == pytest.approx(
+        [299792458 / 790.24e-9, 299792458 / 780.24e-9], rel=1e-5
+    )
+    assert isinstance(frequencies[1], WavemeterException)
+
+
+def test_deterministic():
+    first, second, other = (SimulatedWavemeter(4711, 2, 1e-6, seed) for seed in (1, 1, 2))
+    measurements = [first.measure(0, 0.1) for _ in range(100)]
+
+    assert measurements == [second.measure(0, 0.1) for _ in range(100)]
+    assert measurements != [other.measure(0, 0.1) for _ in range(100)]
+    assert any(measurement <= 0 for measurement in measurements)
+
+
+def test_error_injection():
+    dll = SimulatedDll(event_rate=0, error_rate=1)
+
+    with pytest.raises(LowSignalError):
+        wlmData.get_wavelength(dll, 0)
+
+
+def test_callback():
+    dll = SimulatedDll(channels=3, event_rate=1000)
+    dll.PresetWLMIndex(4711)
+    events = []
+    received = threading.Event()
+
+    def callback(product_id, mode, int_val, double_val, result):
+        events.append((product_id, mode, double_val))
+        if len(events) >= 30:
+            received.set()
+
+    wlmData.register_callback(dll, wlmConst.cNotifyInstallCallbackEx, callback)
+    try:
+        assert received.wait(5)
+    finally:
+        wlmData.register_callback(dll, wlmConst.cNotifyRemoveCallback, -1)
+
+    assert {event[0] for event in events} == {4711}
+    assert [event[1] for event in events[:3]] == [
+        MeasureMode.cmiWavelength1,
+        MeasureMode.cmiWavelength2,
+        MeasureMode.cmiWavelength3,
+    ]
+    assert all(event[2] > 0 for event in events)
+
+
+def test_pattern():
+    dll = SimulatedDll(event_rate=0)
+    dll.PresetWLMIndex(4711)
+    wlmData.set_pattern_export(dll, wlmConst.cSignal1Interferometers, True)
+
+    pattern = wlmData.get_pattern(dll, 0, wlmConst.cSignal1Interferometers)
+    assert len(pattern) == PATTERN_ITEM_COUNT
+    assert max(pattern) > 0 > min(pattern)
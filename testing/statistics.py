@@ -0,0 +1,39 @@
+import math
+import random
+import statistics
+
+import pytest
+
+from wmControl.statistics import WindowStatistics
+
+
+@pytest.mark.parametrize("window", [1, 2, 7, 50])
+def test_window_statistics(window: int):
+    rng = random.Random(42)
+    samples = [632.99 + rng.gauss(0, 1e-6) for _ in range(300)]
+    window_statistics = WindowStatistics(window)
+    for index, sample in enumerate(samples):
+        window_statistics.add(sample)
+        expected = samples[max(index + 1 - window, 0) : index + 1]
+
+        assert window_statistics.count == len(expected)
+        assert window_statistics.mean == pytest.approx(statistics.fmean(expected), abs=1e-12)
+        assert window_statistics.minimum == min(expected)
+        assert window_statistics.maximum == max(expected)
+        if len(expected) > 1:
+            assert window_statistics.standard_deviation == pytest.approx(
+                statistics.stdev(expected), rel=1e-3, abs=1e-12
+            )
+        else:
+            assert math.isnan(window_statistics.standard_deviation)
+
+
+def test_empty_statistics():
+    window_statistics = WindowStatistics(10)
+    window_statistics.add(1.0)
+    window_statistics.clear()
+
+    assert window_statistics.count == 0
+    assert math.isnan(window_statistics.mean)
+    assert math.isnan(window_statistics.minimum)
+    assert math.isnan(window_statistics.maximum)
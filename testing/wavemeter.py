@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from wmControl.wavemeter import Wavemeter
+from wmControl.wlmConst import WavemeterException
+
+PRODUCT_ID = 4711
+
+
+@pytest.mark.parametrize(
+    "method, expected",
+    [
+        ("get_wavelengths", [790.24e-9, 780.24e-9]),
+        ("get_frequencies", [299792458 / 790.24e-9, 299792458 / 780.24e-9]),
+    ],
+)
+def test_measure_several_channels(simulated_dll, method: str, expected: list[float]):
+    async def run():
+        async with Wavemeter(PRODUCT_ID, dll_path=None) as wavemeter:
+            return await getattr(wavemeter, method)([1, 2, 0])
+
+    results = asyncio.run(run())
+
+    # The missing channel returns its error without discarding the others
+    assert [float(result) for result in results[::2]] == pytest.approx(expected, rel=1e-5)
+    assert isinstance(results[1], WavemeterException)
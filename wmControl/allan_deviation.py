@@ -0,0 +1,244 @@
+"""
+Streaming overlapping Allan deviation of the wavelengths measured by a wavemeter.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from array import array
+from dataclasses import dataclass
+
+from async_event_bus import AsyncSubscription, OverflowPolicy, event_bus
+from wmControl.wavemeter import DEFAULT_EVENT_QUEUE_SIZE, Wavemeter
+from wmControl.wlmConst import Wavelength
+
+# The number of averaging times (tau = 1, 2, 4, ... samples)
+DEFAULT_OCTAVES = 10
+
+
+def get_allan_deviation_topic(product_id: int) -> str:
+    """Return the topic of the event bus the Allan deviations of a wavemeter are published on."""
+    return f"{product_id}/allan_deviation"
+
+
+@dataclass(frozen=True, slots=True)
+class AllanDeviationResult:
+    """
+    The overlapping Allan deviation of the fractional frequency of a channel.
+
+    Attributes
+    ----------
+    product_id : int
+        Product id (version) of the WM.
+    channel : int
+        Channel of the wavemeter. The channel is a 0 based index.
+    taus : tuple of float
+        The averaging times in s.
+    deviations : tuple of float
+        The Allan deviations for each averaging time.
+    """
+
+    product_id: int
+    channel: int
+    taus: tuple[float, ...]
+    deviations: tuple[float, ...]
+
+
+class AllanDeviation:
+    """
+    Calculates the overlapping Allan deviation for the averaging times tau = 2^k * tau0 incrementally. The samples are
+    converted to fractional deviations relative to the first sample and integrated (x_n = sum of y_i, i < n). The
+    integrated values of the last 2 * m_max + 1 samples are kept in a ring, which is shared by all averaging times. Each
+    new sample adds one term (x_n - 2 x_(n-m) + x_(n-2m))^2 per averaging time, so an update costs O(octaves) and the
+    memory is constant. The samples are expected to be equally spaced; tau0 is estimated from their arrival times.
+
+    Parameters
+    ----------
+    octaves: int
+        The number of averaging times.
+    """
+
+    @property
+    def count(self) -> int:
+        """The number of samples added."""
+        return max(self.__count - 1, 0)
+
+    @property
+    def factors(self) -> tuple[int, ...]:
+        """The averaging factors m, the averaging times are m * tau0."""
+        return self.__factors
+
+    @property
+    def sample_interval(self) -> float:
+        """The mean time between two samples (tau0) in s. NaN, if there are less than two samples."""
+        if self.count < 2:
+            return math.nan
+        return (self.__last_time - self.__first_time) / (self.count - 1)
+
+    def __init__(self, octaves: int = DEFAULT_OCTAVES) -> None:
+        if octaves < 1:
+            raise ValueError("At least 1 octave is required.")
+        self.__factors = tuple(2**octave for octave in range(octaves))
+        self.__ring_size = 2 * self.__factors[-1] + 1
+        self.__integrated = array("d", bytes(8 * self.__ring_size))
+        self.__squares = [0.0] * octaves
+        self.__terms = [0] * octaves
+        self.__count = 0  # The number of integrated values, one more than the number of samples
+        self.__reference = 0.0
+        self.__first_time = 0.0
+        self.__last_time = 0.0
+
+    def add(self, value: float, timestamp: float) -> None:
+        """
+        Add a sample.
+
+        Parameters
+        ----------
+        value: float
+            The sample, e.g. a wavelength or frequency.
+        timestamp: float
+            The time of the sample in s.
+        """
+        ring = self.__integrated
+        size = self.__ring_size
+        if not self.__count:
+            self.__reference = value
+            self.__first_time = timestamp
+            ring[0] = 0.0
+            self.__count = 1
+
+        index = self.__count
+        integrated = ring[(index - 1) % size] + (value - self.__reference) / self.__reference
+        ring[index % size] = integrated
+        self.__count = index + 1
+        self.__last_time = timestamp
+
+        squares = self.__squares
+        terms = self.__terms
+        for octave, factor in enumerate(self.__factors):
+            if index < 2 * factor:
+                break
+            difference = integrated - 2 * ring[(index - factor) % size] + ring[(index - 2 * factor) % size]
+            squares[octave] += difference * difference
+            terms[octave] += 1
+
+    def get(self) -> tuple[tuple[float, ...], tuple[float, ...]]:
+        """
+        Return the Allan deviations of the averaging times with enough samples.
+
+        Returns
+        -------
+        tuple of tuple of float and tuple of float
+            The averaging times in s and the Allan deviations.
+        """
+        sample_interval = self.sample_interval
+        taus: list[float] = []
+        deviations: list[float] = []
+        for factor, squares, terms in zip(self.__factors, self.__squares, self.__terms):
+            if not terms:
+                break
+            taus.append(factor * sample_interval)
+            deviations.append(math.sqrt(squares / (2 * factor * factor * terms)))
+        return tuple(taus), tuple(deviations)
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self.__squares = [0.0] * len(self.__factors)
+        self.__terms = [0] * len(self.__factors)
+        self.__count = 0
+
+
+class MeasurementAllanDeviation:
+    """
+    Keeps the Allan deviation of the wavelengths measured per channel of a wavemeter. Invalid measurements are ignored.
+    The results are published on the topic returned by `get_allan_deviation_topic()` each time the number of samples of
+    a channel reaches a multiple of the largest averaging factor. If the measurements arrive faster than they are
+    processed, the oldest are dropped. This breaks the assumption of equally spaced samples, so it is logged.
+
+    Parameters
+    ----------
+    wavemeter: Wavemeter
+        The wavemeter to read the measurements from.
+    octaves: int
+        The number of averaging times (tau = 1, 2, 4, ... samples).
+    """
+
+    @property
+    def octaves(self) -> int:
+        return self.__octaves
+
+    def __init__(self, wavemeter: Wavemeter, octaves: int = DEFAULT_OCTAVES) -> None:
+        if octaves < 1:
+            raise ValueError("At least 1 octave is required.")
+        self.__wavemeter = wavemeter
+        self.__octaves = octaves
+        self.__publish_interval = 2 ** (octaves - 1)
+        self.__channels: dict[int, AllanDeviation] = {}
+        self.__logger = logging.getLogger(__name__)
+
+    def get(self, channel: int) -> AllanDeviation | None:
+        """
+        Return the Allan deviation of a channel.
+
+        Parameters
+        ----------
+        channel: int
+            The zero-based channel number.
+
+        Returns
+        -------
+        AllanDeviation or None
+            The Allan deviation or None if no valid measurement was received yet.
+        """
+        return self.__channels.get(channel)
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self.__channels.clear()
+
+    def update(self, package: Wavelength, timestamp: float) -> None:
+        """
+        Add a wavelength measurement.
+
+        Parameters
+        ----------
+        package: Wavelength
+            The measurement received from the wavemeter.
+        timestamp: float
+            The time of arrival in s.
+        """
+        if not package.value > 0:
+            # Errors are encoded as non-positive values
+            return
+        try:
+            allan_deviation = self.__channels[package.channel]
+        except KeyError:
+            allan_deviation = self.__channels[package.channel] = AllanDeviation(self.__octaves)
+        allan_deviation.add(float(package.value), timestamp)
+        if allan_deviation.count % self.__publish_interval == 0:
+            topic = get_allan_deviation_topic(package.product_id)
+            if event_bus.get_subscriptions(topic):
+                event_bus.publish(
+                    topic, AllanDeviationResult(package.product_id, package.channel, *allan_deviation.get())
+                )
+
+    async def run(self) -> None:
+        """
+        Read the measurements of the wavemeter and update the Allan deviations. Run this as a task.
+        """
+        subscription = AsyncSubscription(DEFAULT_EVENT_QUEUE_SIZE, OverflowPolicy.DROP_OLDEST, event_types=Wavelength)
+        dropped = 0
+        try:
+            async for package in event_bus.listen(str(self.__wavemeter.product_id), subscription):
+                if subscription.dropped != dropped:
+                    self.__logger.warning(
+                        "The Allan deviation of wavemeter %i fell behind and dropped %i measurements. The samples are "
+                        "no longer equally spaced.",
+                        self.__wavemeter.product_id,
+                        subscription.dropped - dropped,
+                    )
+                    dropped = subscription.dropped
+                self.update(package, time.monotonic())
+        finally:
+            self.__channels.clear()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Type
+from typing import Iterable, Type
 
 from wmControl.wlmConst import *
 
@@ -20,6 +20,12 @@ class DataTypeFactory:
         """
         self.__registered_data_types[package.mode] = package
 
+    def get_data_types(self, modes: Iterable[MeasureMode | int]) -> tuple[Type[DataPackage], ...]:
+        """
+        Return the data package types registered for the modes given. Unknown modes are ignored.
+        """
+        return tuple(self.__registered_data_types[mode] for mode in set(modes) if mode in self.__registered_data_types)
+
     def get(self, mode: MeasureMode | int, *args, **kwargs) -> DataPackage:
         """
         Create a new instance of the data class from the mode integer and the parameters passed
@@ -158,6 +164,7 @@ data_factory.register(Power5)
 data_factory.register(Power6)
 data_factory.register(Power7)
 data_factory.register(Power8)
+data_factory.register(PatternWritten)
 data_factory.register(WavemeterServerShutdown)
 data_factory.register(WavemeterServerStart)
 data_factory.register(WavemeterServerInitialized)
@@ -0,0 +1,170 @@
+"""
+Opt-in profiling of the DLL calls. When enabled, the DLL worker records the time each call waited for the DLL and the
+time spent in the DLL per wlmData function. The waiting time of a wavemeter call is measured from the request of the
+scheduler lock, see `wavemeter._lock_wavemeter`, so it includes the time other calls held the DLL. The latencies are
+kept in log-linear histograms like an HDR histogram, so the quantiles have a bounded relative error over the whole range
+from microseconds to minutes.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from wmControl.metrics import Histogram
+
+# 8 buckets per power of two from 1 µs to 2^27 µs (134 s). The relative error of the quantiles is below 9 %.
+PROFILE_BUCKETS = tuple(1e-6 * 2 ** (index / 8) for index in range(8 * 27 + 1))
+# The quantiles reported per function
+PROFILE_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+@dataclass(frozen=True, slots=True)
+class LatencySummary:
+    """The mean and the quantiles (see `PROFILE_QUANTILES`) of a latency in s."""
+
+    mean: float
+    quantiles: tuple[float, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class FunctionProfile:
+    function: str
+    count: int
+    queue_time: LatencySummary
+    call_time: LatencySummary
+
+
+def get_function_name(func: Callable) -> str:
+    """Return the name the calls of a function are recorded under."""
+    return getattr(func, "__qualname__", type(func).__name__)
+
+
+def _to_json(value: float) -> float | None:
+    # JSON has no infinity
+    return value if math.isfinite(value) else None
+
+
+class DllProfiler:
+    """
+    Records the latencies of the DLL calls per function. Recording is thread-safe and disabled by default.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        """Record the DLL calls. Disabled by default."""
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self.__enabled = value
+
+    def __init__(self) -> None:
+        self.__enabled = False
+        # The histograms are not exported by the metrics endpoint, because of the large number of buckets
+        self.__queue_time = Histogram(
+            "wavemeter_dll_function_queue_seconds",
+            "Time DLL calls wait for the scheduler lock and the DLL worker in s.",
+            ("function",),
+            PROFILE_BUCKETS,
+        )
+        self.__call_time = Histogram(
+            "wavemeter_dll_function_call_seconds", "Time spent in DLL calls in s.", ("function",), PROFILE_BUCKETS
+        )
+
+    def record(self, func: Callable, queue_time: float, call_time: float) -> None:
+        """
+        Record a DLL call.
+
+        Parameters
+        ----------
+        func: Callable
+            The wlmData function called.
+        queue_time: float
+            The time in s the call waited for the scheduler lock and the DLL worker.
+        call_time: float
+            The time in s spent in the call.
+        """
+        labels = (get_function_name(func),)
+        self.__queue_time.observe(queue_time, labels)
+        self.__call_time.observe(call_time, labels)
+
+    def get_functions(self) -> list[str]:
+        """Return the names of the functions called, while the profiler was enabled."""
+        return sorted(labels[0] for labels in self.__call_time.get_labels())
+
+    @staticmethod
+    def __summarize(histogram: Histogram, labels: tuple[str]) -> tuple[int, LatencySummary]:
+        counts, total = histogram.get_counts(labels)
+        count = sum(counts)
+        return count, LatencySummary(
+            mean=total / count if count else math.nan,
+            quantiles=tuple(histogram.quantile(quantile, labels) for quantile in PROFILE_QUANTILES),
+        )
+
+    def get(self, function: str) -> FunctionProfile | None:
+        """
+        Return the profile of a function or None, if it was not called, while the profiler was enabled.
+
+        Parameters
+        ----------
+        function: str
+            The name of the function, see `get_functions()`.
+        """
+        labels = (function,)
+        count, call_time = self.__summarize(self.__call_time, labels)
+        if not count:
+            return None
+        _, queue_time = self.__summarize(self.__queue_time, labels)
+        return FunctionProfile(function=function, count=count, queue_time=queue_time, call_time=call_time)
+
+    def clear(self) -> None:
+        """Remove all recorded calls."""
+        self.__queue_time.clear()
+        self.__call_time.clear()
+
+    @staticmethod
+    def __export(histogram: Histogram, labels: tuple[str]) -> dict[str, Any]:
+        counts, total = histogram.get_counts(labels)
+        return {
+            "count": sum(counts),
+            "sum": total,
+            "quantiles": {
+                str(quantile): _to_json(histogram.quantile(quantile, labels)) for quantile in PROFILE_QUANTILES
+            },
+            # The upper bounds of the buckets in s and their counts. The last bucket is unbounded (null).
+            "buckets": [
+                [_to_json(upper_bound), count]
+                for upper_bound, count in zip(histogram.buckets + (math.inf,), counts)
+                if count
+            ],
+        }
+
+    def dump(self, path: str | os.PathLike) -> None:
+        """
+        Write the profiles of all functions including the non-empty buckets of the histograms to a JSON file.
+
+        Parameters
+        ----------
+        path: str or PathLike
+            The file to write. An existing file is overwritten.
+        """
+        functions: dict[str, Any] = {
+            function: {
+                "queue_time": self.__export(self.__queue_time, (function,)),
+                "call_time": self.__export(self.__call_time, (function,)),
+            }
+            for function in self.get_functions()
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(), "functions": functions},
+                file,
+                indent=2,
+            )
+
+
+dll_profiler = DllProfiler()
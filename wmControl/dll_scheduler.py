@@ -0,0 +1,158 @@
+"""
+A scheduler serialising the DLL access of all wavemeters connected to the host.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class DllScheduler:
+    """
+    A lock with an affinity for the active wavemeter. The DLL can only talk to one wavemeter at a time and switching
+    the active wavemeter (PresetWLMIndex) is expensive. Instead of granting the lock in the order of the requests, the
+    requests are queued per wavemeter and the queue of the active wavemeter is drained first. To bound the latency of
+    the other wavemeters, the lock is handed to the next waiting wavemeter after `max_batch_size` consecutive grants.
+    The wavemeters take turns in a round-robin fashion. Requests with a lower priority value are granted first, so
+    control requests overtake the measurements waiting.
+
+    Parameters
+    ----------
+    max_batch_size: int
+        The maximum number of consecutive grants to a wavemeter while others are waiting.
+    """
+
+    @property
+    def max_batch_size(self) -> int:
+        return self.__max_batch_size
+
+    @max_batch_size.setter
+    def max_batch_size(self, value: int) -> None:
+        if value < 1:
+            raise ValueError("The batch size must be at least 1.")
+        self.__max_batch_size = value
+
+    @property
+    def locked(self) -> bool:
+        """True if the lock is held by a wavemeter."""
+        return self.__locked
+
+    @property
+    def waiting(self) -> int:
+        """The number of pending requests."""
+        return sum(len(waiters) for waiters_per_id in self.__waiters.values() for waiters in waiters_per_id.values())
+
+    def __init__(self, max_batch_size: int = 16) -> None:
+        self.__max_batch_size = 1
+        self.max_batch_size = max_batch_size
+        # The waiters per priority and wavemeter. The insertion order of the wavemeters is the round-robin order.
+        self.__waiters: dict[int, dict[int, deque[asyncio.Future[None]]]] = {}
+        self.__locked = False
+        self.__current_id: int | None = None
+        self.__batch_size = 0
+
+    @asynccontextmanager
+    async def lock(self, product_id: int, priority: int = 0) -> AsyncIterator[None]:
+        """
+        Acquire the lock for a wavemeter and release it, when leaving the context.
+
+        Parameters
+        ----------
+        product_id: int
+            The wavemeter requesting the lock.
+        priority: int
+            The priority of the request. Requests with a lower value are granted first.
+        """
+        await self.acquire(product_id, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, product_id: int, priority: int = 0) -> None:
+        """
+        Wait until the wavemeter is granted the lock.
+
+        Parameters
+        ----------
+        product_id: int
+            The wavemeter requesting the lock.
+        priority: int
+            The priority of the request. Requests with a lower value are granted first.
+        """
+        if not self.__locked and not self.__waiters:
+            self.__grant(product_id)
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiters_per_id = self.__waiters.setdefault(priority, {})
+        try:
+            waiters_per_id[product_id].append(waiter)
+        except KeyError:
+            waiters_per_id[product_id] = deque((waiter,))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # We were granted the lock, but cancelled before we could use it, so pass it on
+                self.release()
+            else:
+                self.__remove_waiter(priority, product_id, waiter)
+            raise
+
+    def release(self) -> None:
+        """
+        Release the lock and hand it to the next wavemeter.
+        """
+        if not self.__locked:
+            raise RuntimeError("Lock is not acquired.")
+        self.__locked = False
+
+        while self.__waiters:
+            priority = min(self.__waiters)
+            waiters_per_id = self.__waiters[priority]
+            next_id = self.__select_next(waiters_per_id)
+            waiters = waiters_per_id[next_id]
+            waiter = waiters.popleft()
+            if not waiters:
+                del waiters_per_id[next_id]
+                if not waiters_per_id:
+                    del self.__waiters[priority]
+            if waiter.done():
+                # The waiter was cancelled, but has not removed itself yet
+                continue
+            self.__grant(next_id)
+            waiter.set_result(None)
+            return
+
+    def __grant(self, product_id: int) -> None:
+        self.__locked = True
+        if product_id == self.__current_id:
+            self.__batch_size += 1
+        else:
+            self.__current_id = product_id
+            self.__batch_size = 1
+
+    def __select_next(self, waiters_per_id: dict[int, deque[asyncio.Future[None]]]) -> int:
+        if self.__current_id in waiters_per_id:
+            if self.__batch_size < self.__max_batch_size or len(waiters_per_id) == 1:
+                return self.__current_id
+            # The batch is full and others are waiting, so move the current wavemeter to the end of the line
+            waiters_per_id[self.__current_id] = waiters_per_id.pop(self.__current_id)
+        return next(iter(waiters_per_id))
+
+    def __remove_waiter(self, priority: int, product_id: int, waiter: asyncio.Future[None]) -> None:
+        waiters_per_id = self.__waiters.get(priority, {})
+        waiters = waiters_per_id.get(product_id)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            pass
+        if not waiters:
+            del waiters_per_id[product_id]
+            if not waiters_per_id:
+                del self.__waiters[priority]
@@ -0,0 +1,78 @@
+"""
+A cache of the latest measurements sent by the wavemeters. The cache is fed by the DLL callback and can be used to
+answer queries without calling into the DLL.
+"""
+from __future__ import annotations
+
+import time
+
+from wmControl.wlmConst import DataPackage, Wavelength, WavemeterServerStatus
+
+
+class MeasurementCache:
+    """
+    Stores the latest wavelength measurement per wavemeter and channel. Updates are done from the DLL callback thread,
+    reads from the event loop. Both only replace or look up dict entries, which is atomic in CPython, so no lock is
+    required.
+    """
+
+    def __init__(self) -> None:
+        self.__wavelengths: dict[int, dict[int, tuple[float, Wavelength]]] = {}
+
+    def update(self, package: DataPackage) -> None:
+        """
+        Update the cache with a new package received from the DLL. Packages, that are not cached, are ignored.
+
+        Parameters
+        ----------
+        package: DataPackage
+            The package received from the wavemeter.
+        """
+        if isinstance(package, Wavelength):
+            try:
+                self.__wavelengths[package.product_id][package.channel] = (time.monotonic(), package)
+            except KeyError:
+                self.__wavelengths[package.product_id] = {package.channel: (time.monotonic(), package)}
+        elif isinstance(package, WavemeterServerStatus):
+            # The wavemeter GUI was started or stopped, so the old values are no longer valid
+            self.clear(package.product_id)
+
+    def get_wavelength(self, product_id: int, channel: int, max_age: float | None = None) -> Wavelength | None:
+        """
+        Return the latest wavelength package of a channel.
+
+        Parameters
+        ----------
+        product_id: int
+            Version of the WM. Works like a serial number just not named like it.
+        channel: int
+            The zero-based channel number.
+        max_age: float or None
+            The maximum age of the package in seconds. If None, the package is returned regardless of its age.
+
+        Returns
+        -------
+        Wavelength or None
+            The latest package or None if there is no package or if it is older than `max_age`.
+        """
+        try:
+            timestamp, package = self.__wavelengths[product_id][channel]
+        except KeyError:
+            return None
+        if max_age is not None and time.monotonic() - timestamp > max_age:
+            return None
+        return package
+
+    def clear(self, product_id: int) -> None:
+        """
+        Remove all cached packages of a wavemeter.
+
+        Parameters
+        ----------
+        product_id: int
+            Version of the WM. Works like a serial number just not named like it.
+        """
+        self.__wavelengths.pop(product_id, None)
+
+
+measurement_cache = MeasurementCache()
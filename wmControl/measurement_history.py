@@ -0,0 +1,231 @@
+"""
+A history of the measurements sent by the wavemeters. The history is fed by the DLL callback and keeps a fixed number
+of samples per wavemeter and channel.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from wmControl.wlmConst import DataPackage, Wavelength, WavemeterServerStatus
+
+# The number of samples kept per wavemeter and channel
+DEFAULT_HISTORY_SIZE = 10000
+
+
+def _to_wall_clock(timestamps: array) -> array:
+    """Convert monotonic timestamps in ms to ms since the epoch using the current offset between the clocks."""
+    offset = (time.time_ns() - time.monotonic_ns()) // 1_000_000
+    return array("q", [timestamp + offset for timestamp in timestamps])
+
+
+class RingBuffer:
+    """
+    A fixed-size buffer of timestamped samples, that overwrites the oldest samples when full. The samples are stored in
+    two arrays, so the memory used is constant and there are no Python objects per sample. Samples are appended from
+    the DLL callback thread and read from the event loop, so the access is guarded by a lock.
+
+    Parameters
+    ----------
+    size: int
+        The maximum number of samples.
+    """
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def __len__(self) -> int:
+        return min(self.__count, self.__size)
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("The size must be at least 1.")
+        self.__size = size
+        self.__timestamps = array("q", bytes(8 * size))
+        self.__values = array("d", bytes(8 * size))
+        self.__count = 0  # The total number of samples appended
+        self.__lock = threading.Lock()
+
+    def append(self, timestamp: int, value: float) -> None:
+        """
+        Append a sample and overwrite the oldest one, if the buffer is full.
+
+        Parameters
+        ----------
+        timestamp: int
+            The timestamp of the sample.
+        value: float
+            The value of the sample.
+        """
+        with self.__lock:
+            index = self.__count % self.__size
+            self.__timestamps[index] = timestamp
+            self.__values[index] = value
+            self.__count += 1
+
+    def get_last(self, number_of_samples: int) -> tuple[array, array]:
+        """
+        Return the latest samples, oldest first.
+
+        Parameters
+        ----------
+        number_of_samples: int
+            The maximum number of samples to return.
+
+        Returns
+        -------
+        tuple of array and array
+            The timestamps and the values of the samples.
+        """
+        with self.__lock:
+            number_of_samples = max(min(number_of_samples, self.__count, self.__size), 0)
+            end = self.__count % self.__size
+            start = end - number_of_samples
+            if start >= 0:
+                return self.__timestamps[start:end], self.__values[start:end]
+            # The samples wrap around the end of the arrays
+            return (
+                self.__timestamps[start:] + self.__timestamps[:end],
+                self.__values[start:] + self.__values[:end],
+            )
+
+    def get_since(self, timestamp: int) -> tuple[array, array]:
+        """
+        Return the samples with a timestamp equal to or later than the timestamp given, oldest first. The timestamps
+        are expected to be ascending.
+
+        Parameters
+        ----------
+        timestamp: int
+            The timestamp of the oldest sample to return.
+
+        Returns
+        -------
+        tuple of array and array
+            The timestamps and the values of the samples.
+        """
+        timestamps, values = self.get_last(self.__size)
+        start = bisect_left(timestamps, timestamp)
+        return timestamps[start:], values[start:]
+
+
+class MeasurementHistory:
+    """
+    Stores the history of the wavelengths measured per wavemeter and channel. The wavelengths are stored in nm as sent
+    by the wavemeter. The samples are stamped with the monotonic time of arrival, so the timestamps stay ascending if
+    the system clock is adjusted. They are converted to ms since the epoch, when they are returned. The wavemeter
+    timestamps are not used, because they wrap around after 24 days. The history of a wavemeter is cleared, when the
+    wavemeter application is started or stopped.
+
+    Parameters
+    ----------
+    size: int
+        The number of samples kept per wavemeter and channel. Set to 0 to disable the history.
+    """
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @size.setter
+    def size(self, value: int) -> None:
+        """Set the number of samples kept. This clears the history."""
+        if value < 0:
+            raise ValueError("The size must not be negative.")
+        self.__size = value
+        self.__wavelengths.clear()
+
+    def __init__(self, size: int = DEFAULT_HISTORY_SIZE) -> None:
+        self.__wavelengths: dict[int, dict[int, RingBuffer]] = {}
+        self.__size = 0
+        self.size = size
+
+    def update(self, package: DataPackage) -> None:
+        """
+        Add a package received from the DLL to the history. Packages, that are not recorded, are ignored.
+
+        Parameters
+        ----------
+        package: DataPackage
+            The package received from the wavemeter.
+        """
+        if not self.__size:
+            return
+        if isinstance(package, Wavelength):
+            try:
+                buffer = self.__wavelengths[package.product_id][package.channel]
+            except KeyError:
+                buffer = RingBuffer(self.__size)
+                self.__wavelengths.setdefault(package.product_id, {})[package.channel] = buffer
+            buffer.append(time.monotonic_ns() // 1_000_000, float(package.value))
+        elif isinstance(package, WavemeterServerStatus):
+            # The wavemeter application was started or stopped, so the measurements are no longer continuous
+            self.clear(package.product_id)
+
+    def get_wavelengths(self, product_id: int, channel: int, number_of_samples: int) -> tuple[array, array]:
+        """
+        Return the latest wavelengths of a channel, oldest first.
+
+        Parameters
+        ----------
+        product_id: int
+            Version of the WM. Works like a serial number just not named like it.
+        channel: int
+            The zero-based channel number.
+        number_of_samples: int
+            The maximum number of samples to return.
+
+        Returns
+        -------
+        tuple of array and array
+            The timestamps in ms and the wavelengths in nm. Invalid measurements are encoded as non-positive values
+            like the DLL does.
+        """
+        try:
+            timestamps, wavelengths = self.__wavelengths[product_id][channel].get_last(number_of_samples)
+        except KeyError:
+            return array("q"), array("d")
+        return _to_wall_clock(timestamps), wavelengths
+
+    def get_wavelengths_since(self, product_id: int, channel: int, duration: float) -> tuple[array, array]:
+        """
+        Return the wavelengths of a channel received within the last `duration` seconds, oldest first.
+
+        Parameters
+        ----------
+        product_id: int
+            Version of the WM. Works like a serial number just not named like it.
+        channel: int
+            The zero-based channel number.
+        duration: float
+            The time window in seconds.
+
+        Returns
+        -------
+        tuple of array and array
+            The timestamps in ms and the wavelengths in nm. Invalid measurements are encoded as non-positive values
+            like the DLL does.
+        """
+        try:
+            buffer = self.__wavelengths[product_id][channel]
+        except KeyError:
+            return array("q"), array("d")
+        timestamps, wavelengths = buffer.get_since(time.monotonic_ns() // 1_000_000 - int(duration * 1000))
+        return _to_wall_clock(timestamps), wavelengths
+
+    def clear(self, product_id: int) -> None:
+        """
+        Remove the history of a wavemeter.
+
+        Parameters
+        ----------
+        product_id: int
+            Version of the WM. Works like a serial number just not named like it.
+        """
+        self.__wavelengths.pop(product_id, None)
+
+
+measurement_history = MeasurementHistory()
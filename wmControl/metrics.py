@@ -0,0 +1,394 @@
+"""
+Counters, gauges and histograms exported in the Prometheus text format via a minimal HTTP endpoint. The metrics can be
+updated from any thread, e.g. from the DLL worker. The metrics of the global registry are only collected, when the
+daemon serves them (`METRICS_PORT`), otherwise updating them returns right away.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import partial
+from typing import Callable, Iterator, Sequence
+
+# The upper bounds of the latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric(ABC):
+    """
+    The base class of all metrics. The samples are stored per tuple of label values. A disabled metric ignores all
+    updates.
+
+    Parameters
+    ----------
+    name: str
+        The name of the metric.
+    documentation: str
+        The help text of the metric.
+    labelnames: Sequence of str
+        The names of the labels.
+    """
+
+    type = "untyped"
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def enabled(self) -> bool:
+        """True if the updates are recorded."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._enabled = value
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self._name = name
+        self._documentation = documentation
+        self._labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._enabled = True
+
+    def _check_labels(self, labels: tuple[str, ...]) -> None:
+        if len(labels) != len(self._labelnames):
+            raise ValueError(f"Metric {self._name} requires the labels {self._labelnames}, got {labels}.")
+
+    @abstractmethod
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield the suffix of the name, the formatted labels and the value of each sample."""
+
+    def collect(self) -> Iterator[str]:
+        """Yield the lines of the metric in the Prometheus text format."""
+        yield f"# HELP {self._name} {self._documentation}"
+        yield f"# TYPE {self._name} {self.type}"
+        for suffix, labels, value in self._samples():
+            yield f"{self._name}{suffix}{labels} {_format_value(value)}"
+
+
+class Counter(Metric):
+    """A value, that only increases, e.g. the number of requests."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.__values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, labels: tuple[str, ...] = ()) -> None:
+        """Increase the counter of the labels given."""
+        if not self._enabled:
+            return
+        with self._lock:
+            try:
+                self.__values[labels] += amount
+            except KeyError:
+                self._check_labels(labels)
+                self.__values[labels] = amount
+
+    def get(self, labels: tuple[str, ...] = ()) -> float:
+        return self.__values.get(labels, 0.0)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            values = list(self.__values.items())
+        for labels, value in values:
+            yield "", _format_labels(self._labelnames, labels), value
+
+
+class Gauge(Metric):
+    """A value, that can go up and down, e.g. a queue size. The value can also be read by a function when collected."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.__values: dict[tuple[str, ...], float] = {}
+        self.__functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        if not self._enabled:
+            return
+        self._check_labels(labels)
+        with self._lock:
+            self.__values[labels] = value
+
+    def inc(self, amount: float = 1.0, labels: tuple[str, ...] = ()) -> None:
+        if not self._enabled:
+            return
+        with self._lock:
+            try:
+                self.__values[labels] += amount
+            except KeyError:
+                self._check_labels(labels)
+                self.__values[labels] = amount
+
+    def dec(self, amount: float = 1.0, labels: tuple[str, ...] = ()) -> None:
+        self.inc(-amount, labels)
+
+    def set_function(self, function: Callable[[], float], labels: tuple[str, ...] = ()) -> None:
+        """Read the value of the labels given from a function, when the metrics are collected."""
+        self._check_labels(labels)
+        with self._lock:
+            self.__functions[labels] = function
+
+    def get(self, labels: tuple[str, ...] = ()) -> float:
+        try:
+            return self.__functions[labels]()
+        except KeyError:
+            return self.__values.get(labels, 0.0)
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            values = dict(self.__values)
+            functions = dict(self.__functions)
+        for labels, function in functions.items():
+            values[labels] = function()
+        for labels, value in values.items():
+            yield "", _format_labels(self._labelnames, labels), value
+
+
+class Histogram(Metric):
+    """
+    Counts the observations, e.g. latencies, in buckets. The buckets are cumulative when collected.
+
+    Parameters
+    ----------
+    name: str
+        The name of the metric.
+    documentation: str
+        The help text of the metric.
+    labelnames: Sequence of str
+        The names of the labels.
+    buckets: Sequence of float
+        The ascending upper bounds of the buckets. A bucket for +Inf is added.
+    """
+
+    type = "histogram"
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self.__buckets
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        if "le" in self._labelnames:
+            raise ValueError("The label 'le' is reserved for the buckets.")
+        self.__buckets = tuple(sorted(buckets))
+        # The non-cumulative counts of the buckets including +Inf and the sum of the observations
+        self.__counts: dict[tuple[str, ...], list[int]] = {}
+        self.__sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        """Add an observation to the histogram of the labels given."""
+        if not self._enabled:
+            return
+        index = bisect_left(self.__buckets, value)
+        with self._lock:
+            try:
+                self.__counts[labels][index] += 1
+                self.__sums[labels] += value
+            except KeyError:
+                self._check_labels(labels)
+                counts = self.__counts[labels] = [0] * (len(self.__buckets) + 1)
+                counts[index] = 1
+                self.__sums[labels] = value
+
+    def get_counts(self, labels: tuple[str, ...] = ()) -> tuple[list[int], float]:
+        """Return the non-cumulative counts of the buckets including +Inf and the sum of the observations."""
+        with self._lock:
+            return list(self.__counts.get(labels, [0] * (len(self.__buckets) + 1))), self.__sums.get(labels, 0.0)
+
+    def get_labels(self) -> list[tuple[str, ...]]:
+        """Return the label values of all histograms with observations."""
+        with self._lock:
+            return list(self.__counts)
+
+    def quantile(self, quantile: float, labels: tuple[str, ...] = ()) -> float:
+        """
+        Estimate a quantile of the observations. The upper bound of the bucket, that contains the quantile, is returned,
+        so the error is limited by the width of the buckets. Returns NaN, if there are no observations.
+
+        Parameters
+        ----------
+        quantile: float
+            The quantile in the range [0, 1].
+        labels: tuple of str
+            The label values of the histogram.
+        """
+        counts, _ = self.get_counts(labels)
+        total = sum(counts)
+        if not total:
+            return math.nan
+        rank = max(math.ceil(quantile * total), 1)
+        cumulative_count = 0
+        for upper_bound, count in zip(self.__buckets + (math.inf,), counts):
+            cumulative_count += count
+            if cumulative_count >= rank:
+                return upper_bound
+        return math.inf
+
+    def clear(self) -> None:
+        """Remove all observations."""
+        with self._lock:
+            self.__counts.clear()
+            self.__sums.clear()
+
+    def _samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            histograms = [(labels, list(counts), self.__sums[labels]) for labels, counts in self.__counts.items()]
+        bucket_labelnames = self._labelnames + ("le",)
+        for labels, counts, total in histograms:
+            cumulative_count = 0
+            for upper_bound, count in zip(self.__buckets + (math.inf,), counts):
+                cumulative_count += count
+                yield "_bucket", _format_labels(
+                    bucket_labelnames, labels + (_format_value(upper_bound),)
+                ), cumulative_count
+            formatted_labels = _format_labels(self._labelnames, labels)
+            yield "_sum", formatted_labels, total
+            yield "_count", formatted_labels, cumulative_count
+
+
+class MetricsRegistry:
+    """
+    The metrics exported by the HTTP endpoint. Enabling or disabling the registry applies to all of its metrics. Set it
+    before the metrics are updated, because gauges changed via `inc()` and `dec()` miss the updates while disabled.
+
+    Parameters
+    ----------
+    enabled: bool
+        Record the updates of the metrics.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self.__enabled = value
+        for metric in self.__metrics.values():
+            metric.enabled = value
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.__metrics: dict[str, Metric] = {}
+        self.__enabled = enabled
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.__metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        metric.enabled = self.__enabled
+        self.__metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+        return "".join(f"{line}\n" for metric in self.__metrics.values() for line in metric.collect())
+
+
+async def _handle_request(
+    registry: MetricsRegistry, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=10)
+        # Skip the headers
+        while (await asyncio.wait_for(reader.readline(), timeout=10)).strip():
+            pass
+        method, path, *_ = request_line.decode("latin-1").split()
+        if method != "GET":
+            status, body = "405 Method Not Allowed", b""
+        elif path.split("?", maxsplit=1)[0] != "/metrics":
+            status, body = "404 Not Found", b""
+        else:
+            status, body = "200 OK", registry.render().encode()
+        writer.write(
+            f"HTTP/1.0 {status}\r\nContent-Type: {CONTENT_TYPE}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (ValueError, ConnectionError, asyncio.TimeoutError):
+        # Invalid requests and clients going away are not our problem
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_metrics(host: str | Sequence[str] | None, port: int, registry: MetricsRegistry | None = None) -> None:
+    """
+    Serve the metrics via HTTP at `/metrics`. Run this as a task.
+
+    Parameters
+    ----------
+    host: str or Sequence of str or None
+        The interface to listen on. If set to None, the server is bound to all available interfaces.
+    port: int
+        The port number to listen at.
+    registry: MetricsRegistry or None
+        The metrics to serve. Defaults to the global registry.
+    """
+    server = await asyncio.start_server(partial(_handle_request, registry or metrics_registry), host=host, port=port)
+    async with server:
+        logging.getLogger(__name__).info(
+            "Serving metrics on %s",
+            ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets),
+        )
+        await server.serve_forever()
+
+
+# Enabled by the daemon, if the metrics are served
+metrics_registry = MetricsRegistry(enabled=False)
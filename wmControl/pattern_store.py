@@ -0,0 +1,156 @@
+"""
+A store of the latest patterns of a wavemeter, which is updated whenever the wavemeter signals a new pattern.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+from async_event_bus import OverflowPolicy, event_bus
+from wmControl import wlmConst
+from wmControl.wavemeter import Wavemeter
+from wmControl.wlmConst import PatternWritten, WavemeterException
+
+
+def get_pattern_topic(product_id: int) -> str:
+    """Return the topic of the event bus the pattern frames of a wavemeter are published on."""
+    return f"{product_id}/patterns"
+
+
+@dataclass(frozen=True, slots=True)
+class PatternFrame:
+    """
+    A pattern read after the wavemeter signaled that it was written.
+
+    Attributes
+    ----------
+    product_id : int
+        Product id (version) of the WM.
+    channel : int
+        Channel of the wavemeter. The channel is a 0 based index.
+    index : int
+        The pattern index, one of the cSignal constants defined in wlmConst.
+    timestamp : float
+        The time the pattern was read as returned by time.time().
+    data : memoryview
+        The items of the pattern.
+    """
+
+    product_id: int
+    channel: int
+    index: int
+    timestamp: float
+    data: memoryview
+
+
+def _copy(data: memoryview) -> memoryview:
+    return memoryview(bytes(data)).cast(data.format)
+
+
+class PatternStore:
+    """
+    Reads the pattern of a channel once, whenever the wavemeter signals that the pattern was written, instead of
+    polling it. The patterns are double-buffered: A new pattern is read into the spare buffer, then the frames are
+    swapped by reference. Readers of `get()` get the latest frame without any locking, but must consume the data before
+    the next pattern of the channel is read, because the buffer of the previous frame is reused. The frames yielded by
+    `read_frames()` carry a read-only copy of the pattern instead, because they can be queued for a long time.
+
+    Parameters
+    ----------
+    wavemeter: Wavemeter
+        The wavemeter to read the patterns from.
+    index: int
+        The pattern index, one of the cSignal constants defined in wlmConst.
+    """
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    def __init__(self, wavemeter: Wavemeter, index: int = wlmConst.cSignal1Interferometers) -> None:
+        self.__wavemeter = wavemeter
+        self.__index = index
+        self.__frames: dict[int, PatternFrame] = {}
+        self.__spare_buffers: dict[int, bytearray] = {}
+        self.__logger = logging.getLogger(__name__)
+
+    def get(self, channel: int) -> PatternFrame | None:
+        """
+        Return the latest pattern of a channel.
+
+        Parameters
+        ----------
+        channel: int
+            The zero-based channel number.
+
+        Returns
+        -------
+        PatternFrame or None
+            The latest pattern or None if no pattern was read yet.
+        """
+        return self.__frames.get(channel)
+
+    async def read_frames(
+        self, maxsize: int = 16, overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    ) -> AsyncGenerator[PatternFrame, None]:
+        """
+        Yield the new patterns. The frames are only copied, while there are readers.
+
+        Parameters
+        ----------
+        maxsize: int
+            The maximum number of frames queued. If maxsize is <= 0, the queue size is infinite.
+        overflow: OverflowPolicy
+            The action taken, when the queue is full.
+
+        Yields
+        -------
+        PatternFrame
+            The patterns read from the wavemeter. The data is a read-only copy.
+        """
+        frame: PatternFrame
+        async for frame in event_bus.subscribe(
+            get_pattern_topic(self.__wavemeter.product_id), maxsize=maxsize, overflow=overflow
+        ):
+            yield frame
+
+    async def run(self) -> None:
+        """
+        Enable the pattern export and read the patterns, when they are written. Run this as a task.
+        """
+        try:
+            await self.__wavemeter.set_pattern_export(self.__index, True)
+        except WavemeterException:
+            self.__logger.error("Cannot enable the export of pattern %i. Pattern streaming disabled.", self.__index)
+            return
+        try:
+            # If the patterns are written faster than they are read, only the latest notification per channel is kept
+            async for event in self.__wavemeter.read_events(
+                maxsize=16,
+                overflow=OverflowPolicy.COALESCE,
+                key=lambda event: event.channel,
+                event_types=PatternWritten,
+            ):
+                try:
+                    await self.__update(event.channel)
+                except WavemeterException:
+                    self.__logger.debug("Error reading pattern %i of channel %i.", self.__index, event.channel)
+        finally:
+            self.__frames.clear()
+            self.__spare_buffers.clear()
+
+    async def __update(self, channel: int) -> None:
+        # An empty buffer makes the wavemeter allocate a new one instead of using its own
+        buffer = self.__spare_buffers.pop(channel, bytearray())
+        data = await self.__wavemeter.get_pattern(channel, self.__index, buffer)
+        frame = PatternFrame(self.__wavemeter.product_id, channel, self.__index, time.time(), data)
+        previous_frame = self.__frames.get(channel)
+        self.__frames[channel] = frame
+        if previous_frame is not None:
+            self.__spare_buffers[channel] = previous_frame.data.obj
+        topic = get_pattern_topic(self.__wavemeter.product_id)
+        if event_bus.get_subscriptions(topic):
+            # The buffer of the frame is reused, so the subscribers get a copy, which outlives the next pattern
+            event_bus.publish(topic, PatternFrame(frame.product_id, channel, frame.index, frame.timestamp, _copy(data)))
@@ -0,0 +1,322 @@
+"""
+A recorder writing the measurements of a wavemeter to disk in compressed columnar segments.
+
+A recording is a sequence of self-contained segments. Each segment starts with a header (see `SEGMENT_HEADER`)
+followed by five zlib compressed columns of little-endian integers:
+
+- timestamps: The time of arrival in ms since the epoch (int64), the first one absolute, then as differences.
+- device timestamps: The timestamp in ms sent by the wavemeter or -1, if the package has no timestamp (int64), the
+  first one absolute, then as differences. Unlike the time of arrival, it is not affected by delays of the event loop.
+- modes: The measurement mode of the package, see `MeasureMode` (uint16).
+- channels: The zero-based channel or -1, if the package has no channel (int8).
+- values: The measured values (float64). The bits of each value are XORed with the previous value of the same mode
+  and channel, so slowly changing values compress well.
+
+A truncated segment at the end of a file, e.g. after a power failure, is ignored by the reader.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from typing import BinaryIO, Iterator
+
+from async_event_bus import OverflowPolicy
+from wmControl.wavemeter import Wavemeter
+from wmControl.wlmConst import DataPackage
+
+SEGMENT_MAGIC = b"WMRS"
+SEGMENT_VERSION = 2
+# Magic, version, number of samples, compressed size of the timestamps, device timestamps, modes, channels and values
+SEGMENT_HEADER = struct.Struct("<4sBxxxIIIIII")
+FILE_SUFFIX = ".wmr"
+
+# The default rotation of the files
+DEFAULT_MAX_FILE_SIZE = 64 * 1024 * 1024  # in bytes
+DEFAULT_MAX_FILE_AGE = 3600.0  # in s
+# The default number of samples per segment and the maximum time a sample is buffered before it is written
+DEFAULT_SEGMENT_SIZE = 4096
+DEFAULT_FLUSH_INTERVAL = 1.0  # in s
+# The number of segments waiting for the writer thread, before new segments are dropped
+MAX_PENDING_SEGMENTS = 64
+
+
+def _to_little_endian(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    column = array(typecode, data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _to_differences(column: array) -> array:
+    differences = array("q", column)
+    for index in range(len(differences) - 1, 0, -1):
+        differences[index] -= differences[index - 1]
+    return differences
+
+
+def _from_differences(differences: array) -> array:
+    for index in range(1, len(differences)):
+        differences[index] += differences[index - 1]
+    return differences
+
+
+def encode_segment(timestamps: array, device_timestamps: array, modes: array, channels: array, values: array) -> bytes:
+    """
+    Encode the samples as a compressed segment.
+
+    Parameters
+    ----------
+    timestamps: array
+        The times of arrival in ms ('q').
+    device_timestamps: array
+        The timestamps in ms sent by the wavemeter or -1 ('q').
+    modes: array
+        The measurement modes ('H').
+    channels: array
+        The zero-based channels or -1 ('b').
+    values: array
+        The values ('d').
+
+    Returns
+    -------
+    bytes
+        The segment including the header.
+    """
+    count = len(timestamps)
+    if not len(device_timestamps) == len(modes) == len(channels) == len(values) == count:
+        raise ValueError("All columns must have the same length.")
+
+    bits = array("Q")
+    bits.frombytes(array("d", values).tobytes())
+    previous_bits: dict[tuple[int, int], int] = {}
+    for index, (mode, channel, value_bits) in enumerate(zip(modes, channels, bits)):
+        key = (mode, channel)
+        bits[index] = value_bits ^ previous_bits.get(key, 0)
+        previous_bits[key] = value_bits
+
+    columns = [
+        zlib.compress(_to_little_endian(column))
+        for column in (_to_differences(timestamps), _to_differences(device_timestamps), modes, channels, bits)
+    ]
+    header = SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, count, *(len(column) for column in columns))
+    return b"".join((header, *columns))
+
+
+def decode_segment(data: bytes | memoryview) -> tuple[array, array, array, array, array]:
+    """
+    Decode a segment encoded by `encode_segment()`.
+
+    Parameters
+    ----------
+    data: bytes or memoryview
+        The segment including the header.
+
+    Returns
+    -------
+    tuple of array
+        The times of arrival in ms, device timestamps in ms, modes, channels and values.
+    """
+    magic, version, count, *sizes = SEGMENT_HEADER.unpack_from(data)
+    if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+        raise ValueError("Not a segment of a wavemeter recording.")
+    columns = []
+    offset = SEGMENT_HEADER.size
+    for typecode, size in zip("qqHbQ", sizes):
+        columns.append(_from_little_endian(typecode, zlib.decompress(data[offset : offset + size])))
+        offset += size
+    if any(len(column) != count for column in columns):
+        raise ValueError("Corrupted segment.")
+    timestamps, device_timestamps, modes, channels, bits = columns
+    timestamps = _from_differences(timestamps)
+    device_timestamps = _from_differences(device_timestamps)
+
+    previous_bits: dict[tuple[int, int], int] = {}
+    for index, (mode, channel, xored_bits) in enumerate(zip(modes, channels, bits)):
+        key = (mode, channel)
+        bits[index] = previous_bits[key] = xored_bits ^ previous_bits.get(key, 0)
+    values = array("d")
+    values.frombytes(bits.tobytes())
+
+    return timestamps, device_timestamps, modes, channels, values
+
+
+def read_recording(path: str | os.PathLike) -> Iterator[tuple[array, array, array, array, array]]:
+    """
+    Read the segments of a recording file. A truncated segment at the end of the file is ignored.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        The file to read.
+
+    Yields
+    ------
+    tuple of array
+        The times of arrival in ms, device timestamps in ms, modes, channels and values of each segment.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    offset = 0
+    while offset + SEGMENT_HEADER.size <= len(data):
+        sizes = SEGMENT_HEADER.unpack_from(data, offset)[3:]
+        end = offset + SEGMENT_HEADER.size + sum(sizes)
+        if end > len(data):
+            break
+        yield decode_segment(memoryview(data)[offset:end])
+        offset = end
+
+
+class Recorder:
+    """
+    Records all measurements of a wavemeter, that carry a value. The samples are collected into columns on the event
+    loop and handed to a writer thread in segments, so the event loop never blocks on compression or disk access. If the
+    writer thread falls behind by more than `MAX_PENDING_SEGMENTS`, new segments are dropped. A new file is started,
+    when the current one exceeds `max_file_size` or `max_file_age`. The files are named
+    `<product id>_<UTC start time>.wmr`.
+
+    Parameters
+    ----------
+    wavemeter: Wavemeter
+        The wavemeter to record.
+    directory: str or PathLike
+        The directory to write the files to. It is created if necessary.
+    max_file_size: int
+        The size in bytes, after which a new file is started.
+    max_file_age: float
+        The time in s, after which a new file is started.
+    segment_size: int
+        The maximum number of samples per segment.
+    flush_interval: float
+        The maximum time in s a sample is buffered, before it is handed to the writer thread.
+    queue_size: int
+        The number of events buffered, if the recorder cannot keep up. Older events are dropped.
+    """
+
+    def __init__(
+        self,
+        wavemeter: Wavemeter,
+        directory: str | os.PathLike,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        max_file_age: float = DEFAULT_MAX_FILE_AGE,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        queue_size: int = 65536,
+    ) -> None:
+        if segment_size < 1:
+            raise ValueError("A segment must contain at least 1 sample.")
+        self.__wavemeter = wavemeter
+        self.__directory = directory
+        self.__max_file_size = max_file_size
+        self.__max_file_age = max_file_age
+        self.__segment_size = segment_size
+        self.__flush_interval = flush_interval
+        self.__queue_size = queue_size
+        self.__segments: queue.Queue[tuple[array, ...] | None] = queue.Queue(maxsize=MAX_PENDING_SEGMENTS)
+        self.__columns = self.__create_columns()
+        self.__logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def __create_columns() -> tuple[array, array, array, array, array]:
+        return array("q"), array("q"), array("H"), array("b"), array("d")
+
+    def __flush(self) -> None:
+        if self.__columns[0]:
+            try:
+                self.__segments.put_nowait(self.__columns)
+            except queue.Full:
+                self.__logger.warning(
+                    "The recorder of wavemeter %i cannot keep up. Dropped %i samples.",
+                    self.__wavemeter.product_id,
+                    len(self.__columns[0]),
+                )
+            self.__columns = self.__create_columns()
+
+    async def __flush_periodically(self) -> None:
+        while "recording":
+            await asyncio.sleep(self.__flush_interval)
+            self.__flush()
+
+    async def run(self) -> None:
+        """
+        Record the measurements of the wavemeter. Run this as a task. The remaining samples are written, when the task
+        is cancelled. The task returns after the writer thread is done.
+        """
+        os.makedirs(self.__directory, exist_ok=True)
+        # A daemon, so a recorder, that is never stopped, does not block the exit. The thread is joined below instead.
+        writer = threading.Thread(target=self.__write, name=f"recorder-{self.__wavemeter.product_id}", daemon=True)
+        writer.start()
+        flush_task = asyncio.create_task(self.__flush_periodically())
+        try:
+            async for package in self.__wavemeter.read_events(
+                maxsize=self.__queue_size, overflow=OverflowPolicy.DROP_OLDEST
+            ):
+                self.__add(package)
+        finally:
+            flush_task.cancel()
+            self.__flush()
+            # Wait for the writer without blocking the event loop, the queue might be full
+            await asyncio.to_thread(self.__segments.put, None)
+            await asyncio.to_thread(writer.join)
+
+    def __add(self, package: DataPackage) -> None:
+        try:
+            value = float(package.value)  # type: ignore[attr-defined]
+        except (AttributeError, TypeError, ValueError):
+            # Only packages with a numeric value are recorded
+            return
+        timestamps, device_timestamps, modes, channels, values = self.__columns
+        timestamps.append(time.time_ns() // 1_000_000)
+        device_timestamps.append(getattr(package, "timestamp", -1))
+        modes.append(getattr(package, "mode", 0))
+        channels.append(getattr(package, "channel", -1))
+        values.append(value)
+        if len(timestamps) >= self.__segment_size:
+            self.__flush()
+
+    def __open_file(self) -> BinaryIO:
+        start = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S_%f")
+        path = os.path.join(self.__directory, f"{self.__wavemeter.product_id}_{start}{FILE_SUFFIX}")
+        self.__logger.info("Recording wavemeter %i to '%s'.", self.__wavemeter.product_id, path)
+        return open(path, "ab")
+
+    def __write(self) -> None:
+        file: BinaryIO | None = None
+        file_opened = 0.0
+        try:
+            while (columns := self.__segments.get()) is not None:
+                try:
+                    segment = encode_segment(*columns)
+                    if (
+                        file is None
+                        or file.tell() >= self.__max_file_size
+                        or time.monotonic() - file_opened >= self.__max_file_age
+                    ):
+                        if file is not None:
+                            file.close()
+                        file = None  # Do not write to a closed file, if opening the new one fails
+                        file = self.__open_file()
+                        file_opened = time.monotonic()
+                    file.write(segment)
+                    file.flush()
+                except Exception:  # pylint: disable=broad-except
+                    # Only lose this segment, the thread must keep draining the queue
+                    self.__logger.exception("Error writing the recording of wavemeter %i.", self.__wavemeter.product_id)
+        finally:
+            if file is not None:
+                file.close()
@@ -0,0 +1,329 @@
+"""
+A simulation of the wlmData DLL for testing the server without wavemeters. It implements the DLL functions used by
+`wlmData` and drives the callback from its own thread like the DLL does. Use `wlmData.LoadSimulatedDLL()` to load it.
+
+Wavemeters are created, when their product id is first used, e.g. by `PresetWLMIndex()`. Each wavemeter sends a
+wavelength measurement per channel at the event rate configured. The measurements are random, but deterministic for a
+given seed and product id.
+"""
+from __future__ import annotations
+
+import ctypes
+import math
+import random
+import threading
+import time
+from array import array
+from typing import Callable
+
+from wmControl import wlmConst
+from wmControl.wlmConst import MeasureMode
+
+# The wavelength modes of the channels, see the Wavelength packages in wlmConst
+WAVELENGTH_MODES = (
+    MeasureMode.cmiWavelength1,
+    MeasureMode.cmiWavelength2,
+    MeasureMode.cmiWavelength3,
+    MeasureMode.cmiWavelength4,
+    MeasureMode.cmiWavelength5,
+    MeasureMode.cmiWavelength6,
+    MeasureMode.cmiWavelength7,
+    MeasureMode.cmiWavelength8,
+)
+# The errors sent instead of a wavelength, if an error is injected
+MEASUREMENT_ERRORS = (wlmConst.ErrNoSignal, wlmConst.ErrBadSignal, wlmConst.ErrLowSignal, wlmConst.ErrBigSignal)
+PATTERN_ITEM_COUNT = 2048
+PATTERN_ITEM_SIZE = 2
+
+
+class SimulatedWavemeter:
+    """
+    The state of a simulated wavemeter.
+
+    Parameters
+    ----------
+    product_id: int
+        Version of the WM. Works like a serial number just not named like it.
+    channels: int
+        The number of channels.
+    noise: float
+        The standard deviation of the wavelengths in nm.
+    seed: int
+        The seed of the random measurements.
+    """
+
+    def __init__(self, product_id: int, channels: int, noise: float, seed: int) -> None:
+        self.product_id = product_id
+        self.channels = channels
+        self.noise = noise
+        self.switch_mode = False
+        self.channel = 0
+        self.patterns_enabled: set[int] = set()
+        self.__random = random.Random(f"{seed}-{product_id}")
+        self.base_wavelengths = [
+            780.24 + 10.0 * channel + self.__random.uniform(0, 1e-3) for channel in range(channels)
+        ]
+        self.wavelengths = list(self.base_wavelengths)
+        patterns = []
+        for channel in range(channels):
+            # An interferometer fringe with a period depending on the wavelength
+            period = self.base_wavelengths[channel] / 20
+            pattern = array(
+                "h", (int(16000 * math.sin(2 * math.pi * item / period)) for item in range(PATTERN_ITEM_COUNT))
+            )
+            patterns.append(pattern.tobytes())
+        self.patterns = patterns
+
+    def measure(self, channel: int, error_rate: float) -> float:
+        """
+        Simulate a new measurement of a channel.
+
+        Parameters
+        ----------
+        channel: int
+            The zero-based channel number.
+        error_rate: float
+            The probability of an error.
+
+        Returns
+        -------
+        float
+            The wavelength in nm or an error encoded as a non-positive value.
+        """
+        if error_rate and self.__random.random() < error_rate:
+            wavelength = float(self.__random.choice(MEASUREMENT_ERRORS))
+        else:
+            wavelength = self.base_wavelengths[channel] + self.__random.gauss(0, self.noise)
+        self.wavelengths[channel] = wavelength
+        return wavelength
+
+
+class SimulatedDll:
+    """
+    Simulates the functions of the wlmData DLL used by `wlmData`. The function names and parameters follow the DLL.
+
+    Parameters
+    ----------
+    channels: int
+        The number of channels per wavemeter. At most 8 are supported.
+    event_rate: float
+        The number of measurements per second and channel sent to the callback. 0 disables the callback.
+    latency: float
+        The time in s every DLL function call takes.
+    error_rate: float
+        The probability of a measurement or a function call returning an error.
+    noise: float
+        The standard deviation of the wavelengths in nm.
+    seed: int
+        The seed of the random measurements and errors.
+    """
+
+    def __init__(
+        self,
+        channels: int = 8,
+        event_rate: float = 100.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        noise: float = 1e-6,
+        seed: int = 0,
+    ) -> None:
+        if not 1 <= channels <= len(WAVELENGTH_MODES):
+            raise ValueError(f"The number of channels must be between 1 and {len(WAVELENGTH_MODES)}.")
+        self.__channels = channels
+        self.__event_rate = event_rate
+        self.__latency = latency
+        self.__error_rate = error_rate
+        self.__noise = noise
+        self.__seed = seed
+        self.__random = random.Random(seed)  # Errors of function calls
+        self.__wavemeters: dict[int, SimulatedWavemeter] = {}
+        self.__active: SimulatedWavemeter | None = None
+        self.__callback: Callable[[int, int, int, float, int], None] | None = None
+        self.__thread: threading.Thread | None = None
+        self.__stop = threading.Event()
+
+    def __call(self) -> bool:
+        """Simulate the latency of a function call. Returns True, if an error is to be injected."""
+        if self.__latency:
+            time.sleep(self.__latency)
+        return bool(self.__error_rate) and self.__random.random() < self.__error_rate
+
+    def get_wavemeter(self, product_id: int) -> SimulatedWavemeter:
+        """Return the simulated wavemeter of a product id, e.g. to change its patterns. It is created if necessary."""
+        try:
+            return self.__wavemeters[product_id]
+        except KeyError:
+            wavemeter = SimulatedWavemeter(product_id, self.__channels, self.__noise, self.__seed)
+            self.__wavemeters[product_id] = wavemeter
+            return wavemeter
+
+    @property
+    def __wavemeter(self) -> SimulatedWavemeter:
+        if self.__active is None:
+            # The DLL uses the first wavemeter, if none was selected
+            self.__active = self.get_wavemeter(next(iter(self.__wavemeters), 0))
+        return self.__active
+
+    def __run(self) -> None:
+        """Send the measurements to the callback at the event rate."""
+        interval = 1 / self.__event_rate
+        start = time.perf_counter()
+        next_time = start
+        while not self.__stop.is_set():
+            callback = self.__callback
+            if callback is None:
+                break
+            timestamp = int((time.perf_counter() - start) * 1000) & 0x7FFFFFFF  # The DLL sends a 32 bit timestamp in ms
+            for wavemeter in tuple(self.__wavemeters.values()):
+                for channel in range(wavemeter.channels):
+                    callback(
+                        wavemeter.product_id,
+                        WAVELENGTH_MODES[channel],
+                        timestamp,
+                        wavemeter.measure(channel, self.__error_rate),
+                        0,
+                    )
+                    if wavemeter.patterns_enabled:
+                        callback(wavemeter.product_id, MeasureMode.cmiPatternAnalysisWritten, channel + 1, 0.0, 0)
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                self.__stop.wait(delay)
+            elif delay < -1:
+                # Do not try to catch up after a stall, the DLL would not either
+                next_time = time.perf_counter()
+
+    def __start(self) -> None:
+        if self.__thread is None and self.__event_rate > 0:
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.__run, name="wlmSimulation", daemon=True)
+            self.__thread.start()
+
+    def __stop_thread(self) -> None:
+        if self.__thread is not None:
+            self.__stop.set()
+            if self.__thread is not threading.current_thread():
+                self.__thread.join()
+            self.__thread = None
+
+    # ***********  Functions for general usage  ****************************
+    def Instantiate(self, rfc: int, mode: int, p1: Callable | int, p2: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        if rfc == wlmConst.cInstNotification:
+            if mode in (wlmConst.cNotifyInstallCallback, wlmConst.cNotifyInstallCallbackEx):
+                self.__callback = p1  # type: ignore[assignment]
+                self.__start()
+            elif mode == wlmConst.cNotifyRemoveCallback:
+                self.__callback = None
+                self.__stop_thread()
+        return 1
+
+    def ControlWLMEx(  # pylint: disable=invalid-name
+        self, action: int, app: str | int, version: int, delay: int, res: int
+    ) -> int:
+        self.__call()
+        self.get_wavemeter(version)
+        return wlmConst.ControlFlags.flServerStarted.value
+
+    def PresetWLMIndex(self, version: int) -> int:  # pylint: disable=invalid-name
+        if self.__call():
+            return wlmConst.ResERR_WlmMissing
+        self.__active = self.get_wavemeter(version)
+        return list(self.__wavemeters).index(version)
+
+    def GetWLMVersion(self, ver: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        return (wlmConst.WavemeterType.ws8.value, self.__wavemeter.product_id, 1, 0)[ver]
+
+    def GetWLMIndex(self, version: int) -> int:  # pylint: disable=invalid-name
+        if self.__call():
+            return wlmConst.ErrWlmMissing
+        self.get_wavemeter(version)
+        return list(self.__wavemeters).index(version)
+
+    def GetWLMCount(self, v: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        return len(self.__wavemeters)
+
+    def GetChannelsCount(self, c: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        return self.__channels
+
+    # ***********  Measurement results  ************************************
+    def GetWavelengthNum(self, num: int, wl: float) -> float:  # pylint: disable=invalid-name
+        if self.__call():
+            return float(wlmConst.ErrLowSignal)
+        if not 1 <= num <= self.__channels:
+            return float(wlmConst.ErrChannelNotAvailable)
+        return self.__wavemeter.wavelengths[num - 1]
+
+    def GetFrequencyNum(self, num: int, f: float) -> float:  # pylint: disable=invalid-name
+        wavelength = self.GetWavelengthNum(num, 0.0)
+        if wavelength <= 0:
+            return wavelength
+        return 299792.458 / wavelength  # in THz
+
+    def GetCalWavelength(self, ba: int, wl: float) -> float:  # pylint: disable=invalid-name
+        self.__call()
+        return 632.99139822
+
+    def GetTemperature(self, t: float) -> float:  # pylint: disable=invalid-name
+        if self.__call():
+            return float(wlmConst.ErrNotAvailable)
+        return 25.0
+
+    # ***********  Switcher  ***********************************************
+    def GetSwitcherMode(self, sm: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        return int(self.__wavemeter.switch_mode)
+
+    def SetSwitcherMode(self, sm: int) -> int:  # pylint: disable=invalid-name
+        if self.__call():
+            return wlmConst.ResERR_CouldNotSet
+        self.__wavemeter.switch_mode = bool(sm)
+        return wlmConst.ResERR_NoErr
+
+    def GetSwitcherChannel(self, ch: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        return self.__wavemeter.channel + 1
+
+    def SetSwitcherChannel(self, ch: int) -> int:  # pylint: disable=invalid-name
+        if self.__call():
+            return wlmConst.ResERR_CouldNotSet
+        if not 1 <= ch <= self.__channels:
+            return wlmConst.ResERR_ChannelNotAvailable
+        self.__wavemeter.channel = ch - 1
+        return wlmConst.ResERR_NoErr
+
+    def SetAutoCal(self, ac: int) -> int:  # pylint: disable=invalid-name
+        if self.__call():
+            return wlmConst.ResERR_CouldNotSet
+        return wlmConst.ResERR_NoErr
+
+    # ***********  Patterns  ***********************************************
+    def SetPattern(self, index: int, enable: int) -> int:  # pylint: disable=invalid-name
+        if self.__call():
+            return wlmConst.ResERR_CouldNotSet
+        if enable == wlmConst.cPatternEnable:
+            self.__wavemeter.patterns_enabled.add(index)
+        else:
+            self.__wavemeter.patterns_enabled.discard(index)
+        return wlmConst.ResERR_NoErr
+
+    def GetPatternItemSize(self, index: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        return PATTERN_ITEM_SIZE if index in self.__wavemeter.patterns_enabled else wlmConst.ErrNoValue
+
+    def GetPatternItemCount(self, index: int) -> int:  # pylint: disable=invalid-name
+        self.__call()
+        return PATTERN_ITEM_COUNT if index in self.__wavemeter.patterns_enabled else wlmConst.ErrNoValue
+
+    def GetPatternDataNum(self, ch: int, index: int, p: int) -> int:  # pylint: disable=invalid-name
+        if self.__call():
+            return wlmConst.ErrNoValue
+        wavemeter = self.__wavemeter
+        if index not in wavemeter.patterns_enabled or not 1 <= ch <= self.__channels:
+            return wlmConst.ErrNoValue
+        pattern = wavemeter.patterns[ch - 1]
+        ctypes.memmove(p, pattern, len(pattern))
+        return 1
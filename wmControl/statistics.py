@@ -0,0 +1,211 @@
+"""
+Running statistics of the wavelengths measured by a wavemeter over a sliding window of samples.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from collections import deque
+
+from async_event_bus import OverflowPolicy
+from wmControl.wavemeter import Wavemeter
+from wmControl.wlmConst import Wavelength
+
+# The number of samples per channel the statistics are calculated over
+DEFAULT_STATISTICS_WINDOW = 100
+
+
+class WindowStatistics:
+    """
+    Calculates the mean, standard deviation, minimum and maximum of the last `window` samples incrementally. The mean
+    and variance are updated with Welford's algorithm, extended to remove the oldest sample. To avoid the accumulation
+    of rounding errors, they are recalculated from the samples once per window. The minimum and maximum are tracked
+    with monotonic queues. All updates are O(1) amortised.
+
+    Parameters
+    ----------
+    window: int
+        The number of samples.
+    """
+
+    @property
+    def window(self) -> int:
+        return self.__window
+
+    @property
+    def count(self) -> int:
+        """The number of samples in the window."""
+        return len(self.__samples)
+
+    @property
+    def mean(self) -> float:
+        return self.__mean if self.__samples else math.nan
+
+    @property
+    def variance(self) -> float:
+        """The sample variance. NaN, if there are less than two samples."""
+        if len(self.__samples) < 2:
+            return math.nan
+        return max(self.__m2 / (len(self.__samples) - 1), 0.0)
+
+    @property
+    def standard_deviation(self) -> float:
+        """The sample standard deviation. NaN, if there are less than two samples."""
+        return math.sqrt(self.variance)
+
+    @property
+    def minimum(self) -> float:
+        return self.__minima[0][1] if self.__minima else math.nan
+
+    @property
+    def maximum(self) -> float:
+        return self.__maxima[0][1] if self.__maxima else math.nan
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("The window must contain at least 1 sample.")
+        self.__window = window
+        self.__samples: deque[float] = deque()
+        self.__mean = 0.0
+        self.__m2 = 0.0  # The sum of the squared differences from the mean
+        self.__removals = 0  # The number of samples removed since the last recalculation
+        self.__index = 0  # The index of the next sample
+        self.__minima: deque[tuple[int, float]] = deque()  # Ascending values
+        self.__maxima: deque[tuple[int, float]] = deque()  # Descending values
+
+    def add(self, value: float) -> None:
+        """
+        Add a sample and remove the oldest one, if the window is full.
+
+        Parameters
+        ----------
+        value: float
+            The new sample.
+        """
+        samples = self.__samples
+        if len(samples) == self.__window:
+            oldest = samples.popleft()
+            samples.append(value)
+            mean = self.__mean + (value - oldest) / self.__window
+            self.__m2 += (value - oldest) * (value - mean + oldest - self.__mean)
+            self.__mean = mean
+            self.__removals += 1
+            if self.__removals >= self.__window:
+                self.__recalculate()
+        else:
+            samples.append(value)
+            delta = value - self.__mean
+            self.__mean += delta / len(samples)
+            self.__m2 += delta * (value - self.__mean)
+
+        index = self.__index
+        self.__index += 1
+        oldest_index = index - self.__window
+        while self.__minima and self.__minima[-1][1] >= value:
+            self.__minima.pop()
+        self.__minima.append((index, value))
+        if self.__minima[0][0] <= oldest_index:
+            self.__minima.popleft()
+        while self.__maxima and self.__maxima[-1][1] <= value:
+            self.__maxima.pop()
+        self.__maxima.append((index, value))
+        if self.__maxima[0][0] <= oldest_index:
+            self.__maxima.popleft()
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self.__samples.clear()
+        self.__minima.clear()
+        self.__maxima.clear()
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.__removals = 0
+
+    def __recalculate(self) -> None:
+        mean = math.fsum(self.__samples) / len(self.__samples)
+        self.__m2 = math.fsum((sample - mean) ** 2 for sample in self.__samples)
+        self.__mean = mean
+        self.__removals = 0
+
+
+class MeasurementStatistics:
+    """
+    Keeps the statistics of the wavelengths measured per channel of a wavemeter. The wavelengths are in nm as sent by
+    the wavemeter. Invalid measurements are ignored.
+
+    Parameters
+    ----------
+    wavemeter: Wavemeter
+        The wavemeter to read the measurements from.
+    window: int
+        The number of samples per channel the statistics are calculated over.
+    """
+
+    @property
+    def window(self) -> int:
+        return self.__window
+
+    @window.setter
+    def window(self, value: int) -> None:
+        """Set the number of samples. This clears the statistics."""
+        if value < 1:
+            raise ValueError("The window must contain at least 1 sample.")
+        self.__window = value
+        self.__channels.clear()
+
+    def __init__(self, wavemeter: Wavemeter, window: int = DEFAULT_STATISTICS_WINDOW) -> None:
+        self.__wavemeter = wavemeter
+        self.__channels: dict[int, WindowStatistics] = {}
+        self.__window = 1
+        self.window = window
+        self.__logger = logging.getLogger(__name__)
+
+    def get(self, channel: int) -> WindowStatistics | None:
+        """
+        Return the statistics of a channel.
+
+        Parameters
+        ----------
+        channel: int
+            The zero-based channel number.
+
+        Returns
+        -------
+        WindowStatistics or None
+            The statistics or None if no valid measurement was received yet.
+        """
+        return self.__channels.get(channel)
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self.__channels.clear()
+
+    def update(self, package: Wavelength) -> None:
+        """
+        Add a wavelength measurement.
+
+        Parameters
+        ----------
+        package: Wavelength
+            The measurement received from the wavemeter.
+        """
+        if not package.value > 0:
+            # Errors are encoded as non-positive values
+            return
+        try:
+            statistics = self.__channels[package.channel]
+        except KeyError:
+            statistics = self.__channels[package.channel] = WindowStatistics(self.__window)
+        statistics.add(float(package.value))
+
+    async def run(self) -> None:
+        """
+        Read the measurements of the wavemeter and update the statistics. Run this as a task.
+        """
+        try:
+            async for package in self.__wavemeter.read_events(
+                overflow=OverflowPolicy.DROP_OLDEST, event_types=Wavelength
+            ):
+                self.update(package)
+        finally:
+            self.__channels.clear()
@@ -4,32 +4,55 @@ Contains the related class for wavemeter control.
 from __future__ import annotations
 
 import asyncio
-import concurrent.futures
+import contextvars
 import ctypes
+import itertools
 import logging
+import queue
+import threading
+import time
 from decimal import Decimal
+from enum import IntEnum
+from functools import partial
 from types import TracebackType
-from typing import Any, AsyncGenerator, Awaitable, Callable, Set, Type
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Sequence,
+    Set,
+    Type,
+)
 
 try:
     from typing import Self  # type: ignore # Python >=3.11
 except ImportError:
     from typing_extensions import Self
 
-import janus
-
 import wmControl.wlmData as wlmData
-from async_event_bus import event_bus
+from async_event_bus import OverflowPolicy, event_bus
 from wmControl import wlmConst
 from wmControl.data_factory import data_factory
+from wmControl.dll_profiler import dll_profiler
+from wmControl.dll_scheduler import DllScheduler
+from wmControl.measurement_cache import measurement_cache
+from wmControl.measurement_history import measurement_history
+from wmControl.metrics import metrics_registry
 from wmControl.wlmConst import (
     DataPackage,
+    MeasureMode,
     NoWavemeterAvailable,
     WavemeterException,
     WavemeterServerStart,
     WavemeterType,
 )
 
+# The number of events queued per subscriber, before the oldest events are dropped
+DEFAULT_EVENT_QUEUE_SIZE = 1000
+
 
 def callback(product_id: int, mode: int, int_val: int, double_val: float, result: int) -> None:
     """
@@ -56,6 +79,8 @@ def callback(product_id: int, mode: int, int_val: int, double_val: float, result
             "Unknown data type received from wavemeter %i: %i | %i | %s.", product_id, mode, int_val, double_val
         )
     else:
+        measurement_cache.update(package)
+        measurement_history.update(package)
         event_bus.publish_sync(str(package.product_id), package)
 
 
@@ -69,26 +94,171 @@ wavemeter_callback_pointer = ctypes.CFUNCTYPE(
 )(callback)
 
 
-def _lock_wavemeter(function: Callable[..., Awaitable[Any]]):
+class JobPriority(IntEnum):
+    """
+    The priority classes of the DLL jobs. Jobs with a lower value are executed first, jobs of the same class in order.
+    The calls of a wavemeter wait for `Wavemeter._scheduler`, so the priority is applied there, see `_lock_wavemeter`.
+    """
+
+    CONTROL = 0
+    MEASUREMENT = 1
+
+
+dll_queue_seconds = metrics_registry.histogram(
+    "wavemeter_dll_queue_seconds", "Time DLL calls wait for the DLL worker in s.", ("priority",)
+)
+dll_call_seconds = metrics_registry.histogram(
+    "wavemeter_dll_call_seconds", "Time spent in DLL calls in s.", ("priority",)
+)
+dll_lock_wait_seconds = metrics_registry.histogram(
+    "wavemeter_lock_wait_seconds", "Time waited for the DLL scheduler to select the wavemeter in s.", ("product_id",)
+)
+# The labels are created once, so observing a DLL call does not allocate them
+_PRIORITY_LABELS = {priority: (priority.name.lower(),) for priority in JobPriority}
+# The time (perf_counter) the current task requested the scheduler lock, see `_lock_wavemeter`. The DLL profiler
+# measures the queue time from there, because the calls wait for the lock, not for the DLL worker.
+_lock_requested: contextvars.ContextVar[float | None] = contextvars.ContextVar("lock_requested", default=None)
+
+
+class DllWorker:
+    """
+    A single thread executing all DLL calls from a priority queue. The DLL can only serve one call at a time, so a
+    single worker keeps the calls of all wavemeters in a well-defined order and the event loop free of blocking calls.
+    The thread is started with the first job.
+    """
+
+    def __init__(self) -> None:
+        self.__jobs: queue.PriorityQueue[
+            tuple
+        ] = queue.PriorityQueue()  # (priority, sequence, submit time, lock request time, loop, future, func, args)
+        self.__sequence = itertools.count()  # Keeps the jobs of the same priority in order
+        self.__thread: threading.Thread | None = None
+        self.__thread_lock = threading.Lock()
+
+    def submit(self, func: Callable, *args: Any, priority: JobPriority = JobPriority.MEASUREMENT) -> asyncio.Future:
+        """
+        Queue a DLL call. The DLL is passed as the first argument to `func`.
+
+        Parameters
+        ----------
+        func: Callable
+            The function to call with the DLL and `args`.
+        *args: Any
+            The arguments passed to `func`.
+        priority: JobPriority
+            The priority class of the job.
+
+        Returns
+        -------
+        asyncio.Future
+            A future of the event loop calling this function, that is resolved with the result of `func`.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__start()
+        submitted = time.perf_counter()
+        requested = _lock_requested.get()
+        self.__jobs.put(
+            (
+                priority,
+                next(self.__sequence),
+                submitted,
+                submitted if requested is None else requested,
+                loop,
+                future,
+                func,
+                args,
+            )
+        )
+        return future
+
+    def __start(self) -> None:
+        if self.__thread is not None:
+            return
+        with self.__thread_lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="wlmData", daemon=True)
+                self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            priority, _, submitted, requested, loop, future, func, args = self.__jobs.get()
+            if future.cancelled():
+                # Nobody is waiting for the result anymore. The flag is only read here, so there is no need to lock.
+                continue
+            start = time.perf_counter()
+            try:
+                result = func(wlmData.dll, *args)
+            except BaseException as exc:  # pylint: disable=broad-except
+                end = time.perf_counter()
+                self.__resolve(loop, future, _set_future_exception, exc)
+            else:
+                end = time.perf_counter()
+                self.__resolve(loop, future, _set_future_result, result)
+            # Record the timing after the result was handed over, so it does not delay the caller
+            labels = _PRIORITY_LABELS[priority]
+            dll_queue_seconds.observe(start - submitted, labels)
+            dll_call_seconds.observe(end - start, labels)
+            if dll_profiler.enabled:
+                dll_profiler.record(func, start - requested, end - start)
+
+    @staticmethod
+    def __resolve(loop: asyncio.AbstractEventLoop, future: asyncio.Future, setter: Callable, value: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(setter, future, value)
+        except RuntimeError:
+            # The event loop was closed in the meantime
+            pass
+
+
+def _set_future_result(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future: asyncio.Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+dll_worker = DllWorker()
+
+
+def _lock_wavemeter(
+    function: Callable[..., Awaitable[Any]] | None = None, *, priority: JobPriority = JobPriority.MEASUREMENT
+):
     """
-    A decorator to ensure the current wavemeter is correctly selected by the DLL.
+    A decorator to ensure the current wavemeter is correctly selected by the DLL. The calls are scheduled by
+    `Wavemeter._scheduler`, which groups the calls per wavemeter to avoid switching the active wavemeter. The scheduler
+    lock is held while the DLL worker executes the call, so the priority is applied, while waiting for the lock. Use
+    `@_lock_wavemeter(priority=JobPriority.CONTROL)` for control calls, that overtake waiting measurements.
 
     Parameters
     ----------
     function:
         The coroutine to be wrapped.
+    priority: JobPriority
+        The priority class of the calls.
     Returns
     -------
     Callable
         The wrapped coroutine
 
     """
+    if function is None:
+        return partial(_lock_wavemeter, priority=priority)
 
     async def decorated_function(self, *args, **kwargs):
-        async with Wavemeter._lock:
-            if Wavemeter._active_id != self.product_id:
-                await self._set_active_wavemeter(self.product_id)
-            return await function(self, *args, **kwargs)
+        start = time.perf_counter()
+        token = _lock_requested.set(start)
+        try:
+            async with Wavemeter._scheduler.lock(self.product_id, priority):
+                dll_lock_wait_seconds.observe(time.perf_counter() - start, (str(self.product_id),))
+                if Wavemeter._active_id != self.product_id:
+                    await self._set_active_wavemeter(self.product_id)
+                return await function(self, *args, **kwargs)
+        finally:
+            _lock_requested.reset(token)
 
     return decorated_function
 
@@ -106,7 +276,7 @@ class Wavemeter:
     """
 
     _active_id: int | None = None
-    _lock: asyncio.Lock | None = None
+    _scheduler: DllScheduler = DllScheduler()
     _connected_wavemeters: set[int] = set()
 
     @property
@@ -118,9 +288,9 @@ class Wavemeter:
         self.__product_id = product_id
         self.__logger = logging.getLogger(__name__)
 
-        self.__threadpool: concurrent.futures.ThreadPoolExecutor | None = None
-        self.__event_queue: janus.Queue[DataPackage] | None = None
         self.__callback: ctypes.POINTER | None = None
+        self.__patterns_enabled: set[int] = set()
+        self.__pattern_buffers: dict[int, bytearray] = {}
 
         # Load dll path
         if wlmData.dll is None:
@@ -135,15 +305,29 @@ class Wavemeter:
     ) -> None:
         await self.disconnect()
 
+    @classmethod
+    def set_max_batch_size(cls, max_batch_size: int) -> None:
+        """
+        Set the maximum number of consecutive DLL calls of the active wavemeter, before a waiting wavemeter is served.
+        This applies to all wavemeters, because they share the DLL.
+
+        Parameters
+        ----------
+        max_batch_size: int
+            The number of calls. Must be at least 1.
+
+        Raises
+        ------
+        ValueError
+            Raised if `max_batch_size` is less than 1.
+        """
+        cls._scheduler.max_batch_size = max_batch_size
+
     async def connect(self) -> None:
         """
         Connect to the wavemeter.
         """
-        if Wavemeter._lock is None:
-            # The first wavemeter to connect creates the lock
-            Wavemeter._lock = asyncio.Lock()
-
-        async with Wavemeter._lock:
+        async with Wavemeter._scheduler.lock(self.product_id, JobPriority.CONTROL):
             if self.product_id in Wavemeter._connected_wavemeters:
                 raise WavemeterException("Wavemeter already connected.")
             Wavemeter._connected_wavemeters.add(self.product_id)
@@ -159,9 +343,6 @@ class Wavemeter:
                     # then re-raise the error
                     raise
 
-        self.__threadpool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        self.__event_queue = janus.Queue()
-
         try:
             await self.get_application_index()
         except NoWavemeterAvailable:
@@ -170,9 +351,8 @@ class Wavemeter:
             await self.open_window(self.product_id)
             # The open_window function returns before the wavemeter application is able to respond, so we will wait
             # for the first event which signals that the application is ready to send and receive data
-            async for event in self.read_events():
-                if isinstance(event, WavemeterServerStart):
-                    break
+            async for _ in self.read_events(event_types=WavemeterServerStart):
+                break
 
             await self.get_application_index()
 
@@ -187,7 +367,7 @@ class Wavemeter:
                 # Double-checked locking is OK in asyncio, but not for multithreaded applications. See
                 # https://peps.python.org/pep-0583/ , which was withdrawn but highlights the problem.
                 if len(Wavemeter._connected_wavemeters) == 1:
-                    async with Wavemeter._lock:
+                    async with Wavemeter._scheduler.lock(self.product_id, JobPriority.CONTROL):
                         # Make sure that nobody has connected in the meantime
                         if len(self._connected_wavemeters) == 1:
                             await self.__register_callback(wlmConst.cNotifyRemoveCallback, -1)
@@ -196,12 +376,12 @@ class Wavemeter:
                 Wavemeter._connected_wavemeters.discard(self.product_id)
                 self.__logger.info("Disconnected from Wavemeter %i.", self.product_id)
 
-    async def __wrapper(self, func: Callable, *args: Any) -> Any:
+    @staticmethod
+    async def __wrapper(func: Callable, *args: Any, priority: JobPriority = JobPriority.MEASUREMENT) -> Any:
         """
-        This is the actual wrapper, that runs the threaded Linux GPIB lib in the executor and
-        returns a future to wait for.
+        This is the actual wrapper, that runs the DLL function in the DLL worker thread and returns the result.
         """
-        return await asyncio.get_running_loop().run_in_executor(self.__threadpool, func, wlmData.dll, *args)
+        return await dll_worker.submit(func, *args, priority=priority)
 
     async def cancel_tasks(self, tasks: Set[asyncio.Task]) -> None:
         """
@@ -224,20 +404,59 @@ class Wavemeter:
         except Exception:  # pylint: disable=broad-except
             self.__logger.exception("Error during shutdown of the controller.")
 
-    async def read_events(self) -> AsyncGenerator[DataPackage, None]:
+    async def read_events(
+        self,
+        maxsize: int = DEFAULT_EVENT_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        key: Callable[[DataPackage], Hashable] | None = None,
+        event_types: Type[DataPackage] | tuple[Type[DataPackage], ...] | None = None,
+        modes: Iterable[MeasureMode] | None = None,
+    ) -> AsyncGenerator[DataPackage, None]:
+        """
+        Yield the events sent by the wavemeter. The events are queued until read, so a slow consumer will lose events
+        once the queue is full. The events can be filtered by type and mode. Filtered events are not queued at all.
+
+        Parameters
+        ----------
+        maxsize: int
+            The maximum number of events queued. If maxsize is <= 0, the queue size is infinite.
+        overflow: OverflowPolicy
+            The action taken, when the queue is full.
+        key: Callable or None
+            A function returning the key of an event. Required if `overflow` is `OverflowPolicy.COALESCE`.
+        event_types: DataPackage type or tuple of DataPackage types or None
+            Only yield events of these types including their subclasses, e.g. `Wavelength`. If None, all types are
+            yielded.
+        modes: Iterable of MeasureMode or None
+            Only yield events of these measurement modes. If None, all modes are yielded.
+
+        Yields
+        -------
+        DataPackage
+            The events sent by the wavemeter.
+        """
+        if modes is not None:
+            mode_types = data_factory.get_data_types(modes)
+            if event_types is not None:
+                mode_types = tuple(data_type for data_type in mode_types if issubclass(data_type, event_types))
+            event_types = mode_types
         event: DataPackage
-        async for event in event_bus.subscribe(str(self.product_id)):
+        async for event in event_bus.subscribe(
+            str(self.product_id), maxsize=maxsize, overflow=overflow, key=key, event_types=event_types
+        ):
             yield event
 
     async def __register_callback(
         self, notification_type: int, callback_pointer: Type[wavemeter_callback_pointer] | int
     ) -> None:
         """Only call this function when locked."""
-        await self.__wrapper(wlmData.register_callback, notification_type, callback_pointer)
+        await self.__wrapper(
+            wlmData.register_callback, notification_type, callback_pointer, priority=JobPriority.CONTROL
+        )
 
-    @_lock_wavemeter
+    @_lock_wavemeter(priority=JobPriority.CONTROL)
     async def set_switch_mode(self, enable: bool) -> None:
-        await self.__wrapper(wlmData.set_switch_mode, enable)
+        await self.__wrapper(wlmData.set_switch_mode, enable, priority=JobPriority.CONTROL)
 
     @_lock_wavemeter
     async def get_switch_mode(self) -> bool:
@@ -251,6 +470,108 @@ class Wavemeter:
     async def get_frequency(self, channel: int) -> Decimal:
         return await self.__wrapper(wlmData.get_frequency, channel)
 
+    @_lock_wavemeter
+    async def get_wavelengths(self, channels: Sequence[int]) -> list[Decimal | float | WavemeterException]:
+        """
+        Read the wavelengths of several channels using a single DLL job.
+
+        Parameters
+        ----------
+        channels: Sequence of int
+            The zero-based channel numbers.
+
+        Returns
+        -------
+        list of Decimal or float or WavemeterException
+            The wavelength in m or the error raised for each channel.
+        """
+        return await self.__wrapper(wlmData.get_wavelengths, channels)
+
+    @_lock_wavemeter
+    async def get_frequencies(self, channels: Sequence[int]) -> list[Decimal | float | WavemeterException]:
+        """
+        Read the frequencies of several channels using a single DLL job.
+
+        Parameters
+        ----------
+        channels: Sequence of int
+            The zero-based channel numbers.
+
+        Returns
+        -------
+        list of Decimal or float or WavemeterException
+            The frequency in Hz or the error raised for each channel.
+        """
+        return await self.__wrapper(wlmData.get_frequencies, channels)
+
+    async def get_cached_wavelengths(
+        self, channels: Sequence[int], max_age: float | None = None
+    ) -> list[Decimal | float | WavemeterException]:
+        """
+        Return the latest wavelengths sent by the wavemeter. The channels without a value, or with a value that is too
+        old, are read from the DLL using a single job.
+
+        Parameters
+        ----------
+        channels: Sequence of int
+            The zero-based channel numbers.
+        max_age: float or None
+            The maximum age of the cached values in seconds. If None, any cached value is accepted.
+
+        Returns
+        -------
+        list of Decimal or float or WavemeterException
+            The wavelength in m or the error raised for each channel.
+        """
+        return await self.__get_cached(channels, max_age, wlmData.convert_wavelength, self.get_wavelengths)
+
+    async def get_cached_frequencies(
+        self, channels: Sequence[int], max_age: float | None = None
+    ) -> list[Decimal | float | WavemeterException]:
+        """
+        Return the frequencies calculated from the latest wavelengths sent by the wavemeter. The channels without a
+        value, or with a value that is too old, are read from the DLL using a single job.
+
+        Parameters
+        ----------
+        channels: Sequence of int
+            The zero-based channel numbers.
+        max_age: float or None
+            The maximum age of the cached values in seconds. If None, any cached value is accepted.
+
+        Returns
+        -------
+        list of Decimal or float or WavemeterException
+            The frequency in Hz or the error raised for each channel.
+        """
+        return await self.__get_cached(channels, max_age, wlmData.convert_wavelength_to_frequency, self.get_frequencies)
+
+    async def __get_cached(
+        self,
+        channels: Sequence[int],
+        max_age: float | None,
+        converter: Callable[[Decimal | float, int], Decimal | float],
+        fallback: Callable[[Sequence[int]], Awaitable[list[Decimal | float | WavemeterException]]],
+    ) -> list[Decimal | float | WavemeterException]:
+        results: list[Decimal | float | WavemeterException | None] = []
+        missing: list[int] = []  # The indices of the channels not found in the cache
+        for channel in channels:
+            package = measurement_cache.get_wavelength(self.product_id, channel, max_age)
+            if package is None:
+                missing.append(len(results))
+                results.append(None)
+                continue
+            try:
+                results.append(converter(package.value, channel))
+            except WavemeterException as exc:
+                results.append(exc)
+
+        if missing:
+            values = await fallback([channels[index] for index in missing])
+            for index, value in zip(missing, values):
+                results[index] = value
+        return results
+
     @_lock_wavemeter
     async def get_channel(self) -> int:
         return await self.__wrapper(wlmData.get_channel)
@@ -259,19 +580,19 @@ class Wavemeter:
     async def get_channel_count(self) -> int:
         return await self.__wrapper(wlmData.get_channel_count)
 
-    @_lock_wavemeter
+    @_lock_wavemeter(priority=JobPriority.CONTROL)
     async def set_channel(self, channel: int) -> None:
-        return await self.__wrapper(wlmData.set_channel, channel)
+        return await self.__wrapper(wlmData.set_channel, channel, priority=JobPriority.CONTROL)
 
     @_lock_wavemeter
     async def get_wavemeter_info(self) -> tuple[WavemeterType, int, tuple[int, int]]:
         return await self.__wrapper(wlmData.get_wavemeter_info)
 
     @staticmethod
-    def get_wavemeter_count():
-        return wlmData.get_wavemeter_count(wlmData.dll)
+    async def get_wavemeter_count() -> int:
+        return await dll_worker.submit(wlmData.get_wavemeter_count, priority=JobPriority.CONTROL)
 
-    @_lock_wavemeter
+    @_lock_wavemeter(priority=JobPriority.CONTROL)
     async def get_application_index(self) -> int:
         """
         Return the GUI application index of the wavemeter. Warning this function will return wrong values if the
@@ -284,14 +605,14 @@ class Wavemeter:
         int
             The GUI application index of the wavemeter
         """
-        return wlmData.get_wavemeter_index(wlmData.dll, self.product_id)
+        return await self.__wrapper(wlmData.get_wavemeter_index, self.product_id, priority=JobPriority.CONTROL)
 
     async def set_active_wavemeter(self, product_id: int):
-        async with Wavemeter._lock:
+        async with Wavemeter._scheduler.lock(product_id, JobPriority.CONTROL):
             await self._set_active_wavemeter(product_id)
 
     async def _set_active_wavemeter(self, product_id: int):
-        await self.__wrapper(wlmData.set_active_wavemeter, product_id)
+        await self.__wrapper(wlmData.set_active_wavemeter, product_id, priority=JobPriority.CONTROL)
         Wavemeter._active_id = product_id
 
     @_lock_wavemeter
@@ -302,7 +623,61 @@ class Wavemeter:
     async def get_calibration_wavelength(self, pre_calibration: bool = False):
         return await self.__wrapper(wlmData.get_calibration_wavelength, pre_calibration)
 
+    @_lock_wavemeter(priority=JobPriority.CONTROL)
+    async def set_pattern_export(self, index: int, enable: bool) -> None:
+        """
+        Enable or disable the export of a pattern. Enabling the export of a pattern slows down the wavemeter
+        application, so only enable the patterns needed.
+
+        Parameters
+        ----------
+        index: int
+            The pattern index, one of the cSignal constants defined in wlmConst.
+        enable: bool
+            True to enable the export.
+        """
+        await self.__set_pattern_export(index, enable)
+
+    async def __set_pattern_export(self, index: int, enable: bool) -> None:
+        """Only call this function when locked."""
+        await self.__wrapper(wlmData.set_pattern_export, index, enable, priority=JobPriority.CONTROL)
+        if enable:
+            self.__patterns_enabled.add(index)
+        else:
+            self.__patterns_enabled.discard(index)
+
     @_lock_wavemeter
+    async def get_pattern(
+        self, channel: int, index: int = wlmConst.cSignal1Interferometers, buffer: bytearray | None = None
+    ) -> memoryview:
+        """
+        Read a pattern, e.g. the interferometer pattern. The export of the pattern is enabled on first use. If no
+        buffer is given, the pattern is read into a buffer, which is reused by the next call with the same index, so the
+        data must be consumed or copied before that.
+
+        Parameters
+        ----------
+        channel: int
+            The zero-based channel number.
+        index: int
+            The pattern index, one of the cSignal constants defined in wlmConst.
+        buffer: bytearray or None
+            The buffer to read the pattern into. A new buffer is allocated, if it is too small.
+
+        Returns
+        -------
+        memoryview
+            A view of the items of the pattern.
+        """
+        if index not in self.__patterns_enabled:
+            await self.__set_pattern_export(index, True)
+        if buffer is not None:
+            return await self.__wrapper(wlmData.get_pattern, channel, index, buffer)
+        pattern = await self.__wrapper(wlmData.get_pattern, channel, index, self.__pattern_buffers.get(index))
+        self.__pattern_buffers[index] = pattern.obj
+        return pattern
+
+    @_lock_wavemeter(priority=JobPriority.CONTROL)
     async def open_window(self, product_id: int) -> None:
         """
         Open the GUI window required for the wavemeter DLL access. This function will wait indefinitely for the window
@@ -315,8 +690,8 @@ class Wavemeter:
         """
         # Set the timeout to -1 (infinity), because the timeout should be handled via asyncio
         # FIXME: Allow a file name for the GUI application instead of the default (None).
-        await self.__wrapper(wlmData.open_window, None, product_id, -1)
+        await self.__wrapper(wlmData.open_window, None, product_id, -1, priority=JobPriority.CONTROL)
 
-    @_lock_wavemeter
+    @_lock_wavemeter(priority=JobPriority.CONTROL)
     async def set_auto_calibration(self, enable: bool) -> None:
-        await self.__wrapper(wlmData.set_auto_calibration_mode, enable)
+        await self.__wrapper(wlmData.set_auto_calibration_mode, enable, priority=JobPriority.CONTROL)
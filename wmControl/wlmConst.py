@@ -4,6 +4,7 @@
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum, Flag, IntEnum
+from typing import Type
 
 # Instantiating Constants for 'RFC' parameter
 cInstCheckForWLM = -1
@@ -54,6 +55,26 @@ ResERR_OnlyInSwitchMode = -25
 ResERR_TCPErr = -26
 
 
+# The type of the measurement values. Decimal is exact, but expensive to create. float keeps the double sent by the DLL
+# and is a lot faster. Use set_number_type() to change it.
+number_type: Type[Decimal] | Type[float] = Decimal
+
+
+def set_number_type(value_type: Type[Decimal] | Type[float]) -> None:
+    """
+    Set the type of the measurement values returned by the DLL functions and contained in the data packages.
+
+    Parameters
+    ----------
+    value_type: Decimal or float
+        The number type.
+    """
+    global number_type
+    if value_type not in (Decimal, float):
+        raise TypeError(f"Invalid number type: {value_type}")
+    number_type = value_type
+
+
 class WavemeterType(Enum):
     lsa = 5
     ws6 = 6
@@ -654,7 +675,7 @@ flFileInfoInvalidName = 0x0008
 cFileParameterError = -1
 
 
-@dataclass
+@dataclass(slots=True)
 class DataPackage:
     product_id: int
 
@@ -663,7 +684,7 @@ class DataPackage:
 # dataclasses for cmi with meaning for DblVal. For more see manual page 61.
 
 
-@dataclass
+@dataclass(slots=True)
 class Wavelength(DataPackage):
     """
     The wavelength measured on a channel. Do not directly instantiate this class. Use a sibling to correctly set the
@@ -689,87 +710,111 @@ class Wavelength(DataPackage):
         return f"Wavelength measurement: {self.value:.8f} nm | timestamp {self.timestamp} | channel {self.channel} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength1(Wavelength):
     """Wavelength CH1"""
 
-    mode: MeasureMode = MeasureMode.cmiWavelength1
+    mode = MeasureMode.cmiWavelength1
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=0)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength2(Wavelength):
     """Wavelength CH2"""
 
     mode = MeasureMode.cmiWavelength2
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=1)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength3(Wavelength):
     """Wavelength CH3"""
 
     mode = MeasureMode.cmiWavelength3
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=2)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength4(Wavelength):
     """Wavelength CH4"""
 
     mode = MeasureMode.cmiWavelength4
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=3)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 3
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength5(Wavelength):
     """Wavelength CH5"""
 
     mode = MeasureMode.cmiWavelength5
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=4)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 4
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength6(Wavelength):
     """Wavelength CH6"""
 
     mode = MeasureMode.cmiWavelength6
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=5)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 5
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength7(Wavelength):
     """Wavelength CH7"""
 
     mode = MeasureMode.cmiWavelength7
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=6)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 6
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Wavelength8(Wavelength):
     """Wavelength CH8"""
 
     mode = MeasureMode.cmiWavelength8
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), channel=7)
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.channel = 7
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Temperature(DataPackage):
     """
     The internal temperature in degree Celsius.
@@ -790,9 +835,9 @@ class Temperature(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return (
@@ -800,7 +845,7 @@ class Temperature(DataPackage):
         )
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Pressure(DataPackage):
     """
     The ambient air pressure in Pascal.
@@ -821,15 +866,15 @@ class Pressure(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val) * 100
-        super().__init__(product_id=version)
+        self.value = number_type(double_val) * 100
 
     def __str__(self):
         return f"Pressure measurement: {self.value:.0f} Pa | timestamp {self.timestamp} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class TimeTick(DataPackage):
     """
     Time correlating to a specific measurement calculation. Represents the interval elapsed since start of the
@@ -851,15 +896,15 @@ class TimeTick(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return f"Time Tick: {self.value:.4f}  | timestamp {self.timestamp} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Distance(DataPackage):
     """
     The distance between signal 1 and 2 in multichannel switch versions with Diff option.
@@ -880,15 +925,15 @@ class Distance(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return f"Distance measurement: {self.value} Arb.U. | timestamp {self.timestamp} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Linewidth(DataPackage):
     """
     The calculated linewidth in nm.
@@ -909,15 +954,15 @@ class Linewidth(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return f"Linewidth measurement: {self.value} nm | timestamp {self.timestamp} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class AnalogIn(DataPackage):
     """
     The analog input voltage in versions with analog input port.
@@ -938,15 +983,15 @@ class AnalogIn(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return f"Analog input measurement: {self.value} V | timestamp {self.timestamp} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class AnalogOut(DataPackage):
     """
     The analog output voltage in versions with analog output port.
@@ -967,15 +1012,15 @@ class AnalogOut(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return f"Analog output measurement: {self.value} V | timestamp {self.timestamp} | wavemeter {self.product_id}."
 
 
-@dataclass
+@dataclass(slots=True)
 class PID(DataPackage):
     """
     The P, I, D, T and dt parameters in PID regulation versions.
@@ -998,57 +1043,72 @@ class PID(DataPackage):
         return f"PID measurement: {self.value} Arb.U. | timestamp {self.timestamp} | parameter {self.parameter} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class PID_P(PID):
     """The P parameter in PID regulation versions."""
 
     mode = MeasureMode.cmiPID_P
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), parameter="P")
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.parameter = "P"
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class PID_I(PID):
     """The I parameter in PID regulation versions."""
 
     mode = MeasureMode.cmiPID_I
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), parameter="I")
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.parameter = "I"
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class PID_D(PID):
     """The D parameter in PID regulation versions."""
 
     mode = MeasureMode.cmiPID_D
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), parameter="D")
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.parameter = "D"
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class PID_T(PID):
     """The T parameter in PID regulation versions."""
 
     mode = MeasureMode.cmiPID_T
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), parameter="T")
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.parameter = "T"
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class PID_dt(PID):
     """The dt parameter in PID regulation versions."""
 
     mode = MeasureMode.cmiPID_dt
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
-        super().__init__(product_id=version, timestamp=int_val, value=Decimal(double_val), parameter="dt")
+        self.product_id = version
+        self.timestamp = int_val
+        self.value = number_type(double_val)
+        self.parameter = "dt"
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class ExternalInput(DataPackage):
     """
     External user input transferred to the wavemeter (64 possible). Meant to control wavemeter via a client.
@@ -1069,15 +1129,15 @@ class ExternalInput(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return f"External input measurement: {self.value} Arb.U. | timestamp {self.timestamp} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class DeviationSensitivityFactor(DataPackage):
     """
     Sensitivity prefactor in Laser and PID versions.
@@ -1098,9 +1158,9 @@ class DeviationSensitivityFactor(DataPackage):
     value: Decimal
 
     def __init__(self, version, int_val, double_val, *_args, **_kwargs):
+        self.product_id = version
         self.timestamp = int_val
-        self.value = Decimal(double_val)
-        super().__init__(product_id=version)
+        self.value = number_type(double_val)
 
     def __str__(self):
         return f"Deviation sensitivity factor measurement: {self.value} Arb.U. | timestamp {self.timestamp} | wavemeter {self.product_id}."
@@ -1111,7 +1171,7 @@ class DeviationSensitivityFactor(DataPackage):
 # Use documentation with caution.
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class FastMode(DataPackage):
     """
     In fast mode the pattern is drawn a little bit faster.
@@ -1129,14 +1189,14 @@ class FastMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Fast mode active: {bool(self.value)} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class WideMode(DataPackage):
     """
     Wide mode represent the measurement precision mode indicator.
@@ -1154,14 +1214,14 @@ class WideMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Wide mode: mode {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class ResultMode(DataPackage):
     """
     Result mode represent the measurement unit.
@@ -1179,14 +1239,14 @@ class ResultMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Result mode: unit {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class ExposureMode(DataPackage):
     """
     Exposure mode gives hint about automatic exposure control.
@@ -1204,14 +1264,14 @@ class ExposureMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Automatic exposure control active: bool({self.value}) | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Range(DataPackage):
     """
     Range represent the range in which the wavemeter is operating.
@@ -1229,14 +1289,14 @@ class Range(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Wavemeter range: range {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class PulseMode(DataPackage):
     """
     Pulse mode represent the pulse mode setting.
@@ -1255,14 +1315,14 @@ class PulseMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Pulse mode: mode {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class DisplayMode(DataPackage):
     """
     Represents the display mode settings.
@@ -1280,14 +1340,14 @@ class DisplayMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Display mode: mode {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Reduced(DataPackage):
     """
     Represents the reduction state.
@@ -1305,14 +1365,14 @@ class Reduced(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Reduction state: state {bool(self.value)} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Link(DataPackage):
     """
     Represents the link state with a COM port.
@@ -1330,14 +1390,14 @@ class Link(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Link state: connected to COM port {bool(self.value)} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Operation(DataPackage):
     """
     Represent the operation state the wavemeter has.
@@ -1356,14 +1416,14 @@ class Operation(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Operation state: state {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class AnalysisMode(DataPackage):
     """
     Represent the analysis mode state.
@@ -1381,14 +1441,14 @@ class AnalysisMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Analysis mode state: state {bool(self.value)} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class SwitcherMode(DataPackage):
     """
     Represent the switcher mode state.
@@ -1406,14 +1466,14 @@ class SwitcherMode(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Switcher mode state: state {bool(self.value)} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class SwitcherChannel(DataPackage):
     """
     Represent the current active switcher channel.
@@ -1430,14 +1490,14 @@ class SwitcherChannel(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val - 1
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Active switcher channel: channel {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class PIDCourse(DataPackage):
     """
     Represent the current active switcher channel.
@@ -1455,14 +1515,14 @@ class PIDCourse(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"PID course state: {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class DeviationSensitivityDim(DataPackage):
     """
     Represent the dimension of the .
@@ -1480,14 +1540,14 @@ class DeviationSensitivityDim(DataPackage):
     value: int
 
     def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
         self.value = int_val
-        super().__init__(product_id=version)
 
     def __str__(self):
         return f"Deviation sensitivity: dimension {self.value} | wavemeter {self.product_id}."
 
 
-@dataclass
+@dataclass(slots=True)
 class Min(DataPackage):
     """
     The minimum of a measured interference pattern on a channel. For wavemeter with two CCDs there will be two minimums. See also manual
@@ -1513,207 +1573,267 @@ class Min(DataPackage):
         return f"Minimum measurement: {self.value} Arb.U. | channel {self.channel} | ccd {self.ccd_array} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min1(Min):
     """The interference pattern minimum of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiMin1
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min2(Min):
     """The interference pattern minimum of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiMin2
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min11(Min):
     """The interference pattern minimum of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiMin11
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min12(Min):
     """The interference pattern minimum of channel 2 for first CCD."""
 
     mode = MeasureMode.cmiMin12
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min13(Min):
     """The interference pattern minimum of channel 3 for first CCD."""
 
     mode = MeasureMode.cmiMin13
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min14(Min):
     """The interference pattern minimum of channel 4 for first CCD."""
 
     mode = MeasureMode.cmiMin14
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min15(Min):
     """The interference pattern minimum of channel 5 for first CCD."""
 
     mode = MeasureMode.cmiMin15
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min16(Min):
     """The interference pattern minimum of channel 6 for first CCD."""
 
     mode = MeasureMode.cmiMin16
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min17(Min):
     """The interference pattern minimum of channel 7 for first CCD."""
 
     mode = MeasureMode.cmiMin17
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min18(Min):
     """The interference pattern minimum of channel 8 for first CCD."""
 
     mode = MeasureMode.cmiMin18
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min19(Min):
     """The interference pattern minimum of some channel for first CCD."""
 
     mode = MeasureMode.cmiMin19
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min21(Min):
     """The interference pattern minimum of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiMin21
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min22(Min):
     """The interference pattern minimum of channel 2 for second CCD."""
 
     mode = MeasureMode.cmiMin22
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min23(Min):
     """The interference pattern minimum of channel 3 for second CCD."""
 
     mode = MeasureMode.cmiMin23
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min24(Min):
     """The interference pattern minimum of channel 4 for second CCD."""
 
     mode = MeasureMode.cmiMin24
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min25(Min):
     """The interference pattern minimum of channel 5 for second CCD."""
 
     mode = MeasureMode.cmiMin25
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min26(Min):
     """The interference pattern minimum of channel 6 for second CCD."""
 
     mode = MeasureMode.cmiMin26
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min27(Min):
     """The interference pattern minimum of channel 7 for second CCD."""
 
     mode = MeasureMode.cmiMin27
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min28(Min):
     """The interference pattern minimum of channel 8 for second CCD."""
 
     mode = MeasureMode.cmiMin28
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Min29(Min):
     """The interference pattern minimum of some channel for second CCD."""
 
     mode = MeasureMode.cmiMin29
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Max(DataPackage):
     """
     The maximum of a measured interference pattern on a channel. For wavemeter with two CCDs there will be two maximums. See also manual
@@ -1739,207 +1859,267 @@ class Max(DataPackage):
         return f"Maximum measurement: {self.value} Arb.U. | channel {self.channel} | ccd {self.ccd_array} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max1(Max):
     """The interference pattern maximum of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiMax1
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max2(Max):
     """The interference pattern maximum of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiMax2
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max11(Max):
     """The interference pattern maximum of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiMax11
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max12(Max):
     """The interference pattern maximum of channel 2 for first CCD."""
 
     mode = MeasureMode.cmiMax12
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max13(Max):
     """The interference pattern maximum of channel 3 for first CCD."""
 
     mode = MeasureMode.cmiMax13
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max14(Max):
     """The interference pattern maximum of channel 4 for first CCD."""
 
     mode = MeasureMode.cmiMax14
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max15(Max):
     """The interference pattern maximum of channel 5 for first CCD."""
 
     mode = MeasureMode.cmiMax15
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max16(Max):
     """The interference pattern maximum of channel 6 for first CCD."""
 
     mode = MeasureMode.cmiMax16
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max17(Max):
     """The interference pattern maximum of channel 7 for first CCD."""
 
     mode = MeasureMode.cmiMax17
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max18(Max):
     """The interference pattern maximum of channel 8 for first CCD."""
 
     mode = MeasureMode.cmiMax18
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max19(Max):
     """The interference pattern maximum of some channel for first CCD."""
 
     mode = MeasureMode.cmiMax19
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max21(Max):
     """The interference pattern maximum of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiMax21
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max22(Max):
     """The interference pattern maximum of channel 2 for second CCD."""
 
     mode = MeasureMode.cmiMax22
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max23(Max):
     """The interference pattern maximum of channel 3 for second CCD."""
 
     mode = MeasureMode.cmiMax23
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max24(Max):
     """The interference pattern maximum of channel 4 for second CCD."""
 
     mode = MeasureMode.cmiMax24
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max25(Max):
     """The interference pattern maximum of channel 5 for second CCD."""
 
     mode = MeasureMode.cmiMax25
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max26(Max):
     """The interference pattern maximum of channel 6 for second CCD."""
 
     mode = MeasureMode.cmiMax26
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max27(Max):
     """The interference pattern maximum of channel 7 for second CCD."""
 
     mode = MeasureMode.cmiMax27
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max28(Max):
     """The interference pattern maximum of channel 8 for second CCD."""
 
     mode = MeasureMode.cmiMax28
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Max29(Max):
     """The interference pattern maximum of some channel for second CCD."""
 
     mode = MeasureMode.cmiMax29
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Avg(DataPackage):
     """
     The average of a measured interference pattern on a channel. For wavemeter with two CCDs there will be two averages. See also manual
@@ -1965,207 +2145,267 @@ class Avg(DataPackage):
         return f"Average measurement: {self.value} Arb.U. | channel {self.channel} | ccd {self.ccd_array} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg1(Avg):
     """The interference pattern average of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiPatternAvg1
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg2(Avg):
     """The interference pattern average of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiPatternAvg2
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg11(Avg):
     """The interference pattern average of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiAvg11
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg12(Avg):
     """The interference pattern average of channel 2 for first CCD."""
 
     mode = MeasureMode.cmiAvg12
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg13(Avg):
     """The interference pattern average of channel 3 for first CCD."""
 
     mode = MeasureMode.cmiAvg13
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg14(Avg):
     """The interference pattern average of channel 4 for first CCD."""
 
     mode = MeasureMode.cmiAvg14
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg15(Avg):
     """The interference pattern average of channel 5 for first CCD."""
 
     mode = MeasureMode.cmiAvg15
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg16(Avg):
     """The interference pattern average of channel 6 for first CCD."""
 
     mode = MeasureMode.cmiAvg16
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg17(Avg):
     """The interference pattern average of channel 7 for first CCD."""
 
     mode = MeasureMode.cmiAvg17
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg18(Avg):
     """The interference pattern average of channel 8 for first CCD."""
 
     mode = MeasureMode.cmiAvg18
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg19(Avg):
     """The interference pattern average of some channel for first CCD."""
 
     mode = MeasureMode.cmiAvg19
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=0)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg21(Avg):
     """The interference pattern average of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiAvg21
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=0, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg22(Avg):
     """The interference pattern average of channel 2 for second CCD."""
 
     mode = MeasureMode.cmiAvg22
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg23(Avg):
     """The interference pattern average of channel 3 for second CCD."""
 
     mode = MeasureMode.cmiAvg23
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg24(Avg):
     """The interference pattern average of channel 4 for second CCD."""
 
     mode = MeasureMode.cmiAvg24
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg25(Avg):
     """The interference pattern average of channel 5 for second CCD."""
 
     mode = MeasureMode.cmiAvg25
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg26(Avg):
     """The interference pattern average of channel 6 for second CCD."""
 
     mode = MeasureMode.cmiAvg26
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg27(Avg):
     """The interference pattern average of channel 7 for second CCD."""
 
     mode = MeasureMode.cmiAvg27
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg28(Avg):
     """The interference pattern average of channel 8 for second CCD."""
 
     mode = MeasureMode.cmiAvg28
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Avg29(Avg):
     """The interference pattern average of some channel for second CCD."""
 
     mode = MeasureMode.cmiAvg29
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Exposure(DataPackage):
     """
     The actual valid exposure value on a channel. For wavemeter with two CCDs there will be two averages. See also manual
@@ -2191,187 +2431,241 @@ class Exposure(DataPackage):
         return f"Exposure measurement: exposure {self.value} Arb.U. | channel {self.channel} | ccd {self.ccd_array} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure1(Exposure):
     """The exposure of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue1
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure2(Exposure):
     """The exposure of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue2
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure11(Exposure):
     """The exposure of channel 1 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue11
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure12(Exposure):
     """The exposure of channel 2 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue12
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure13(Exposure):
     """The exposure of channel 3 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue13
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure14(Exposure):
     """The exposure of channel 4 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue14
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure15(Exposure):
     """The exposure of channel 5 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue15
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure16(Exposure):
     """The exposure of channel 6 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue16
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure17(Exposure):
     """The exposure of channel 7 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue17
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure18(Exposure):
     """The exposure of channel 8 for first CCD."""
 
     mode = MeasureMode.cmiExposureValue18
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure21(Exposure):
     """The exposure of channel 1 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue21
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure22(Exposure):
     """The exposure of channel 2 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue22
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure23(Exposure):
     """The exposure of channel 3 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue23
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure24(Exposure):
     """The exposure of channel 4 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue24
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure25(Exposure):
     """The exposure of channel 5 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue25
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure26(Exposure):
     """The exposure of channel 6 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue26
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure27(Exposure):
     """The exposure of channel 7 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue27
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
+        self.ccd_array = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Exposure28(Exposure):
     """The exposure of channel 8 for second CCD."""
 
     mode = MeasureMode.cmiExposureValue28
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8, ccd_array=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 8
+        self.ccd_array = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class Power(DataPackage):
     """
     The measured signal power in microwatt of the current shot. See also manual page 71 GetPowerNum.
@@ -2394,112 +2688,157 @@ class Power(DataPackage):
         return f"Power measurement: power {self.value} µW | channel {self.channel} | wavemeter {self.product_id}."
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power1(Power):
     """The power of channel 1."""
 
     mode = MeasureMode.cmiPower1
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=1)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 0
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power2(Power):
     """The power of channel 2."""
 
     mode = MeasureMode.cmiPower2
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=2)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 1
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power3(Power):
     """The power of channel 3."""
 
     mode = MeasureMode.cmiPower3
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=3)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 2
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power4(Power):
     """The power of channel 4."""
 
     mode = MeasureMode.cmiPower4
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=4)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 3
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power5(Power):
     """The power of channel 5."""
 
     mode = MeasureMode.cmiPower5
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=5)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 4
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power6(Power):
     """The power of channel 6."""
 
     mode = MeasureMode.cmiPower6
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=6)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 5
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power7(Power):
     """The power of channel 7."""
 
     mode = MeasureMode.cmiPower7
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=7)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 6
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class Power8(Power):
     """The power of channel 8."""
 
     mode = MeasureMode.cmiPower8
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=Decimal(int_val), channel=8)
+        self.product_id = version
+        self.value = number_type(int_val)
+        self.channel = 7
 
 
-@dataclass
+@dataclass(init=False, slots=True)
+class PatternWritten(DataPackage):
+    """
+    Signals that the pattern and analysis arrays of a channel were written and can be read.
+
+    Attributes
+    ----------
+    product_id : int
+        Product id (version) of the WM. Might be a serial number. Do not count on it though.
+    channel : int
+        Channel of the wavemeter. The channel is a 0 based index.
+    """
+
+    mode = MeasureMode.cmiPatternAnalysisWritten
+
+    channel: int
+
+    def __init__(self, version, int_val, *_args, **_kwargs):
+        self.product_id = version
+        self.channel = max(int_val - 1, 0)  # Wavemeters without a switcher report channel 0
+
+    def __str__(self):
+        return f"Pattern written: channel {self.channel} | wavemeter {self.product_id}."
+
+
+@dataclass(slots=True)
 class WavemeterServerStatus(DataPackage):
     value: int
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class WavemeterServerShutdown(WavemeterServerStatus):
     mode = MeasureMode.cmiDLLDetach
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=int_val)
+        self.product_id = version
+        self.value = int_val
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class WavemeterServerStart(WavemeterServerStatus):
     mode = MeasureMode.cmiDLLAttach
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=int_val)
+        self.product_id = version
+        self.value = int_val
 
 
+@dataclass(init=False, slots=True)
 class WavemeterServerInitialized(WavemeterServerStatus):
     mode = MeasureMode.cmiServerInitialized
 
     def __init__(self, version, int_val, *_args, **_kwargs):
-        super().__init__(product_id=version, value=int_val)
+        self.product_id = version
+        self.value = int_val
 
 
 class WavemeterException(Exception):
@@ -7,20 +7,42 @@ import ctypes
 import logging
 import os
 from decimal import Decimal
+from typing import Iterable
 
+from wmControl import wlmConst
 from wmControl.wlmConst import (
     ControlFlags,
+    NoValueError,
     WavemeterException,
     WavemeterType,
     cCtrlWLMShow,
     cCtrlWLMWait,
     cInstCheckForWLM,
     cInstNotification,
+    cPatternDisable,
+    cPatternEnable,
     wavemeter_exceptions,
 )
 
 dll: ctypes.WinDLL | ctypes.CDLL | None = None
 
+# The speed of light in THz * nm and Hz * nm
+SPEED_OF_LIGHT_THZ_NM = Decimal("299792.458")
+SPEED_OF_LIGHT_HZ_NM = 299792458e9
+
+
+def LoadSimulatedDLL(**kwargs) -> None:
+    """
+    Load a simulation of the DLL instead of the DLL, e.g. for testing without wavemeters. The keyword arguments are
+    passed to `SimulatedDll`.
+    """
+    global dll
+    # Imported here, because the simulation is not needed in production
+    # pylint: disable-next=import-outside-toplevel
+    from wmControl.simulated_dll import SimulatedDll
+
+    dll = SimulatedDll(**kwargs)
+
 
 def LoadDLL(path):
     global dll
@@ -862,9 +884,29 @@ def _setter_error_handling(name: str, result: int, value: bool | int) -> None:
             raise WavemeterException("Error setting %s to %s", (striped_name, str(value))) from None
 
 
-def get_wavelength(dll: ctypes.WinDLL | ctypes.CDLL, channel: int) -> Decimal:
+def get_wavelength(dll: ctypes.WinDLL | ctypes.CDLL, channel: int) -> Decimal | float:
     assert 0 <= channel <= 8  # TODO: Check if 8 channels is the maximum
-    result = dll.GetWavelengthNum(channel + 1, 0.0)
+    return convert_wavelength(dll.GetWavelengthNum(channel + 1, 0.0), channel)
+
+
+def get_wavelengths(
+    dll: ctypes.WinDLL | ctypes.CDLL, channels: Iterable[int]
+) -> list[Decimal | float | WavemeterException]:
+    """
+    Read the wavelengths of several channels in one go. Errors are returned in place of the wavelength of the channel,
+    so that a single failing channel does not discard the others.
+    """
+    results: list[Decimal | float | WavemeterException] = []
+    for channel in channels:
+        try:
+            results.append(get_wavelength(dll, channel))
+        except WavemeterException as exc:
+            results.append(exc)
+    return results
+
+
+def convert_wavelength(result: float | Decimal, channel: int) -> Decimal | float:
+    """Convert a wavelength in nm as returned by the DLL to m or raise the error encoded in the result."""
     if result <= 0:
         try:
             raise wavemeter_exceptions[result]("Error reading wavelength on channel %i", channel)
@@ -872,12 +914,34 @@ def get_wavelength(dll: ctypes.WinDLL | ctypes.CDLL, channel: int) -> Decimal:
             logging.getLogger(__name__).error("Invalid return type received while calling 'get_wavelength': %i", result)
             raise WavemeterException("Error reading wavelength on channel %i", channel) from None
 
+    if wlmConst.number_type is float:
+        return float(result) / 1e9  # Result in m. The division is correctly rounded.
     return Decimal(result) * Decimal("1e-9")  # Result in m
 
 
-def get_frequency(dll: ctypes.WinDLL | ctypes.CDLL, channel: int) -> Decimal:
+def get_frequency(dll: ctypes.WinDLL | ctypes.CDLL, channel: int) -> Decimal | float:
     assert 0 <= channel <= 8  # TODO: Check if 8 channels is the maximum
-    result = dll.GetFrequencyNum(channel + 1, 0.0)
+    return convert_frequency(dll.GetFrequencyNum(channel + 1, 0.0), channel)
+
+
+def get_frequencies(
+    dll: ctypes.WinDLL | ctypes.CDLL, channels: Iterable[int]
+) -> list[Decimal | float | WavemeterException]:
+    """
+    Read the frequencies of several channels in one go. Errors are returned in place of the frequency of the channel,
+    so that a single failing channel does not discard the others.
+    """
+    results: list[Decimal | float | WavemeterException] = []
+    for channel in channels:
+        try:
+            results.append(get_frequency(dll, channel))
+        except WavemeterException as exc:
+            results.append(exc)
+    return results
+
+
+def convert_frequency(result: float | Decimal, channel: int) -> Decimal | float:
+    """Convert a frequency in THz as returned by the DLL to Hz or raise the error encoded in the result."""
     if result <= 0:
         try:
             raise wavemeter_exceptions[result]("Error reading frequency on channel %i", channel)
@@ -885,9 +949,27 @@ def get_frequency(dll: ctypes.WinDLL | ctypes.CDLL, channel: int) -> Decimal:
             logging.getLogger(__name__).error("Invalid return type received while calling 'get_frequency': %i", result)
             raise WavemeterException("Error reading frequency on channel %i", channel) from None
 
+    if wlmConst.number_type is float:
+        return float(result) * 1e12  # Result in Hz
     return Decimal(result) * Decimal("1e12")  # Result in Hz
 
 
+def convert_wavelength_to_frequency(result: float | Decimal, channel: int) -> Decimal | float:
+    """Convert a wavelength in nm as returned by the DLL to a frequency in Hz or raise the error encoded in the result."""
+    if result > 0 and wlmConst.number_type is float:
+        # Skip the conversion to THz to round only once
+        return SPEED_OF_LIGHT_HZ_NM / float(result)
+    # Errors are encoded as non-positive values, so pass them on to the converter
+    return convert_frequency(SPEED_OF_LIGHT_THZ_NM / Decimal(result) if result > 0 else result, channel)
+
+
+def convert_power(result: float | Decimal) -> Decimal | float:
+    """Convert a power in µW as sent by the DLL to W."""
+    if wlmConst.number_type is float:
+        return float(result) / 1e6
+    return Decimal(result) * Decimal("1e-6")
+
+
 def get_switch_mode(dll: ctypes.WinDLL | ctypes.CDLL) -> bool:
     return bool(dll.GetSwitcherMode(0))
 
@@ -959,12 +1041,68 @@ def get_wavemeter_info(dll: ctypes.WinDLL | ctypes.CDLL) -> tuple[WavemeterType,
     return WavemeterType(wavemeter_type), serial, (software_revision, compilation_number)
 
 
-def get_temperature(dll: ctypes.WinDLL | ctypes.CDLL) -> Decimal:
-    return Decimal(dll.GetTemperature(0.0))
+def get_temperature(dll: ctypes.WinDLL | ctypes.CDLL) -> Decimal | float:
+    return wlmConst.number_type(dll.GetTemperature(0.0))
+
+
+def get_calibration_wavelength(dll: ctypes.WinDLL | ctypes.CDLL, pre_calibration: bool) -> Decimal | float:
+    return wlmConst.number_type(dll.GetCalWavelength(int(not pre_calibration), 0.0))
 
 
-def get_calibration_wavelength(dll: ctypes.WinDLL | ctypes.CDLL, pre_calibration: bool) -> Decimal:
-    return Decimal(dll.GetCalWavelength(int(not pre_calibration), 0.0))
+# The array formats of the pattern items by item size in bytes
+PATTERN_ITEM_FORMATS = {1: "b", 2: "h", 4: "i", 8: "d"}
+
+
+def set_pattern_export(dll: ctypes.WinDLL | ctypes.CDLL, index: int, enable: bool) -> None:
+    """Enable or disable the export of a pattern. A pattern must be enabled before it can be read."""
+    result = dll.SetPattern(index, cPatternEnable if enable else cPatternDisable)
+    if result < 0:
+        logging.getLogger(__name__).error("Error while calling 'set_pattern_export': %i", result)
+        raise WavemeterException(f"Error setting pattern export of pattern {index} to {enable}")
+
+
+def get_pattern(
+    dll: ctypes.WinDLL | ctypes.CDLL, channel: int, index: int, buffer: bytearray | None = None
+) -> memoryview:
+    """
+    Read a pattern, e.g. the interferometer pattern, into a buffer. The buffer is reused, if it is large enough, to
+    avoid allocating memory for every pattern.
+
+    Parameters
+    ----------
+    dll: ctypes.WinDLL or ctypes.CDLL
+        The wavemeter DLL.
+    channel: int
+        The zero-based channel number.
+    index: int
+        The pattern index, one of the cSignal constants.
+    buffer: bytearray or None
+        The buffer to read the pattern into. If None or too small, a new buffer is allocated.
+
+    Returns
+    -------
+    memoryview
+        A view of the items of the pattern. The underlying buffer is available via `memoryview.obj`.
+    """
+    assert 0 <= channel <= 8  # TODO: Check if 8 channels is the maximum
+    item_size = dll.GetPatternItemSize(index)
+    item_count = dll.GetPatternItemCount(index)
+    if item_size <= 0 or item_count <= 0:
+        raise NoValueError("No pattern %i available on channel %i", index, channel)
+    try:
+        item_format = PATTERN_ITEM_FORMATS[item_size]
+    except KeyError:
+        raise WavemeterException(f"Unsupported pattern item size: {item_size}") from None
+
+    size = item_size * item_count
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(size)
+    c_buffer = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+    result = dll.GetPatternDataNum(channel + 1, index, ctypes.addressof(c_buffer))
+    del c_buffer  # Release the export of the buffer
+    if result <= 0:
+        raise NoValueError("Error reading pattern %i on channel %i", index, channel)
+    return memoryview(buffer)[:size].cast(item_format)
 
 
 def open_window(dll: ctypes.WinDLL | ctypes.CDLL, application_path: str | None, product_id: int, timeout: int) -> None: